@@ -14,7 +14,7 @@ import tempfile
 import time
 import urllib.parse
 import uuid
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
@@ -276,19 +276,30 @@ from common_schemas.utils import (
 )
 from media_processing.audio_processing import (
     concatenate_audio,
-    get_audio_duration,
     overlay_on_background,
+    trim_audio_batch,
 )
-from media_processing.strict_timing import concatenate_audio_strict_timing
+from media_processing import batch_stretch, time_stretch
+from media_processing.media_info import MEDIA_INFO, MediaProbeError, get_audio_duration
+from media_processing.resampling import RESAMPLER, negotiate_working_rate
+from media_processing.stretch_cache import STRETCH_CACHE
 from media_processing.vad_offset import calculate_vad_offset, apply_offset_to_segments
-from media_processing.audio_validation import validate_audio_quality, validate_segment_audio
-from media_processing.final_pass import final
+from media_processing.audio_validation import ValidationReport, validate_segments_batch
+from media_processing.final_pass import LanguageTrack, PreviewSettings, final, package_languages, render_preview
 from media_processing.subtitles_handling import STYLE_PRESETS, build_subtitles_from_asr_result
+from media_processing import parallel_burn, streaming_output, vad_backend
 from preprocessing.media_separation import (
     filter_supported_models_grouped,
     get_non_vocals_stem,
     separation,
 )
+from preprocessing.separator_pool import SEPARATOR_POOL
+from preprocessing.chunked_separation import ChunkingConfig, separate_in_chunks, shutdown_worker_pool
+from preprocessing.separation_analysis import AnalysisThresholds, analyze_separation_need
+from caching.download_cache import RemoteMediaCache
+from caching.cache_manager import CacheArea, CacheManager
+from caching.single_flight import SingleFlight
+from caching.storage_codec import StorageCodec
 from services.asr.app.registry import WORKERS as ASR_WORKERS
 from services.translation.app.registry import WORKERS as TR_WORKERS
 from services.tts.app.registry import WORKERS as TTS_WORKERS
@@ -306,6 +317,7 @@ FILE_ROUTE = f"{JOBS_PREFIX}/file"
 RELEASE_ROUTE = f"{JOBS_PREFIX}/release_media"
 STOP_ROUTE = f"{JOBS_PREFIX}/stop"
 RUN_ROUTE = f"{JOBS_PREFIX}/run"
+RENDER_ROUTE = f"{JOBS_PREFIX}/render"
 OPTIONS_ROUTE = f"{API_PREFIX}/options"
 
 app = FastAPI(title="orchestrator")
@@ -335,10 +347,59 @@ TTS_URL = "http://localhost:8003/v1/synthesize"
 OUTS = BASE / "outs"
 SEPARATION_CACHE = BASE / "cache" / "audio_separation"
 RAW_AUDIO_CACHE = BASE / "cache" / "audio_raw"
-RAW_AUDIO_CACHE_FILENAME = "raw_audio.wav"
+RAW_AUDIO_CACHE_STEM = "raw_audio"
+RAW_AUDIO_ANALYSIS_STEM = "analysis_16k"
 UPLOADS_DIR = BASE / "uploads"
 UPLOAD_HASH_SUBDIR = "by_hash"
 FILE_HASH_CHUNK_SIZE = 4 * 1024 * 1024
+ASR_CACHE = BASE / "cache" / "asr"
+TTS_SEGMENT_CACHE = BASE / "cache" / "tts_segments"
+STRETCH_CACHE_DIR = BASE / "cache" / "stretched_segments"
+RESAMPLED_CACHE_DIR = BASE / "cache" / "resampled_segments"
+SINGLE_FLIGHT_LOCKS = BASE / "cache" / "locks"
+DOWNLOAD_CACHE_DIR = BASE / "cache" / "downloads"
+DOWNLOAD_CACHE_CFG = general_cfg.get("download_cache", {}) or {}
+DOWNLOAD_CACHE = RemoteMediaCache(
+    DOWNLOAD_CACHE_DIR,
+    ttl_seconds=float(DOWNLOAD_CACHE_CFG.get("ttl_hours", 72)) * 3600,
+    max_bytes=int(float(DOWNLOAD_CACHE_CFG.get("max_size_gb", 20)) * 1024**3),
+)
+CACHE_MANAGER_CFG = general_cfg.get("cache_manager", {}) or {}
+STORAGE_CODEC_CFG = general_cfg.get("storage_codec", {}) or {}
+# Cached audio and persisted intermediates are stored losslessly compressed and decoded on load
+STORAGE_CODEC = StorageCodec(
+    format=str(STORAGE_CODEC_CFG.get("format", "flac")).lower(),
+    compression_level=STORAGE_CODEC_CFG.get("compression_level"),
+)
+
+
+def _cache_area(name: str, root: Path, depth: int) -> CacheArea:
+    area_cfg = (CACHE_MANAGER_CFG.get("areas") or {}).get(name) or {}
+    max_gb = area_cfg.get("max_size_gb")
+    ttl_days = area_cfg.get("ttl_days")
+    return CacheArea(
+        name=name,
+        root=root,
+        depth=depth,
+        max_bytes=int(float(max_gb) * 1024**3) if max_gb is not None else None,
+        ttl_seconds=float(ttl_days) * 86400 if ttl_days is not None else None,
+    )
+
+
+CACHE_MANAGER = CacheManager(
+    [
+        _cache_area("separation", SEPARATION_CACHE, 1),
+        _cache_area("raw_audio", RAW_AUDIO_CACHE, 2),
+        _cache_area("uploads", UPLOADS_DIR / UPLOAD_HASH_SUBDIR, 2),
+        _cache_area("outputs", OUTS, 1),
+        _cache_area("asr", ASR_CACHE, 2),
+        _cache_area("tts_segments", TTS_SEGMENT_CACHE, 2),
+        _cache_area("stretched_segments", STRETCH_CACHE_DIR, 2),
+        _cache_area("resampled_segments", RESAMPLED_CACHE_DIR, 2),
+    ],
+    BASE / "cache" / "cache_index.json",
+    min_age_seconds=float(CACHE_MANAGER_CFG.get("min_age_minutes", 30)) * 60,
+)
 
 VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".webm", ".flv")
 AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".ogg", ".m4a", ".aac")
@@ -363,9 +424,74 @@ TRANSCRIPTION_SEGMENT_TOLERANCE = general_cfg.get("transcript_tolerance", 0.25)
 # Each# Global semaphore to limit concurrent pipeline executions (GPU memory protection)
 _PIPELINE_SEMAPHORE = asyncio.Semaphore(2)
 
-# Global lock for model downloads to prevent race conditions
-# Multiple workers downloading the same model file simultaneously causes corruption
-_MODEL_DOWNLOAD_LOCK = asyncio.Lock()
+# Concurrent requests for the same artifact (raw audio, stems, ASR, TTS segment) wait for the
+# in-flight computation instead of duplicating it, across worker processes too
+SINGLE_FLIGHT_CFG = general_cfg.get("single_flight", {}) or {}
+SINGLE_FLIGHT = SingleFlight(SINGLE_FLIGHT_LOCKS)
+
+# Every synthesized segment is validated (one streamed pass each, in parallel); failures are resynthesized
+TTS_VALIDATION_CFG = general_cfg.get("tts_validation", {}) or {}
+
+# "multi_track" muxes every dubbed language into one container (video copied once, soft subtitles);
+# per-language MP4s are then only written when per_language_files is set
+FINALIZE_MEDIA_CFG = general_cfg.get("finalize_media", {}) or {}
+MULTI_TRACK_PACKAGING = str(FINALIZE_MEDIA_CFG.get("packaging", "per_language")).lower() == "multi_track"
+PER_LANGUAGE_FILES = bool(FINALIZE_MEDIA_CFG.get("per_language_files", True)) or not MULTI_TRACK_PACKAGING
+# Progressive final output (fragmented MP4, optionally with an HLS playlist) playable while it renders
+streaming_output.configure(FINALIZE_MEDIA_CFG.get("streaming"))
+# Involve-mode runs end with a fast proxy per language; the full final pass runs once the reviewer
+# approves (POST /jobs/render) or downloads the final video
+PREVIEW_CFG = general_cfg.get("preview", {}) or {}
+PREVIEW_ENABLED = bool(PREVIEW_CFG.get("enabled", True))
+PREVIEW_SETTINGS = PreviewSettings.from_config(PREVIEW_CFG)
+PREVIEW_STRETCH_TIER = PREVIEW_CFG.get("stretch_tier") or None
+if PREVIEW_STRETCH_TIER == (general_cfg.get("time_stretch", {}) or {}).get("tier", "final"):
+    PREVIEW_STRETCH_TIER = None  # Already the final tier: the approved render can reuse the preview audio
+# Deferred renders never approved within this time are dropped, so their workspace can be swept (0 = keep)
+PREVIEW_PENDING_TTL = float(PREVIEW_CFG.get("pending_ttl_hours", 72) or 0) * 3600
+RENDER_PLAN_FILE = "render_plan.json"
+RENDER_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Separation models stay loaded in a per-model pool; model downloads are serialized by a
+# per-model file lock inside the pool, so separations of different jobs can run concurrently
+AUDIO_SEPARATION_CFG = general_cfg.get("audio_separation", {}) or {}
+SEPARATOR_POOL.configure(
+    max_concurrent=AUDIO_SEPARATION_CFG.get("max_concurrent", 2),
+    max_idle_per_model=AUDIO_SEPARATION_CFG.get("idle_instances_per_model", 1),
+)
+# Long sources are separated in overlapping windows (bounded memory, all cores on CPU hosts)
+SEPARATION_CHUNKING_CFG = AUDIO_SEPARATION_CFG.get("chunking", {}) or {}
+SEPARATION_CHUNKING = ChunkingConfig(
+    chunk_seconds=float(SEPARATION_CHUNKING_CFG.get("chunk_seconds", 180)),
+    overlap_seconds=float(SEPARATION_CHUNKING_CFG.get("overlap_seconds", 4)),
+    cpu_workers=int(SEPARATION_CHUNKING_CFG.get("cpu_workers", 0) or 0),
+    threads_per_worker=int(SEPARATION_CHUNKING_CFG.get("threads_per_worker", 4)),
+)
+# "auto" analyzes the raw audio first and skips separation on clean speech; "always" separates
+SEPARATION_ANALYSIS_CFG = AUDIO_SEPARATION_CFG.get("analysis", {}) or {}
+SEPARATION_MODE = str(SEPARATION_ANALYSIS_CFG.get("mode", "auto")).lower()
+SEPARATION_THRESHOLDS = AnalysisThresholds.from_config(SEPARATION_ANALYSIS_CFG)
+# Segment stretches of a timeline run as one batch on a process pool (one worker per core by default)
+TIME_STRETCH_CFG = general_cfg.get("time_stretch", {}) or {}
+batch_stretch.configure(workers=int(TIME_STRETCH_CFG.get("workers", 0) or 0))
+time_stretch.configure_tiers(TIME_STRETCH_CFG.get("tiers"), str(TIME_STRETCH_CFG.get("tier", "final")))
+# Unchanged segments re-rendered with the same timing reuse their stored stretch
+if TIME_STRETCH_CFG.get("cache", True):
+    STRETCH_CACHE.configure(
+        STRETCH_CACHE_DIR,
+        on_lookup=lambda hit, entry: CACHE_MANAGER.record_lookup("stretched_segments", hit, entry),
+    )
+# One resampler for every rate conversion (soxr quality: QQ, LQ, MQ, HQ, VHQ); converted segment
+# files land in a managed cache area
+RESAMPLER.configure(
+    quality=str((general_cfg.get("resampling", {}) or {}).get("quality", "HQ")),
+    cache_root=RESAMPLED_CACHE_DIR,
+    on_lookup=lambda hit, entry: CACHE_MANAGER.record_lookup("resampled_segments", hit, entry),
+)
+# Long subtitle burns are split at keyframes and encoded by several ffmpeg processes at once
+parallel_burn.configure((general_cfg.get("subtitles", {}) or {}).get("parallel_burn"))
+# Every VAD call (TTS trimming, audio structure checks, the god-tier VAD stage) uses this backend
+vad_backend.configure(general_cfg.get("vad", {}) or {})
 logger.info("Pipeline concurrency limited to 2 simultaneous executions (GPU memory protection)")
 
 OUTS.mkdir(parents=True, exist_ok=True)
@@ -555,6 +681,9 @@ def safe_filename(name: str) -> str:
 
 
 def infer_media_digest(path: Path) -> Optional[str]:
+    cached_digest = DOWNLOAD_CACHE.digest_for_path(path)
+    if cached_digest:
+        return cached_digest
     uploads_hash_root = (UPLOADS_DIR / UPLOAD_HASH_SUBDIR).resolve()
     try:
         relative = path.resolve().relative_to(uploads_hash_root)
@@ -607,6 +736,7 @@ def _persist_uploaded_file_sync(file: UploadFile, uploads_dir: Path) -> Path:
         existing_path: Optional[Path] = None
         if digest_dir.exists():
             existing_path = next((p for p in digest_dir.iterdir() if p.is_file()), None)
+        CACHE_MANAGER.record_lookup("uploads", existing_path is not None, existing_path)
         if existing_path:
             temp_path.unlink(missing_ok=True)
             return existing_path
@@ -634,24 +764,153 @@ def raw_audio_cache_key(media_digest: str) -> str:
     return media_digest
 
 
-def raw_audio_cache_path(cache_key: str) -> Path:
+def raw_audio_cache_dir(cache_key: str) -> Path:
     prefix = cache_key[:2] if len(cache_key) >= 2 else "00"
-    return RAW_AUDIO_CACHE / prefix / cache_key / RAW_AUDIO_CACHE_FILENAME
+    return RAW_AUDIO_CACHE / prefix / cache_key
 
 
-async def load_cached_raw_audio(cache_key: str, target_path: Path) -> bool:
-    cache_file = raw_audio_cache_path(cache_key)
-    if not cache_file.exists():
+async def load_cached_raw_audio(cache_key: str, target_path: Path, analysis_path: Optional[Path] = None) -> bool:
+    """Restore the mixing master (and the 16 kHz analysis rendition when cached) for a media digest."""
+    cache_dir = raw_audio_cache_dir(cache_key)
+    cache_file = STORAGE_CODEC.find(cache_dir, RAW_AUDIO_CACHE_STEM)
+    CACHE_MANAGER.record_lookup("raw_audio", cache_file is not None, cache_dir)
+    if cache_file is None:
         return False
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    await run_in_thread(shutil.copy, cache_file, target_path)
+    await run_in_thread(STORAGE_CODEC.decode, cache_file, target_path)
+    if analysis_path is not None:
+        analysis_file = STORAGE_CODEC.find(cache_dir, RAW_AUDIO_ANALYSIS_STEM)
+        if analysis_file is not None:
+            await run_in_thread(STORAGE_CODEC.decode, analysis_file, analysis_path)
     return True
 
 
-async def store_raw_audio_cache(cache_key: str, source_path: Path) -> None:
-    cache_file = raw_audio_cache_path(cache_key)
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
-    await run_in_thread(shutil.copy, source_path, cache_file)
+async def store_raw_audio_cache(cache_key: str, source_path: Path, analysis_path: Optional[Path] = None) -> None:
+    cache_dir = raw_audio_cache_dir(cache_key)
+    await run_in_thread(STORAGE_CODEC.encode, source_path, cache_dir, RAW_AUDIO_CACHE_STEM)
+    if analysis_path is not None and analysis_path.exists():
+        await run_in_thread(STORAGE_CODEC.encode, analysis_path, cache_dir, RAW_AUDIO_ANALYSIS_STEM)
+    CACHE_MANAGER.touch(cache_dir)
+
+
+@asynccontextmanager
+async def single_flight(kind: str, key: Optional[str]):
+    if not key or not SINGLE_FLIGHT_CFG.get("enabled", True):
+        yield
+        return
+    async with SINGLE_FLIGHT.hold(f"{kind}:{key}"):
+        yield
+
+
+def _artifact_cache_dir(root: Path, cache_key: str) -> Path:
+    prefix = cache_key[:2] if len(cache_key) >= 2 else "00"
+    return root / prefix / cache_key
+
+
+def asr_cache_key(source_key: str, asr_model: str, **params: Any) -> str:
+    payload = json.dumps({"source": source_key, "model": asr_model, **params}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_asr(cache_key: str, audio_path: Path) -> Optional[Tuple[ASRResponse, Optional[ASRResponse]]]:
+    cache_dir = _artifact_cache_dir(ASR_CACHE, cache_key)
+    raw_file = cache_dir / "raw.json"
+    CACHE_MANAGER.record_lookup("asr", raw_file.exists(), cache_dir)
+    if not raw_file.exists():
+        return None
+    try:
+        raw_result = ASRResponse(**json.loads(raw_file.read_text()))
+        aligned_file = cache_dir / "aligned.json"
+        aligned_result = ASRResponse(**json.loads(aligned_file.read_text())) if aligned_file.exists() else None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable ASR cache entry %s: %s", cache_key, exc)
+        return None
+    raw_result.audio_url = str(audio_path)
+    if aligned_result is not None and aligned_result.audio_url:
+        aligned_result.audio_url = str(audio_path)
+    return raw_result, aligned_result
+
+
+def store_cached_asr(cache_key: str, raw_result: ASRResponse, aligned_result: Optional[ASRResponse]) -> None:
+    cache_dir = _artifact_cache_dir(ASR_CACHE, cache_key)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if aligned_result is not None:
+        (cache_dir / "aligned.json").write_text(json.dumps(aligned_result.model_dump()))
+    # raw.json marks the entry complete, so it is written last
+    (cache_dir / "raw.json").write_text(json.dumps(raw_result.model_dump()))
+
+
+def tts_segment_cache_key(tts_model: str, segment: SegmentAudioIn) -> str:
+    prompt_digest = None
+    if segment.audio_prompt_url and Path(segment.audio_prompt_url).exists():
+        prompt_digest = hash_file_contents(Path(segment.audio_prompt_url))
+    payload = json.dumps(
+        {
+            "model": tts_model,
+            "lang": segment.lang,
+            "text": segment.text,
+            "speaker": segment.speaker_id,
+            "prompt": prompt_digest,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_tts_segment(cache_key: str, segment: SegmentAudioIn, target_dir: Path) -> Optional[SegmentAudioOut]:
+    cache_dir = _artifact_cache_dir(TTS_SEGMENT_CACHE, cache_key)
+    audio_file = STORAGE_CODEC.find(cache_dir, "segment")
+    meta_file = cache_dir / "meta.json"
+    hit = audio_file is not None and meta_file.exists()
+    CACHE_MANAGER.record_lookup("tts_segments", hit, cache_dir)
+    if not hit:
+        return None
+    target = target_dir / f"cached_{segment.segment_id or cache_key}.wav"
+    STORAGE_CODEC.decode(audio_file, target)
+    meta = json.loads(meta_file.read_text())
+    return SegmentAudioOut(
+        start=segment.start,
+        end=segment.end,
+        text=segment.text,
+        audio_prompt_url=segment.audio_prompt_url,
+        audio_url=str(target),
+        speaker_id=segment.speaker_id,
+        lang=segment.lang,
+        sample_rate=meta.get("sample_rate"),
+        segment_id=segment.segment_id,
+    )
+
+
+def store_cached_tts_segment(cache_key: str, output: SegmentAudioOut) -> None:
+    source = Path(output.audio_url)
+    if not source.exists():
+        return
+    cache_dir = _artifact_cache_dir(TTS_SEGMENT_CACHE, cache_key)
+    STORAGE_CODEC.encode(source, cache_dir, "segment")
+    (cache_dir / "meta.json").write_text(json.dumps({"sample_rate": output.sample_rate}))
+
+
+def compact_persisted_audio(workspace_root: Path, relative_dirs: Iterable[str]) -> int:
+    """Re-encode persisted intermediate WAVs with the storage codec.
+
+    JSON dumps in the workspace that reference a renamed file are rewritten so
+    the persisted artifacts stay consistent.
+    """
+    renamed = STORAGE_CODEC.compact_tree(workspace_root / rel for rel in relative_dirs)
+    if not renamed:
+        return 0
+    replacements = {json.dumps(old)[1:-1]: json.dumps(new)[1:-1] for old, new in renamed.items()}
+    for json_path in workspace_root.rglob("*.json"):
+        try:
+            text = json_path.read_text()
+        except OSError:
+            continue
+        updated = text
+        for old, new in replacements.items():
+            if old in updated:
+                updated = updated.replace(old, new)
+        if updated != text:
+            json_path.write_text(updated)
+    return len(renamed)
 
 
 def emit_progress(event: Dict[str, Any]) -> None:
@@ -779,25 +1038,18 @@ async def has_video_stream(path: str | Path) -> bool:
     # quick short-circuit by extension
     if p.suffix.lower() in AUDIO_EXTENSIONS:
         return False
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=index",
-        "-of", "csv=p=0",
-        str(p),
-    ]
     try:
-        proc = await run_subprocess(cmd, description="ffprobe stream query failed")
-        return bool(proc.stdout.strip())
-    except HTTPException:
-        return False 
+        info = await run_in_thread(MEDIA_INFO.probe, p)
+    except (MediaProbeError, FileNotFoundError) as exc:
+        logger.error("Media probe failed for %s: %s", p, exc)
+        return False
+    return info.has_video
 
 async def download_media_to_workspace(source_url: str, download_dir: Path) -> Path:
     logger.info("Downloading remote media: %s", source_url)
     emit_progress({"type": "status", "event": "download_start", "url": source_url})
 
-    def _download() -> Path:
+    def _download(target_dir: Path) -> Path:
         try:
             import yt_dlp  # noqa: WPS433
         except ImportError as exc:
@@ -808,12 +1060,14 @@ async def download_media_to_workspace(source_url: str, download_dir: Path) -> Pa
             ) from exc
 
         ydl_opts = {
-            "outtmpl": str(download_dir / "%(id)s.%(ext)s"),
+            "outtmpl": str(target_dir / "%(id)s.%(ext)s"),
             "merge_output_format": "mp4",
             "format": "bv*+ba/b",
             "noplaylist": True,
             "quiet": True,
             "no_warnings": True,
+            # Fetch DASH/HLS fragments in parallel instead of one at a time
+            "concurrent_fragment_downloads": int(DOWNLOAD_CACHE_CFG.get("concurrent_fragment_downloads", 4)),
             "progress_hooks": [
                 lambda d: emit_progress(
                     {
@@ -838,10 +1092,29 @@ async def download_media_to_workspace(source_url: str, download_dir: Path) -> Pa
                     break
             return Path(filename)
 
-    download_dir.mkdir(parents=True, exist_ok=True)
-    local_path = await run_in_thread(_download)
-    if not local_path.exists():
-        raise HTTPException(500, f"Failed to download media from {source_url}")
+    async def _fetch(target_dir: Path) -> Path:
+        downloaded = await run_in_thread(_download, target_dir)
+        if not downloaded.exists():
+            raise HTTPException(500, f"Failed to download media from {source_url}")
+        return downloaded
+
+    if DOWNLOAD_CACHE_CFG.get("enabled", True):
+        cache_hit = await run_in_thread(DOWNLOAD_CACHE.lookup, source_url)
+        if cache_hit is not None:
+            logger.info("♻️  Reusing cached download for %s: %s", source_url, cache_hit)
+            emit_progress({
+                "type": "status",
+                "event": "download_cached",
+                "url": source_url,
+                "path": str(cache_hit),
+            })
+            return cache_hit
+        # Identical URLs requested concurrently share a single download
+        local_path = await DOWNLOAD_CACHE.fetch(source_url, _fetch)
+    else:
+        download_dir.mkdir(parents=True, exist_ok=True)
+        local_path = await _fetch(download_dir)
+
     logger.info("Remote media downloaded to %s", local_path)
     emit_progress({
         "type": "status",
@@ -887,74 +1160,148 @@ async def prepare_media_source(
     return destination, media_digest
 
 
-async def extract_audio_to_workspace(source_url: str, raw_audio_path: Path) -> None:
-    if source_url.endswith(VIDEO_EXTENSIONS):
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            source_url,
-            "-vn",
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            "44100",
-            "-ac",
-            "2",
+def raw_audio_renditions_cmd(source: str, raw_audio_path: Path, analysis_path: Optional[Path]) -> List[str]:
+    """One decode, split into the 44.1 kHz stereo mixing master and the 16 kHz mono analysis track."""
+    if analysis_path is None:
+        return [
+            "ffmpeg", "-y", "-i", source, "-vn",
+            "-acodec", "pcm_s16le", "-ar", "44100", "-ac", "2",
             str(raw_audio_path),
         ]
-        await run_subprocess(cmd, description="FFmpeg audio extraction failed")
-    elif source_url.endswith(AUDIO_EXTENSIONS):
-        if source_url.endswith(".wav"):
-            await run_in_thread(shutil.copy, source_url, raw_audio_path)
-        else:
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-i",
-                source_url,
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                "44100",
-                "-ac",
-                "2",
-                str(raw_audio_path),
-            ]
-            await run_subprocess(cmd, description="FFmpeg audio conversion failed")
-    else:
+    graph = (
+        "[0:a:0]asplit=2[master][analysis];"
+        "[master]aresample=44100,aformat=sample_fmts=s16:channel_layouts=stereo[m];"
+        "[analysis]aformat=channel_layouts=mono,aresample=16000,aformat=sample_fmts=s16[a]"
+    )
+    return [
+        "ffmpeg", "-y", "-i", source,
+        "-filter_complex", graph,
+        "-map", "[m]", "-acodec", "pcm_s16le", str(raw_audio_path),
+        "-map", "[a]", "-acodec", "pcm_s16le", str(analysis_path),
+    ]
+
+
+def write_analysis_rendition(source_path: Path, analysis_path: Path) -> None:
+    """Stream a WAV source into the 16 kHz mono PCM analysis track without spawning ffmpeg."""
+    import numpy as np
+    import soundfile as sf
+
+    with sf.SoundFile(str(source_path)) as src, sf.SoundFile(
+        str(analysis_path), "w", samplerate=16000, channels=1, format="WAV", subtype="PCM_16"
+    ) as dst:
+        stream = RESAMPLER.stream(src.samplerate, 16000)
+        for block in src.blocks(blocksize=1 << 16, dtype="float32", always_2d=True):
+            dst.write(stream.resample_chunk(block.mean(axis=1)))
+        dst.write(stream.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+
+
+async def extract_audio_to_workspace(
+    source_url: str,
+    raw_audio_path: Path,
+    analysis_path: Optional[Path] = None,
+) -> None:
+    if not source_url.endswith(VIDEO_EXTENSIONS + AUDIO_EXTENSIONS):
         raise HTTPException(400, f"Unsupported file format: {source_url}")
 
+    if source_url.endswith(".wav"):
+        # PCM input needs no decode: copy the master and derive the analysis track in-process
+        await run_in_thread(shutil.copy, source_url, raw_audio_path)
+        if analysis_path is not None:
+            await run_in_thread(write_analysis_rendition, raw_audio_path, analysis_path)
+    else:
+        await run_subprocess(
+            raw_audio_renditions_cmd(source_url, raw_audio_path, analysis_path),
+            description="FFmpeg audio extraction failed",
+        )
+
     if not raw_audio_path.exists() or raw_audio_path.stat().st_size == 0:
         raise HTTPException(500, "Audio extraction produced an empty file")
-    
 
-# find a way to delete the cached files after some time or size limit
+
+async def prepare_raw_audio(
+    source_path: Path,
+    media_digest: Optional[str],
+    raw_audio_path: Path,
+    analysis_path: Path,
+    step_timer: StepTimer,
+) -> None:
+    """
+    Materialize the mixing master and the 16 kHz mono analysis track for a source, from the
+    raw-audio cache when possible, otherwise with a single ffmpeg decode.
+    """
+    cache_token = raw_audio_cache_key(media_digest) if media_digest else None
+    if cache_token and await load_cached_raw_audio(cache_token, raw_audio_path, analysis_path):
+        logger.info("Loaded raw audio from cache for media digest %s", media_digest)
+    else:
+        async with single_flight("raw_audio", cache_token):
+            # Another request may have extracted the same media while we waited
+            if cache_token and await load_cached_raw_audio(cache_token, raw_audio_path, analysis_path):
+                logger.info("Loaded raw audio extracted by a concurrent request for %s", media_digest)
+            else:
+                with step_timer.time("extract_audio"):
+                    await extract_audio_to_workspace(str(source_path), raw_audio_path, analysis_path)
+                if cache_token:
+                    await store_raw_audio_cache(cache_token, raw_audio_path, analysis_path)
+
+    if not analysis_path.exists():
+        # Cache entries written before the analysis rendition existed only hold the master
+        with step_timer.time("extract_analysis_audio"):
+            await run_in_thread(write_analysis_rendition, raw_audio_path, analysis_path)
+        if cache_token:
+            cache_dir = raw_audio_cache_dir(cache_token)
+            await run_in_thread(STORAGE_CODEC.encode, analysis_path, cache_dir, RAW_AUDIO_ANALYSIS_STEM)
+
+
 async def load_cached_separation(cache_key: str, vocals_target: Path, background_target: Path) -> bool:
     cache_dir = SEPARATION_CACHE / cache_key
-    vocals_cache = cache_dir / "vocals.wav"
-    background_cache = cache_dir / "background.wav"
-    if not vocals_cache.exists() or not background_cache.exists():
+    vocals_cache = STORAGE_CODEC.find(cache_dir, "vocals")
+    background_cache = STORAGE_CODEC.find(cache_dir, "background")
+    hit = vocals_cache is not None and background_cache is not None
+    CACHE_MANAGER.record_lookup("separation", hit, cache_dir)
+    if not hit:
         return False
 
-    await run_in_thread(shutil.copy, vocals_cache, vocals_target)
-    await run_in_thread(shutil.copy, background_cache, background_target)
+    await run_in_thread(STORAGE_CODEC.decode, vocals_cache, vocals_target)
+    await run_in_thread(STORAGE_CODEC.decode, background_cache, background_target)
     return True
 
 
 async def store_separation_cache(cache_key: str, vocals_source: Path, background_source: Path) -> None:
     cache_dir = SEPARATION_CACHE / cache_key
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    await run_in_thread(shutil.copy, vocals_source, cache_dir / "vocals.wav")
-    await run_in_thread(shutil.copy, background_source, cache_dir / "background.wav")
+    await run_in_thread(STORAGE_CODEC.encode, vocals_source, cache_dir, "vocals")
+    await run_in_thread(STORAGE_CODEC.encode, background_source, cache_dir, "background")
+    CACHE_MANAGER.touch(cache_dir)
+
+async def separation_needed(raw_audio_path: Path) -> bool:
+    """Skip separation on clean speech (mode "auto"); any analysis failure falls back to separating."""
+    if SEPARATION_MODE != "auto":
+        logger.info("🎚️ Separation analysis disabled (mode=%s); separating", SEPARATION_MODE)
+        return True
+    try:
+        analysis = await run_in_thread(analyze_separation_need, raw_audio_path, SEPARATION_THRESHOLDS)
+    except Exception as exc:
+        logger.warning("Separation analysis failed (%s); separating", exc)
+        return True
+    logger.info(
+        "🎚️ Separation analysis: %s (%s) -> %s | speech %.0f%%, background %.1f dB, gap flatness %.3f, gap H/P %.1f dB",
+        analysis.label,
+        analysis.reason,
+        "separating" if analysis.needs_separation else "skipping separation",
+        analysis.speech_coverage * 100,
+        analysis.background_db,
+        analysis.gap_flatness,
+        analysis.gap_harmonic_ratio_db,
+    )
+    return analysis.needs_separation
+
 
-# see if we can implement automatic noise level detection in future improvements work. to judge if separation is needed for some tasks
 async def maybe_run_audio_separation(
     preprocessing_dir: Path,
     raw_audio_path: Path,
     sep_model: str,
     audio_sep: bool,
     dubbing_strategy: str,
+    analysis_audio_path: Optional[Path] = None,
 ) -> Tuple[Optional[Path], Optional[Path], str]:
     if not audio_sep and dubbing_strategy != "full_replacement": # here we just supposed that if audio separation is disabled and the strategy is not full replacement we don't need to do separation
         return None, None, dubbing_strategy
@@ -967,12 +1314,34 @@ async def maybe_run_audio_separation(
     vocals_path = preprocessing_dir / "vocals.wav"
     background_path = preprocessing_dir / "background.wav"
 
+    analysis_source = analysis_audio_path if analysis_audio_path and analysis_audio_path.exists() else raw_audio_path
+    if not await separation_needed(analysis_source):
+        return None, None, dubbing_strategy
+
     cache_key = await separation_cache_key(raw_audio_path, sep_model)
 
     if await load_cached_separation(cache_key, vocals_path, background_path):
         logger.info("Loaded separated stems from cache")
         return vocals_path, background_path, dubbing_strategy
 
+    async with single_flight("stems", cache_key):
+        # Another request may have separated the same audio while we waited
+        if await load_cached_separation(cache_key, vocals_path, background_path):
+            logger.info("Loaded separated stems produced by a concurrent request")
+            return vocals_path, background_path, dubbing_strategy
+        return await _run_audio_separation(
+            raw_audio_path, vocals_path, background_path, sep_model, cache_key, dubbing_strategy
+        )
+
+
+async def _run_audio_separation(
+    raw_audio_path: Path,
+    vocals_path: Path,
+    background_path: Path,
+    sep_model: str,
+    cache_key: str,
+    dubbing_strategy: str,
+) -> Tuple[Optional[Path], Optional[Path], str]:
     model_file_dir = BASE / "models_cache" / "audio-separator-models" / Path(sep_model).stem
     logger.info("Starting audio separation with model %s", sep_model)
     
@@ -981,30 +1350,47 @@ async def maybe_run_audio_separation(
         logger.error(f"Raw audio file disappeared before separation: {raw_audio_path}")
         return None, None, "default"
     
-    # CRITICAL FIX: Use lock to prevent multiple workers from downloading/loading the same
-    # model file simultaneously, which causes file corruption and orchestrator crash
-    async with _MODEL_DOWNLOAD_LOCK:
-        logger.info(f"Acquired model download lock for {sep_model}")
-        try:
+    custom_output_names = {"vocals": "vocals", get_non_vocals_stem(sep_model): "background"}
+    duration = await run_in_thread(get_audio_duration, raw_audio_path)
+    chunked = bool(SEPARATION_CHUNKING_CFG.get("enabled", False)) and duration > float(
+        SEPARATION_CHUNKING_CFG.get("min_duration_seconds", 600)
+    )
+
+    # The separator pool serializes the first download of each model with a per-model file
+    # lock (prevents corrupted checkpoints) and otherwise lets separations run concurrently
+    try:
+        if chunked:
+            import torch
+
+            await run_in_thread(
+                separate_in_chunks,
+                input_file=str(raw_audio_path),
+                output_dir=str(vocals_path.parent),
+                model_filename=sep_model,
+                model_file_dir=str(model_file_dir),
+                custom_output_names=custom_output_names,
+                config=SEPARATION_CHUNKING,
+                use_processes=not torch.cuda.is_available(),
+                max_threads=SEPARATOR_POOL.max_concurrent,
+            )
+        else:
             await run_in_thread(
                 separation,
                 input_file=str(raw_audio_path),
                 output_dir=str(vocals_path.parent),
                 model_filename=sep_model,
                 output_format="WAV",
-                custom_output_names={"vocals": "vocals", get_non_vocals_stem(sep_model): "background"},
+                custom_output_names=custom_output_names,
                 model_file_dir=str(model_file_dir),
             )
-        except ValueError as exc:
-            logger.error("Audio separation failed with %s", exc)
-            logger.error("Supported models:\\n%s", json.dumps(filter_supported_models_grouped(), indent=2))
-            return None, None, "default"
-        except FileNotFoundError as exc:
-            logger.error(f"File not found during audio separation: {exc}")
-            logger.error(f"Raw audio path was: {raw_audio_path}, exists: {raw_audio_path.exists()}")
-            return None, None, "default"
-        finally:
-            logger.info(f"Released model download lock for {sep_model}")
+    except ValueError as exc:
+        logger.error("Audio separation failed with %s", exc)
+        logger.error("Supported models:\\n%s", json.dumps(filter_supported_models_grouped(), indent=2))
+        return None, None, "default"
+    except FileNotFoundError as exc:
+        logger.error(f"File not found during audio separation: {exc}")
+        logger.error(f"Raw audio path was: {raw_audio_path}, exists: {raw_audio_path.exists()}")
+        return None, None, "default"
 
     if not vocals_path.exists() or not background_path.exists():
         logger.warning("Separation completed but expected stems are missing; falling back to user original audio and translation over dubbing strategy")
@@ -1035,9 +1421,11 @@ async def copy_to_persistent_storage(workspace_id: str, workspace_path: Path) ->
             return True  # Not an error, just not on Modal
         
         # Find all output files
-        output_files = list(workspace_path.glob("dubbed_video_*.mp4"))
+        # Per-language .mp4 files and the multi-track package, which may be .mkv
+        output_files = [path for path in workspace_path.glob("dubbed_video_*.*") if path.suffix in VIDEO_EXTENSIONS]
         output_files.extend(list(workspace_path.glob("*.srt")))
         output_files.extend(list(workspace_path.glob("*.vtt")))
+        output_files.extend(list(workspace_path.glob(f"*{streaming_output.STREAM_DIR_SUFFIX}/*")))
         
         if not output_files:
             logger.info("No output files to persist")
@@ -1072,7 +1460,8 @@ async def copy_to_persistent_storage(workspace_id: str, workspace_path: Path) ->
         for src_path in output_files:
             try:
                 if src_path.exists():
-                    dest_path = dest_dir / src_path.name
+                    dest_path = dest_dir / src_path.relative_to(workspace_path)
+                    dest_path.parent.mkdir(parents=True, exist_ok=True)
                     logger.info(f"Copying {src_path.name} to persistent storage")
                     shutil.copy2(src_path, dest_path)
                     copied_count += 1
@@ -1108,6 +1497,7 @@ async def run_asr_step(
     *,
     perform_alignment: bool = True,
     diarize: bool = True,
+    source_key: Optional[str] = None,
 ) -> Tuple[ASRResponse, Optional[ASRResponse]]:
     # FIX: Extract language code from UI format "Chinese (zh)" -> "zh"
     import re
@@ -1116,7 +1506,59 @@ async def run_asr_step(
         # Extract code from parentheses: "Chinese (zh)" -> "zh"
         match = re.search(r'\(([a-z]{2,3})\)', source_lang)
         language_hint = match.group(1) if match else source_lang.strip()
-    
+
+    async def _transcribe() -> Tuple[ASRResponse, Optional[ASRResponse]]:
+        return await _run_asr_request(
+            client,
+            raw_audio_path,
+            asr_model,
+            language_hint,
+            min_speakers,
+            max_speakers,
+            perform_alignment=perform_alignment,
+            diarize=diarize,
+        )
+
+    # source_key identifies the audio content (e.g. media digest + stem), so identical
+    # concurrent or repeated transcriptions are served from the ASR cache
+    if not source_key or not SINGLE_FLIGHT_CFG.get("asr_result_cache", True):
+        return await _transcribe()
+
+    cache_key = asr_cache_key(
+        source_key,
+        asr_model,
+        language_hint=language_hint,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        perform_alignment=perform_alignment,
+        diarize=diarize,
+    )
+    cached = await run_in_thread(load_cached_asr, cache_key, raw_audio_path)
+    if cached is not None:
+        logger.info("Loaded ASR result from cache")
+        return cached
+
+    async with single_flight("asr", cache_key):
+        cached = await run_in_thread(load_cached_asr, cache_key, raw_audio_path)
+        if cached is not None:
+            logger.info("Loaded ASR result produced by a concurrent request")
+            return cached
+        raw_result, aligned_result = await _transcribe()
+        await run_in_thread(store_cached_asr, cache_key, raw_result, aligned_result)
+        return raw_result, aligned_result
+
+
+async def _run_asr_request(
+    client: httpx.AsyncClient,
+    raw_audio_path: Path,
+    asr_model: str,
+    language_hint: Optional[str],
+    min_speakers: Optional[int],
+    max_speakers: Optional[int],
+    *,
+    perform_alignment: bool,
+    diarize: bool,
+) -> Tuple[ASRResponse, Optional[ASRResponse]]:
     asr_req = ASRRequest(
         audio_url=str(raw_audio_path),  # FIX: Use audio_url, not audio_path
         model_key=asr_model,
@@ -1216,7 +1658,12 @@ async def synthesize_tts(
     tr_result: ASRResponse,
     target_lang: str,
     workspace_path: Path,
-) -> TTSResponse:
+) -> Tuple[TTSResponse, List[SegmentAudioIn], List[Optional[str]]]:
+    """Synthesize every translated segment, reusing cached audio.
+
+    Besides the response, returns the request and segment cache key (``None`` with the cache off)
+    behind each returned segment, so resynthesis retries exactly what was asked for.
+    """
     ensure_segment_ids(tr_result)
     tts_segments = [
         SegmentAudioIn(
@@ -1231,6 +1678,126 @@ async def synthesize_tts(
         for seg in tr_result.segments
     ]
 
+    if not SINGLE_FLIGHT_CFG.get("tts_segment_cache", True) or not tts_segments:
+        response = await request_tts(client, tts_model, tts_segments, target_lang, workspace_path)
+        outputs = _match_tts_outputs(tts_segments, response)
+        order = sorted(outputs)
+        return (
+            TTSResponse(segments=[outputs[idx] for idx in order], meta=response.meta),
+            [tts_segments[idx] for idx in order],
+            [None] * len(order),
+        )
+
+    keys = await run_in_thread(lambda: [tts_segment_cache_key(tts_model, seg) for seg in tts_segments])
+    outputs: Dict[int, SegmentAudioOut] = {}
+
+    async def _load_cached(indices: List[int]) -> None:
+        for idx in indices:
+            cached = await run_in_thread(load_cached_tts_segment, keys[idx], tts_segments[idx], workspace_path)
+            if cached is not None:
+                outputs[idx] = cached
+
+    await _load_cached(list(range(len(tts_segments))))
+    missing = [idx for idx in range(len(tts_segments)) if idx not in outputs]
+    meta: Optional[Dict[str, Any]] = None
+    if missing:
+        async with SINGLE_FLIGHT.hold_many(f"tts:{keys[idx]}" for idx in missing):
+            # Segments synthesized by a concurrent request while we waited
+            await _load_cached(missing)
+            missing = [idx for idx in missing if idx not in outputs]
+            if missing:
+                response = await request_tts(
+                    client, tts_model, [tts_segments[idx] for idx in missing], target_lang, workspace_path
+                )
+                meta = response.meta
+                for position, out in _match_tts_outputs([tts_segments[idx] for idx in missing], response).items():
+                    idx = missing[position]
+                    outputs[idx] = out
+                    await run_in_thread(store_cached_tts_segment, keys[idx], out)
+
+    reused = len(tts_segments) - len(missing)
+    if reused:
+        logger.info("♻️  Reused %d/%d cached TTS segments", reused, len(tts_segments))
+    order = sorted(outputs)
+    return (
+        TTSResponse(segments=[outputs[idx] for idx in order], meta=meta),
+        [tts_segments[idx] for idx in order],
+        [keys[idx] for idx in order],
+    )
+
+
+def _match_tts_outputs(requested: List[SegmentAudioIn], response: TTSResponse) -> Dict[int, SegmentAudioOut]:
+    """Map each requested segment's position to its output, by segment id or, for id-less outputs, by position."""
+    by_id = {out.segment_id: out for out in response.segments if out.segment_id}
+    matched: Dict[int, SegmentAudioOut] = {}
+    for position, seg in enumerate(requested):
+        out = by_id.get(seg.segment_id)
+        if out is None and position < len(response.segments) and not response.segments[position].segment_id:
+            out = response.segments[position]
+        if out is not None:
+            matched[position] = out
+    return matched
+
+
+def _validate_tts_result(tts_result: TTSResponse) -> ValidationReport:
+    return validate_segments_batch(
+        [seg.audio_url for seg in tts_result.segments],
+        min_duration=float(TTS_VALIDATION_CFG.get("min_duration", 0.05)),
+    )
+
+
+async def resynthesize_invalid_segments(
+    client: httpx.AsyncClient,
+    tts_model: str,
+    tts_result: TTSResponse,
+    tts_inputs: List[SegmentAudioIn],
+    tts_keys: List[Optional[str]],
+    target_lang: str,
+    workspace_path: Path,
+) -> Tuple[TTSResponse, ValidationReport]:
+    """Validate every segment and resynthesize only the failed ones, up to ``tts_validation.retries`` rounds.
+
+    ``tts_inputs`` and ``tts_keys`` are the requests and cache keys returned by :func:`synthesize_tts`.
+    """
+    report = await run_in_thread(_validate_tts_result, tts_result)
+    repaired: set[int] = set()
+    retries = int(TTS_VALIDATION_CFG.get("retries", 1))
+    for attempt in range(retries):
+        failed = report.failed_indices
+        if not failed:
+            break
+        logger.warning("🔁 Resynthesizing %d/%d invalid TTS segments (attempt %d)", len(failed), len(tts_result.segments), attempt + 1)
+        inputs = [tts_inputs[idx] for idx in failed]
+        try:
+            response = await request_tts(client, tts_model, inputs, target_lang, workspace_path)
+        except (HTTPException, httpx.HTTPError) as exc:
+            logger.warning("TTS resynthesis failed, keeping the invalid segments: %s", getattr(exc, "detail", exc))
+            break
+        for position, out in _match_tts_outputs(inputs, response).items():
+            idx = failed[position]
+            tts_result.segments[idx] = out
+            repaired.add(idx)
+        report = await run_in_thread(_validate_tts_result, tts_result)
+
+    failed = set(report.failed_indices)
+    if SINGLE_FLIGHT_CFG.get("tts_segment_cache", True) and (failed or repaired):
+        # Keep bad audio out of the segment cache: store repaired segments, drop ones still invalid
+        for idx in sorted(failed | repaired):
+            key = tts_keys[idx] or await run_in_thread(tts_segment_cache_key, tts_model, tts_inputs[idx])
+            if idx in failed:
+                await run_in_thread(shutil.rmtree, _artifact_cache_dir(TTS_SEGMENT_CACHE, key), True)
+            else:
+                await run_in_thread(store_cached_tts_segment, key, tts_result.segments[idx])
+    return tts_result, report
+
+
+async def request_tts(
+    client: httpx.AsyncClient,
+    tts_model: str,
+    tts_segments: List[SegmentAudioIn],
+    target_lang: str,
+    workspace_path: Path,
+) -> TTSResponse:
     tts_req = TTSRequest(segments=tts_segments, workspace=str(workspace_path), language=target_lang)
     response = await client.post(TTS_URL, params={"model_key": tts_model}, json=tts_req.model_dump())
     if response.status_code != 200:
@@ -1399,21 +1966,19 @@ async def regenerate_tts_segment_audio(
 
 async def trim_tts_segments(tts_result: TTSResponse, vad_dir: Path) -> TTSResponse:
     vad_dir.mkdir(parents=True, exist_ok=True)
-    trimmed_segments = []
-    for idx, seg in enumerate(tts_result.segments):
-        original_audio = Path(seg.audio_url)
-        trimmed_audio = vad_dir / f"trimmed_{idx}_{original_audio.stem}.wav"
-        try:
-            _, output_path = await run_in_thread(
-                trim_audio_with_vad,
-                audio_path=seg.audio_url,
-                output_path=trimmed_audio,
-            )
-            seg.audio_url = str(output_path)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("VAD trimming failed for segment %s: %s", idx, exc)
-        trimmed_segments.append(seg)
-    tts_result.segments = trimmed_segments
+    items = [
+        (seg.audio_url, vad_dir / f"trimmed_{idx}_{Path(seg.audio_url).stem}.wav")
+        for idx, seg in enumerate(tts_result.segments)
+    ]
+    try:
+        # One decode per segment, a single VAD pass over the batch; durations land in MEDIA_INFO
+        results = await run_in_thread(trim_audio_batch, items)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("VAD trimming failed, keeping untrimmed TTS segments: %s", exc)
+        return tts_result
+    for seg, result in zip(tts_result.segments, results):
+        if result is not None:
+            seg.audio_url = result.output_path
     return tts_result
 
 
@@ -1423,6 +1988,8 @@ async def concatenate_segments(
     target_duration: float,
     translation_segments: List[Dict[str, Any]],
     strict_segment_timing: bool = True,  # NEW: Accept as parameter with default
+    sample_rate: Optional[int] = None,
+    stretch_tier: Optional[str] = None,
 ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
     return await run_in_thread(
         concatenate_audio,
@@ -1434,10 +2001,26 @@ async def concatenate_segments(
         translation_segments=translation_segments,
         # Use parameter value, fallback to config if not explicitly set
         strict_timing=strict_segment_timing if strict_segment_timing is not None else general_cfg.get("strict_segment_timing", {}).get("enabled", True),
-        max_speed_ratio=float(general_cfg.get("strict_segment_timing", {}).get("max_speed_ratio", 1.35))
+        max_speed_ratio=float(general_cfg.get("strict_segment_timing", {}).get("max_speed_ratio", 1.35)),
+        stretch_tier=stretch_tier,
+        sample_rate=sample_rate,
     )
 
 
+def negotiate_run_sample_rate(tts_result: TTSResponse, output_reference: Optional[Path]) -> Optional[int]:
+    """Working rate for a run's timeline: the output track's rate, else the TTS model's native rate."""
+    output_rate = None
+    if output_reference is not None:
+        try:
+            output_rate = MEDIA_INFO.probe(output_reference).sample_rate
+        except (MediaProbeError, FileNotFoundError) as exc:
+            logger.warning("Could not probe %s for the working sample rate: %s", output_reference, exc)
+    try:
+        return negotiate_working_rate((seg.sample_rate for seg in tts_result.segments), output_rate)
+    except ValueError:
+        return None
+
+
 async def overlay_segments_on_background(
     segments: List[Dict[str, Any]],
     background_path: Path,
@@ -1502,6 +2085,231 @@ async def finalize_media(
         orig_duck=orig_duck,
     )
 
+async def announce_stream_when_ready(workspace_id: str, lang: str, stream: Path, poll_seconds: float = 0.5) -> None:
+    """Send the ``stream`` event once the render's HLS playlist lists a segment, so players never load it too early."""
+    playlist = stream / streaming_output.PLAYLIST_FILE
+    while not streaming_output.playlist_ready(playlist):
+        await asyncio.sleep(poll_seconds)
+    emit_progress({
+        "type": "stream",
+        "language": lang,
+        "playlist_url": f"/api/stream/{workspace_id}/{stream.name}/{streaming_output.PLAYLIST_FILE}",
+    })
+
+
+def load_render_plan(workspace_path: Path) -> Dict[str, Dict[str, Any]]:
+    plan_file = workspace_path / RENDER_PLAN_FILE
+    if not plan_file.exists():
+        return {}
+    return json.loads(plan_file.read_text())
+
+
+def render_lease_owner(workspace_id: str) -> str:
+    """Cache lease that keeps a workspace (and its source video) from being swept while renders are pending."""
+    return f"render:{workspace_id}"
+
+
+def save_render_plan(workspace_path: Path, plan: Dict[str, Dict[str, Any]]) -> None:
+    plan_file = workspace_path / RENDER_PLAN_FILE
+    if plan:
+        plan_file.write_text(json.dumps(plan, indent=2))
+    else:
+        plan_file.unlink(missing_ok=True)
+
+
+async def defer_final_render(
+    workspace: WorkspaceManager,
+    lang: str,
+    video_path: Path,
+    audio_path: Path,
+    dubbed_path: Path,
+    output_path: Optional[Path],
+    subtitle_path: Optional[Path],
+    subtitle_style: Optional[str],
+    dubbing_strategy: str,
+    speech: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Record the full-quality final pass of ``lang`` so it can run after the preview is approved.
+
+    ``speech`` holds the inputs of the speech track (``segments``, ``translation_segments``,
+    ``target_duration``, ``sample_rate``, ``strict_timing``, ``background_path``, ``sophisticated``)
+    when the preview audio was stretched at a draft tier; the approved render then rebuilds the
+    audio at the default tier instead of reusing ``audio_path``.
+    """
+    # The run's temp dirs are removed when it ends, so the render inputs are kept in the workspace
+    keep_dir = workspace.ensure_dir(f"render/{lang}")
+    kept_audio: Optional[Path] = None
+    if speech is None:
+        kept_audio = keep_dir / audio_path.name
+        await run_in_thread(shutil.copy2, audio_path, kept_audio)
+    else:
+        speech = dict(speech)
+        segments_dir = keep_dir / "segments"
+        segments_dir.mkdir(exist_ok=True)
+        kept_segments = []
+        for index, segment in enumerate(speech["segments"]):
+            kept = segments_dir / f"{index:05d}_{Path(segment['audio_url']).name}"
+            await run_in_thread(shutil.copy2, segment["audio_url"], kept)
+            kept_segments.append({**segment, "audio_url": str(kept)})
+        speech["segments"] = kept_segments
+        if speech.get("background_path"):
+            kept_background = keep_dir / Path(speech["background_path"]).name
+            await run_in_thread(shutil.copy2, speech["background_path"], kept_background)
+            speech["background_path"] = str(kept_background)
+    kept_subtitles = None
+    if subtitle_path:
+        kept_subtitles = keep_dir / subtitle_path.name
+        await run_in_thread(shutil.copy2, subtitle_path, kept_subtitles)
+
+    plan = load_render_plan(workspace.workspace)
+    plan[lang] = {
+        "video_path": str(video_path),
+        "audio_path": str(kept_audio) if kept_audio else "",
+        "speech": speech,
+        "dubbed_path": str(dubbed_path),
+        "output_path": str(output_path) if output_path else "",
+        "subtitle_path": str(kept_subtitles) if kept_subtitles else "",
+        "subtitle_style": subtitle_style,
+        "dubbing_strategy": dubbing_strategy,
+        "deferred_at": time.time(),
+    }
+    save_render_plan(workspace.workspace, plan)
+    # The run's own lease ends with the run; this one lasts until the plan is rendered
+    CACHE_MANAGER.acquire(render_lease_owner(workspace.workspace_id), workspace.workspace, video_path)
+
+
+async def render_speech_for_approval(speech: Dict[str, Any], out_dir: Path) -> Path:
+    """Rebuild a deferred language's dubbed audio from its kept TTS segments at the default stretch tier."""
+    speech_track = out_dir / "speech_track.wav"
+    concatenated_path, _ = await concatenate_segments(
+        tts_segments=speech["segments"],
+        output_file=speech_track,
+        target_duration=speech["target_duration"],
+        translation_segments=speech["translation_segments"],
+        strict_segment_timing=speech["strict_timing"],
+        sample_rate=speech["sample_rate"],
+    )
+    if not speech.get("background_path"):
+        return Path(concatenated_path)
+    final_audio_path = out_dir / "final_dubbed_audio.wav"
+    await overlay_segments_on_background(
+        speech["segments"],
+        background_path=Path(speech["background_path"]),
+        output_path=final_audio_path,
+        sophisticated=speech["sophisticated"],
+        speech_track=speech_track,
+    )
+    return final_audio_path
+
+
+def release_render_plan(workspace_id: str) -> None:
+    """Forget a workspace whose render plan is empty: its lease ends and its render lock is dropped."""
+    CACHE_MANAGER.release(render_lease_owner(workspace_id))
+    RENDER_LOCKS.pop(workspace_id, None)
+
+
+def expire_render_plan(workspace_path: Path) -> List[str]:
+    """Drop the plan entries of ``workspace_path`` older than ``PREVIEW_PENDING_TTL``; returns their languages."""
+    plan = load_render_plan(workspace_path)
+    if not plan or PREVIEW_PENDING_TTL <= 0:
+        return []
+    plan_file = workspace_path / RENDER_PLAN_FILE
+    now = time.time()
+    expired = [
+        lang for lang, job in plan.items()
+        if now - float(job.get("deferred_at") or plan_file.stat().st_mtime) > PREVIEW_PENDING_TTL
+    ]
+    for lang in expired:
+        plan.pop(lang)
+        shutil.rmtree(workspace_path / "render" / lang, ignore_errors=True)
+    if expired:
+        logger.info("Deferred render of %s in %s expired without approval", ", ".join(expired), workspace_path.name)
+        save_render_plan(workspace_path, plan)
+        if not plan:
+            release_render_plan(workspace_path.name)
+    return expired
+
+
+async def expire_render_plans_periodically(interval_seconds: float) -> None:
+    while True:
+        for plan_file in OUTS.glob(f"*/{RENDER_PLAN_FILE}"):
+            try:
+                expire_render_plan(plan_file.parent)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Could not expire render plan %s: %s", plan_file, exc)
+        await asyncio.sleep(interval_seconds)
+
+
+def pending_render_outputs(workspace_path: Path) -> Dict[str, str]:
+    """Final video path per language whose full render is still waiting for approval."""
+    return {
+        lang: job["output_path"] or job["dubbed_path"]
+        for lang, job in load_render_plan(workspace_path).items()
+    }
+
+
+async def render_pending_outputs(workspace_id: str, languages: Optional[List[str]] = None) -> Dict[str, str]:
+    """Run the deferred final passes of a workspace (all languages, or ``languages``); returns lang -> video."""
+    workspace_path = OUTS / workspace_id
+    lock = RENDER_LOCKS.setdefault(workspace_id, asyncio.Lock())
+    rendered: Dict[str, str] = {}
+    async with lock:
+        targets = [lang for lang in load_render_plan(workspace_path) if not languages or lang in languages]
+        expired = expire_render_plan(workspace_path)
+        if targets and all(lang in expired for lang in targets):
+            raise FileNotFoundError(f"the deferred render of {', '.join(targets)} expired without approval")
+        plan = load_render_plan(workspace_path)
+        if not plan:
+            return rendered
+        running = f"{render_lease_owner(workspace_id)}:running"
+        CACHE_MANAGER.acquire(running, workspace_path, *(Path(job["video_path"]) for job in plan.values()))
+        try:
+            for lang in [lang for lang in plan if not languages or lang in languages]:
+                job = plan[lang]
+                subtitle_style = job.get("subtitle_style")
+                style = (
+                    STYLE_PRESETS.get(subtitle_style.split("_")[0], STYLE_PRESETS["default"])
+                    if subtitle_style is not None
+                    else None
+                )
+                if job.get("speech"):
+                    audio_path = await render_speech_for_approval(job["speech"], workspace_path / "render" / lang)
+                else:
+                    audio_path = Path(job["audio_path"])
+                await finalize_media(
+                    job["video_path"],
+                    audio_path,
+                    Path(job["dubbed_path"]),
+                    Path(job["output_path"]) if job["output_path"] else None,
+                    Path(job["subtitle_path"]) if job["subtitle_path"] else None,
+                    style,
+                    subtitle_style.split("_")[-1] == "mobile" if subtitle_style is not None else False,
+                    job["dubbing_strategy"],
+                )
+                rendered[lang] = job["output_path"] or job["dubbed_path"]
+                plan.pop(lang)
+                save_render_plan(workspace_path, plan)
+                shutil.rmtree(workspace_path / "render" / lang, ignore_errors=True)
+        finally:
+            CACHE_MANAGER.release(running)
+            if not plan:
+                release_render_plan(workspace_id)
+    if rendered:
+        try:
+            await copy_to_persistent_storage(workspace_id, workspace_path)
+        except Exception as exc:  # noqa: BLE001
+            logger.error(f"Failed to persist outputs: {exc}", exc_info=True)
+    return rendered
+
+
+async def render_pending_or_gone(workspace_id: str, languages: Optional[List[str]] = None) -> Dict[str, str]:
+    """``render_pending_outputs`` for request handlers: inputs removed since the run answer 410 Gone."""
+    try:
+        return await render_pending_outputs(workspace_id, languages)
+    except FileNotFoundError as exc:
+        raise HTTPException(410, f"Render inputs are no longer available: {exc}") from exc
+
 #-------------------------------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------------------------------------------#
 
@@ -1525,7 +2333,25 @@ async def startup_event() -> None:
     OUTS.mkdir(parents=True, exist_ok=True)
     SEPARATION_CACHE.mkdir(parents=True, exist_ok=True)
     RAW_AUDIO_CACHE.mkdir(parents=True, exist_ok=True)
+    DOWNLOAD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
     UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    await run_in_thread(DOWNLOAD_CACHE.prune)
+    # Leases are in memory: workspaces with renders still awaiting approval are leased again
+    for plan_file in OUTS.glob(f"*/{RENDER_PLAN_FILE}"):
+        expire_render_plan(plan_file.parent)
+        plan = load_render_plan(plan_file.parent)
+        if not plan:
+            continue
+        CACHE_MANAGER.acquire(
+            render_lease_owner(plan_file.parent.name),
+            plan_file.parent,
+            *(Path(job["video_path"]) for job in plan.values()),
+        )
+    if CACHE_MANAGER_CFG.get("enabled", True):
+        interval = float(CACHE_MANAGER_CFG.get("sweep_interval_minutes", 15)) * 60
+        app.state.cache_sweeper = asyncio.create_task(CACHE_MANAGER.run_sweeper(interval))
+    if PREVIEW_PENDING_TTL > 0:
+        app.state.render_plan_expiry = asyncio.create_task(expire_render_plans_periodically(3600))
 
 
 @app.on_event("shutdown")
@@ -1533,6 +2359,15 @@ async def shutdown_event() -> None:
     client = getattr(app.state, "http_client", None)
     if client:
         await client.aclose()
+    sweeper = getattr(app.state, "cache_sweeper", None)
+    if sweeper:
+        sweeper.cancel()
+    expiry = getattr(app.state, "render_plan_expiry", None)
+    if expiry:
+        expiry.cancel()
+    await run_in_thread(CACHE_MANAGER.flush_index)
+    shutdown_worker_pool()
+    batch_stretch.shutdown()
 
 
 @app.get(OPTIONS_ROUTE)
@@ -1564,6 +2399,13 @@ async def download_video(video_id: str, filename: str):
     if '..' in video_id or '..' in filename:
         raise HTTPException(400, "Path traversal detected")
     
+    # A final video still waiting for review approval is rendered on its first download
+    local_workspace = OUTS / video_id
+    if local_workspace.is_dir() and not (local_workspace / filename).exists():
+        pending = {Path(path).name: lang for lang, path in pending_render_outputs(local_workspace).items()}
+        if filename in pending:
+            await render_pending_or_gone(video_id, [pending[filename]])
+
     # Try persistent storage first (Modal volume)
     persistent_root = Path("/persistent-outputs")
     if persistent_root.exists():
@@ -1674,10 +2516,57 @@ async def list_outputs(video_id: str):
             files.append({
                 "filename": file_path.name,
                 "size": file_path.stat().st_size,
-                "download_url": f"/api/download/{video_id}/{file_path.name}"
+                "download_url": f"/api/download/{video_id}/{file_path.name}",
+                # Progressive renders are listed while they are still being written
+                "complete": not streaming_output.is_writing(file_path),
             })
-    
-    return {"video_id": video_id, "files": files}
+
+    streams = []
+    for playlist in video_dir.glob(f"*{streaming_output.STREAM_DIR_SUFFIX}/{streaming_output.PLAYLIST_FILE}"):
+        streams.append({
+            "name": playlist.parent.name,
+            "playlist_url": f"/api/stream/{video_id}/{playlist.parent.name}/{playlist.name}",
+            "segments": len(list(playlist.parent.glob("*.m4s"))),
+            "complete": streaming_output.playlist_complete(playlist),
+        })
+
+    return {"video_id": video_id, "files": files, "streams": streams}
+
+
+@app.get(f"{API_PREFIX}/stream/{{video_id}}/{{stream_name}}/{{filename}}")
+async def stream_output(video_id: str, stream_name: str, filename: str):
+    """Serve an HLS playlist or segment, including those of a render still in progress"""
+    import re
+
+    for part in (video_id, stream_name, filename):
+        if not re.match(r'^[a-zA-Z0-9_\.-]+$', part) or '..' in part:
+            raise HTTPException(400, "Invalid stream path")
+    if not stream_name.endswith(streaming_output.STREAM_DIR_SUFFIX):
+        raise HTTPException(400, "Invalid stream path")
+
+    for root in (BASE / "outs", Path("/persistent-outputs")):
+        path = root / video_id / stream_name / filename
+        if path.is_file():
+            break
+    else:
+        raise HTTPException(404, f"Stream file not found: {filename}")
+
+    if filename.endswith(".m3u8"):
+        # The event playlist grows while the render runs
+        return FileResponse(
+            path=str(path),
+            media_type="application/vnd.apple.mpegurl",
+            headers={"Cache-Control": "no-cache"},
+        )
+    return FileResponse(path=str(path), media_type="video/iso.segment" if filename.endswith(".m4s") else "video/mp4")
+
+
+@app.get(f"{API_PREFIX}/cache/stats")
+async def cache_stats() -> JSONResponse:
+    """Bytes used, hit rate and evictions per cache area."""
+    stats = CACHE_MANAGER.stats()
+    stats["single_flight"] = {"in_flight": SINGLE_FLIGHT.in_flight()}
+    return JSONResponse(stats)
 
 
 @app.get(FILE_ROUTE)
@@ -1878,6 +2767,35 @@ async def pipeline_regenerate_tts_segment(request: TTSRegenerateRequest) -> JSON
     return JSONResponse({"status": "ok", "segment": segment_payload})
 
 
+@app.post(RENDER_ROUTE)
+async def pipeline_render(workspace_id: str = Form(...), language: Optional[str] = Form(None)) -> JSONResponse:
+    """Approve a previewed run: render the full-quality final videos (all languages, or one)."""
+    import re
+
+    workspace_id = (workspace_id or "").strip()
+    if not re.match(r"^[a-zA-Z0-9_-]+$", workspace_id):
+        raise HTTPException(400, "Invalid workspace_id format")
+    workspace_path = OUTS / workspace_id
+    if not workspace_path.is_dir():
+        raise HTTPException(404, "Workspace not found")
+    pending = pending_render_outputs(workspace_path)
+    if not pending or (language and language not in pending):
+        return JSONResponse({"status": "nothing_pending"})
+    rendered = await render_pending_or_gone(workspace_id, [language] if language else None)
+    return JSONResponse(
+        {
+            "status": "rendered",
+            "languages": {
+                lang: {
+                    "final_video": build_file_payload(path),
+                    "download_url": f"/api/download/{workspace_id}/{Path(path).name}",
+                }
+                for lang, path in rendered.items()
+            },
+        }
+    )
+
+
 @app.post(RUN_ROUTE)
 async def pipeline_run(
         file: UploadFile | None = File(None),
@@ -1987,6 +2905,13 @@ async def pipeline_run(
                         intermediate_payload[key] = build_file_payload(value)
                     languages_payload[lang] = {
                         "final_video": build_file_payload(data.get("final_video_path")),
+                        "preview": build_file_payload(data.get("preview_path")),
+                        "render_pending": bool(data.get("render_pending")),
+                        "download_url": (
+                            f"/api/download/{result.get('workspace_id')}/{Path(data['final_video_path']).name}"
+                            if data.get("final_video_path")
+                            else ""
+                        ),
                         "final_audio": build_file_payload(data.get("final_audio_path")),
                         "speech_track": build_file_payload(data.get("speech_track")),
                         "subtitles": {
@@ -2026,6 +2951,8 @@ async def pipeline_run(
                         "source_media": result.get("source_media"),
                         "source_video": build_file_payload(result.get("source_video")),
                         "final_video": build_file_payload(result.get("final_video_path")),
+                        "multi_track_video": build_file_payload(result.get("multi_track_video_path")),
+                        "render_pending": bool(result.get("render_pending")),
                         "final_audio": build_file_payload(result.get("final_audio_path")),
                         "speech_track": build_file_payload(result.get("speech_track")),
                         "subtitles": subtitles_payload,
@@ -2286,8 +3213,9 @@ async def dub(
                 except json.JSONDecodeError as e:
                     logger.warning(f"Failed to parse god_tier_config: {e}")
             
+            god_tier_dir = workspace.make_temp_dir("god_tier")
             pm = PipelineManager(
-                work_dir=str(workspace.tmp_dir),
+                work_dir=str(god_tier_dir),
                 config=god_tier_config  # Pass configuration
             )
             video_path_str = str(resolved_video_path)
@@ -2296,9 +3224,22 @@ async def dub(
             target_lang_code = target_languages[0] if target_languages else "en"
             
             if dubbing_strategy == "god_tier_draft":
-                final_output = pm.run_draft(video_path_str)
+                # Reuse the cached 16 kHz analysis rendition instead of a separate ffmpeg pass
+                god_tier_analysis = god_tier_dir / "analysis_16k.wav"
+                await prepare_raw_audio(
+                    resolved_video_path,
+                    media_digest,
+                    god_tier_dir / "raw_audio.wav",
+                    god_tier_analysis,
+                    step_timer,
+                )
+                final_output = pm.run_draft(video_path_str, analysis_audio=str(god_tier_analysis))
             else:
                 final_output = pm.run_hollywood(video_path_str)
+
+            # The pipeline writes into the temp dir, which is removed when the run ends
+            if Path(final_output).parent == god_tier_dir:
+                final_output = shutil.copy2(final_output, workspace.file_path(Path(final_output).name))
                 
             # Pipeline returns either video (if merged) or audio (if merge failed)
             # Check if output is video or audio
@@ -2323,7 +3264,7 @@ async def dub(
                 "models": {"pipeline": dubbing_strategy},
                 "timings": {},
                 "subtitles": {},
-                "workspace_id": workspace.id
+                "workspace_id": workspace.workspace_id
             }
 
         except Exception as e:
@@ -2338,23 +3279,15 @@ async def dub(
         preprocessing_dir = workspace.make_temp_dir("preprocessing")
 
     raw_audio_path = preprocessing_dir / "raw_audio.wav"
+    # 16 kHz mono rendition for ASR, VAD and analysis, produced in the same decode as the master
+    analysis_audio_path = preprocessing_dir / "analysis_16k.wav"
 
     cancelled = False
 
     try:
-        raw_audio_cached = False
-        raw_audio_cache_token: Optional[str] = None
-        if media_digest:
-            raw_audio_cache_token = raw_audio_cache_key(media_digest)
-            raw_audio_cached = await load_cached_raw_audio(raw_audio_cache_token, raw_audio_path)
-            if raw_audio_cached:
-                logger.info("Loaded raw audio from cache for media digest %s", media_digest)
-
-        if not raw_audio_cached:
-            with step_timer.time("extract_audio"):
-                await extract_audio_to_workspace(str(resolved_video_path), raw_audio_path)
-            if raw_audio_cache_token:
-                await store_raw_audio_cache(raw_audio_cache_token, raw_audio_path)
+        # Keep the sweeper away from this job's workspace and source media while it runs
+        CACHE_MANAGER.acquire(workspace.workspace_id, workspace.workspace, resolved_video_path, Path(video_url))
+        await prepare_raw_audio(resolved_video_path, media_digest, raw_audio_path, analysis_audio_path, step_timer)
 
         raw_audio_duration = get_audio_duration(raw_audio_path)
 
@@ -2377,9 +3310,14 @@ async def dub(
                     sep_model,
                     audio_sep,
                     dubbing_strategy,
+                    analysis_audio_path=analysis_audio_path,
                 )
 
-        transcript_audio = vocals_path if vocals_path and vocal_for_transcript else raw_audio_path
+        transcript_audio = vocals_path if vocals_path and vocal_for_transcript else analysis_audio_path
+        transcript_source_key: Optional[str] = None
+        if media_digest:
+            stem_label = f"vocals:{sep_model}" if transcript_audio == vocals_path else "raw"
+            transcript_source_key = f"{media_digest}:{stem_label}"
 
         with step_timer.time("asr"):
             raw_asr_result, aligned_asr_result = await run_asr_step(
@@ -2390,6 +3328,7 @@ async def dub(
                 min_speakers,
                 max_speakers,
                 perform_alignment=not involve_mode,
+                source_key=transcript_source_key,
             )
 
         original_raw_dump = raw_asr_result.model_dump()
@@ -2502,8 +3441,8 @@ async def dub(
         try:
             if raw_asr_result.segments:
                 # CRITICAL: vocals_path can be None if audio_sep=False or target_work="sub"
-                # Use raw_audio_path as fallback to prevent crash
-                vad_audio_path = vocals_path if vocals_path else raw_audio_path
+                # Use the 16 kHz analysis track as fallback to prevent crash
+                vad_audio_path = vocals_path if vocals_path else analysis_audio_path
                 
                 auto_offset, manual_offset, total_offset = calculate_vad_offset(
                     audio_path=vad_audio_path,
@@ -2619,6 +3558,7 @@ async def dub(
         srt_path_1 = srt_path_0
         vtt_path_1 = vtt_path_0
         final_video_path = str(resolved_video_path) if source_has_video else ""
+        multi_track_video_path = ""
         default_audio_path = ""
         default_speech_track = ""
 
@@ -2755,7 +3695,21 @@ async def dub(
                 else:
                     tts_output_dir = workspace.make_temp_dir(f"tts_{lang}")
                 with step_timer.time(f"tts{lang_suffix}"):
-                    tts_result = await synthesize_tts(client, tts_model_key, tr_result_local, lang, tts_output_dir)
+                    tts_result, tts_inputs, tts_keys = await synthesize_tts(
+                        client, tts_model_key, tr_result_local, lang, tts_output_dir
+                    )
+
+                if TTS_VALIDATION_CFG.get("enabled", True):
+                    with step_timer.time(f"tts_validation{lang_suffix}"):
+                        tts_result, validation_report = await resynthesize_invalid_segments(
+                            client, tts_model_key, tts_result, tts_inputs, tts_keys, lang, tts_output_dir
+                        )
+                    workspace.maybe_dump_json(f"tts/{lang}/validation_report.json", validation_report.to_dict())
+                    if not validation_report.valid:
+                        emit_progress({
+                            "type": "warning",
+                            "message": f"{len(validation_report.failed_indices)} TTS segments are still invalid after resynthesis",
+                        })
                 
                 # PHASE 2: Monitor segment durations for timing issues
                 timing_issues = log_segment_durations(
@@ -2807,6 +3761,11 @@ async def dub(
 
                 
                 speech_track = audio_processing_dir / f"dubbed_speech_track_{lang}.wav"
+                # The speech track is rendered at the output rate, so the mix never resamples the long track
+                working_rate = negotiate_run_sample_rate(tts_result, background_path or raw_audio_path)
+                preview_stretch_tier = (
+                    PREVIEW_STRETCH_TIER if involve_mode and PREVIEW_ENABLED and source_has_video and PER_LANGUAGE_FILES else None
+                )
                 with step_timer.time(f"audio_concatenate{lang_suffix}"):
                     concatenated_path, translation_segments = await concatenate_segments(
                     tts_segments=tts_result.model_dump()["segments"],
@@ -2814,6 +3773,9 @@ async def dub(
                     target_duration=raw_audio_duration,
                     translation_segments=tr_result_local.model_dump()["segments"],
                     strict_segment_timing=strict_segment_timing,  # NEW: Pass the variable
+                    sample_rate=working_rate,
+                    # Involve-mode runs stop at a preview; the approved render rebuilds this track at the default tier
+                    stretch_tier=preview_stretch_tier,
                 )
                 final_audio_path = Path(concatenated_path)
 
@@ -2857,30 +3819,80 @@ async def dub(
                     tr_aligned_tts_path = ""
 
                 final_video_out: str = ""
-                if source_has_video:
+                preview_out: str = ""
+                if source_has_video and PER_LANGUAGE_FILES:
                     dubbed_path = workspace.file_path(f"dubbed_video_{lang}.mp4")
                     final_output = (
                         workspace.file_path(f"dubbed_video_{lang}_with_{subtitle_style_prefix}_subs.mp4")
                         if subtitle_style is not None
                         else None
                     )
-                    with step_timer.time(f"final_pass[{lang}]"):
-                        await finalize_media(
-                            str(resolved_video_path),
+                    if involve_mode and PREVIEW_ENABLED:
+                        preview_out = str(workspace.file_path(f"preview/preview_{lang}{PREVIEW_SETTINGS.extension}"))
+                        with step_timer.time(f"preview[{lang}]"):
+                            await run_in_thread(
+                                render_preview,
+                                str(resolved_video_path),
+                                str(final_audio_path),
+                                preview_out,
+                                PREVIEW_SETTINGS,
+                                aligned_vtt or None,
+                                style,
+                                subtitle_mobile_mode,
+                                dubbing_strategy,
+                                FINALIZE_MEDIA_CFG.get("ducking_db", 0.02),
+                            )
+                        await defer_final_render(
+                            workspace,
+                            lang,
+                            resolved_video_path,
                             final_audio_path,
                             dubbed_path,
                             final_output,
                             Path(aligned_vtt) if aligned_vtt else None,
-                            style,
-                            subtitle_mobile_mode,
+                            subtitle_style,
                             dubbing_strategy,
+                            speech={
+                                "segments": tts_result.model_dump()["segments"],
+                                "translation_segments": tr_result_local.model_dump()["segments"],
+                                "target_duration": raw_audio_duration,
+                                "sample_rate": working_rate,
+                                "strict_timing": strict_segment_timing,
+                                "background_path": (
+                                    str(background_path) if dubbing_strategy == "full_replacement" and background_path else ""
+                                ),
+                                "sophisticated": sophisticated_dub_timing,
+                            } if preview_stretch_tier else None,
                         )
+                    else:
+                        announcer = None
+                        if streaming_output.SETTINGS.enabled and streaming_output.SETTINGS.format == "hls":
+                            announcer = asyncio.create_task(announce_stream_when_ready(
+                                workspace.workspace_id, lang, streaming_output.stream_dir(final_output or dubbed_path)
+                            ))
+                        try:
+                            with step_timer.time(f"final_pass[{lang}]"):
+                                await finalize_media(
+                                    str(resolved_video_path),
+                                    final_audio_path,
+                                    dubbed_path,
+                                    final_output,
+                                    Path(aligned_vtt) if aligned_vtt else None,
+                                    style,
+                                    subtitle_mobile_mode,
+                                    dubbing_strategy,
+                                )
+                        finally:
+                            if announcer:
+                                announcer.cancel()
+                    # Not written yet while the render waits for approval; downloading it triggers the render
                     final_video_out = str(final_output) if final_output else str(dubbed_path)
-                else:
+                elif not source_has_video:
                     final_video_out = str(final_audio_path)
                     
                 payload = {
                     "final_video_path": final_video_out,
+                    "preview_path": preview_out,
                     "final_audio_path": str(final_audio_path) if final_audio_path else "",
                     "speech_track": str(speech_track),
                     "subtitles": {"aligned": {"srt": aligned_srt, "vtt": aligned_vtt}},
@@ -2901,6 +3913,37 @@ async def dub(
                 if aligned:
                     subtitles_per_language[lang] = {"aligned": aligned}
 
+            if source_has_video and MULTI_TRACK_PACKAGING and language_payloads:
+                # The default language comes first and is the container's default track
+                ordered = sorted(language_payloads, key=lambda lang: lang != default_language)
+                tracks = [
+                    LanguageTrack(
+                        lang=lang,
+                        audio_path=language_payloads[lang]["final_audio_path"],
+                        subtitle_path=(
+                            language_payloads[lang]["subtitles"]["aligned"].get("srt")
+                            or language_payloads[lang]["subtitles"]["aligned"].get("vtt")
+                            or None
+                        ),
+                    )
+                    for lang in ordered
+                ]
+                container = str(FINALIZE_MEDIA_CFG.get("container", "mp4")).lstrip(".")
+                multi_track_video_path = str(workspace.file_path(f"dubbed_video_multi.{container}"))
+                with step_timer.time("final_pass[multi_track]"):
+                    await run_in_thread(
+                        package_languages,
+                        str(resolved_video_path),
+                        tracks,
+                        multi_track_video_path,
+                        dubbing_strategy,
+                        FINALIZE_MEDIA_CFG.get("ducking_db", 0.02),
+                        FINALIZE_MEDIA_CFG.get("subtitle_codec") or None,
+                    )
+                if not PER_LANGUAGE_FILES:
+                    for payload in language_payloads.values():
+                        payload["final_video_path"] = multi_track_video_path
+
             primary_payload = None
             if default_language and default_language in language_payloads:
                 primary_payload = language_payloads[default_language]
@@ -2924,6 +3967,7 @@ async def dub(
         default_audio_path = keep_if_persistent(default_audio_path)
         default_speech_track = keep_if_persistent(default_speech_track)
 
+        pending_renders = pending_render_outputs(workspace.workspace)
         language_outputs_serialized: Dict[str, Dict[str, Any]] = {}
         for lang, payload in language_payloads.items():
             aligned = payload.get("subtitles", {}).get("aligned", {})
@@ -2933,6 +3977,8 @@ async def dub(
             }
             language_outputs_serialized[lang] = {
                 "final_video_path": payload.get("final_video_path", ""),
+                "preview_path": payload.get("preview_path", ""),
+                "render_pending": lang in pending_renders,
                 "final_audio_path": keep_if_persistent(payload.get("final_audio_path")),
                 "speech_track": keep_if_persistent(payload.get("speech_track")),
                 "subtitles": {
@@ -3002,10 +4048,11 @@ async def dub(
 
         final_result: Dict[str, Any] = {
             "workspace_id": workspace.workspace_id,
-            # FIX: Use standard bulk filename pattern for download URL
-            # Files are always saved as dubbed_video_{lang}.mp4 in bulk mode
-            "final_video_path": f"/api/download/{workspace.workspace_id}/dubbed_video_{default_language}.mp4" if final_video_path and default_language else "",
+            # Download URL of the file the final pass actually wrote (the subtitled render when a style is set)
+            "final_video_path": f"/api/download/{workspace.workspace_id}/{Path(final_video_path).name}" if final_video_path and default_language else "",
             "final_audio_path": default_audio_path,
+            "multi_track_video_path": multi_track_video_path,
+            "render_pending": bool(pending_renders),
             "speech_track": default_speech_track,
             "source_media": original_source,
             "source_video": keep_if_persistent(source_media_local_path),
@@ -3019,6 +4066,13 @@ async def dub(
             "timings": step_timer.timings,
         }
 
+        if workspace.persist_intermediate and STORAGE_CODEC.format != "wav":
+            compacted = await run_in_thread(
+                compact_persisted_audio, workspace.workspace, ("prompts", "tts", "vad_trimmed")
+            )
+            if compacted:
+                logger.info("🗜️  Stored %d persisted intermediate(s) as %s", compacted, STORAGE_CODEC.format)
+
         workspace.maybe_dump_json("final_result.json", final_result)
 
         # FIX: Copy to persistent storage if on Modal
@@ -3038,6 +4092,7 @@ async def dub(
         logger.exception("Pipeline failed: %s", exc)
         raise HTTPException(500, f"Pipeline failed: {exc}") from exc
     finally:
+        CACHE_MANAGER.release(workspace.workspace_id)
         if not workspace.persist_intermediate:
             for path in workspace.temp_dirs:
                 shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,293 @@
+"""
+Size-budgeted cache eviction for the orchestrator's on-disk artifact stores.
+
+Each store (separated stems, raw audio, uploads, job outputs, ...) is a
+``CacheArea``: a root directory whose entries live a fixed number of levels
+below it (``SEPARATION_CACHE/<key>`` has depth 1, ``RAW_AUDIO_CACHE/<xx>/<key>``
+has depth 2). The manager records the last access of every entry in a small
+JSON index, and a background sweeper evicts entries that outlived the area TTL
+and then the least recently used ones until the area fits its byte budget.
+
+Entries leased by a running job, or touched within ``min_age_seconds``, are
+never evicted; the grace period also protects work of other worker processes
+whose leases are not visible here.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheArea:
+    name: str
+    root: Path
+    depth: int = 1
+    max_bytes: Optional[int] = None
+    ttl_seconds: Optional[float] = None
+
+
+@dataclass
+class _AreaMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+    bytes_used: int = 0
+    entries: int = 0
+
+
+def _entry_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class CacheManager:
+    """Tracks access, leases and budgets for a set of cache areas."""
+
+    def __init__(
+        self,
+        areas: Iterable[CacheArea],
+        index_path: Path,
+        *,
+        min_age_seconds: float = 1800.0,
+    ) -> None:
+        self.areas: Dict[str, CacheArea] = {area.name: area for area in areas}
+        self.index_path = Path(index_path)
+        self.min_age_seconds = min_age_seconds
+        self._lock = threading.Lock()
+        self._access: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._leases: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self._metrics: Dict[str, _AreaMetrics] = {name: _AreaMetrics() for name in self.areas}
+        self._last_sweep: Optional[float] = None
+        self._load_index()
+
+    # ----------------------------------------------------------------- index
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        try:
+            raw = json.loads(self.index_path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("Cache index unreadable (%s); access times start fresh", exc)
+            return
+        for area_name, entries in (raw.get("areas") or {}).items():
+            if area_name in self.areas and isinstance(entries, dict):
+                self._access[area_name].update({k: float(v) for k, v in entries.items()})
+
+    def flush_index(self) -> None:
+        """Persist access times, merging with what other workers have written."""
+        with self._lock:
+            merged: Dict[str, Dict[str, float]] = {name: dict(entries) for name, entries in self._access.items()}
+        if self.index_path.exists():
+            try:
+                on_disk = json.loads(self.index_path.read_text()).get("areas") or {}
+            except (OSError, ValueError):
+                on_disk = {}
+            for area_name, entries in on_disk.items():
+                if area_name not in self.areas or not isinstance(entries, dict):
+                    continue
+                bucket = merged.setdefault(area_name, {})
+                for key, value in entries.items():
+                    bucket[key] = max(float(value), bucket.get(key, 0.0))
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps({"areas": merged}))
+        os.replace(tmp_path, self.index_path)
+
+    # ------------------------------------------------------------ addressing
+
+    def _locate(self, path: Path) -> Optional[Tuple[str, str]]:
+        resolved = Path(path).resolve()
+        for area in self.areas.values():
+            try:
+                relative = resolved.relative_to(area.root.resolve())
+            except ValueError:
+                continue
+            if len(relative.parts) < area.depth:
+                return None
+            return area.name, Path(*relative.parts[: area.depth]).as_posix()
+        return None
+
+    def _entries(self, area: CacheArea) -> List[Path]:
+        if not area.root.exists():
+            return []
+        level = [area.root]
+        for _ in range(area.depth):
+            next_level: List[Path] = []
+            for parent in level:
+                try:
+                    next_level.extend(child for child in parent.iterdir() if not child.name.startswith("."))
+                except (NotADirectoryError, OSError):
+                    continue
+            level = next_level
+        return level
+
+    # ---------------------------------------------------------------- public
+
+    def touch(self, path: Path) -> None:
+        """Record an access to the entry containing ``path``."""
+        located = self._locate(path)
+        if located is None:
+            return
+        area_name, key = located
+        with self._lock:
+            self._access[area_name][key] = time.time()
+
+    def record_lookup(self, area_name: str, hit: bool, path: Optional[Path] = None) -> None:
+        with self._lock:
+            metrics = self._metrics.get(area_name)
+            if metrics is None:
+                return
+            if hit:
+                metrics.hits += 1
+            else:
+                metrics.misses += 1
+        if hit and path is not None:
+            self.touch(path)
+
+    def acquire(self, owner: str, *paths: Optional[Path]) -> None:
+        """Lease the entries containing ``paths`` to ``owner`` until ``release``."""
+        for path in paths:
+            if path is None:
+                continue
+            located = self._locate(path)
+            if located is None:
+                continue
+            with self._lock:
+                self._leases[owner].add(located)
+                self._access[located[0]][located[1]] = time.time()
+
+    def release(self, owner: str) -> None:
+        with self._lock:
+            released = self._leases.pop(owner, set())
+            now = time.time()
+            for area_name, key in released:
+                self._access[area_name][key] = now
+
+    def _leased(self) -> Set[Tuple[str, str]]:
+        with self._lock:
+            leased: Set[Tuple[str, str]] = set()
+            for entries in self._leases.values():
+                leased.update(entries)
+            return leased
+
+    def _evict(self, area: CacheArea, entry: Path, key: str, size: int) -> bool:
+        try:
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("Could not evict %s/%s: %s", area.name, key, exc)
+            return False
+        with self._lock:
+            self._access[area.name].pop(key, None)
+            metrics = self._metrics[area.name]
+            metrics.evictions += 1
+            metrics.evicted_bytes += size
+        return True
+
+    def sweep(self) -> Dict[str, int]:
+        """Evict expired and over-budget entries. Returns evictions per area."""
+        now = time.time()
+        leased = self._leased()
+        evicted: Dict[str, int] = {}
+        for area in self.areas.values():
+            candidates = []
+            total = 0
+            for entry in self._entries(area):
+                key = Path(*entry.relative_to(area.root).parts).as_posix()
+                try:
+                    size = _entry_size(entry)
+                    modified = entry.stat().st_mtime
+                except OSError:
+                    continue
+                with self._lock:
+                    last_access = max(self._access[area.name].get(key, 0.0), modified)
+                total += size
+                candidates.append((last_access, key, entry, size))
+
+            removed = 0
+            candidates.sort(key=lambda item: item[0])
+            for last_access, key, entry, size in candidates:
+                if (area.name, key) in leased or now - last_access < self.min_age_seconds:
+                    continue
+                expired = area.ttl_seconds is not None and now - last_access > area.ttl_seconds
+                over_budget = area.max_bytes is not None and total > area.max_bytes
+                if not expired and not over_budget:
+                    continue
+                if self._evict(area, entry, key, size):
+                    total -= size
+                    removed += 1
+
+            with self._lock:
+                metrics = self._metrics[area.name]
+                metrics.bytes_used = total
+                metrics.entries = len(candidates) - removed
+            if removed:
+                logger.info("🧹 Cache sweep evicted %d %s entr%s (%.1f MB in use)",
+                            removed, area.name, "y" if removed == 1 else "ies", total / 1024**2)
+            evicted[area.name] = removed
+
+        self._last_sweep = now
+        self.flush_index()
+        return evicted
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            areas = {}
+            for name, metrics in self._metrics.items():
+                area = self.areas[name]
+                lookups = metrics.hits + metrics.misses
+                areas[name] = {
+                    "bytes_used": metrics.bytes_used,
+                    "entries": metrics.entries,
+                    "max_bytes": area.max_bytes,
+                    "ttl_seconds": area.ttl_seconds,
+                    "hits": metrics.hits,
+                    "misses": metrics.misses,
+                    "hit_rate": (metrics.hits / lookups) if lookups else None,
+                    "evictions": metrics.evictions,
+                    "evicted_bytes": metrics.evicted_bytes,
+                }
+            return {
+                "areas": areas,
+                "active_leases": sum(len(entries) for entries in self._leases.values()),
+                "last_sweep": self._last_sweep,
+            }
+
+    async def run_sweeper(self, interval_seconds: float) -> None:
+        """Sweep forever in a worker thread every ``interval_seconds``."""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logger.exception("Cache sweep failed")
+            await asyncio.sleep(interval_seconds)
@@ -0,0 +1,259 @@
+"""
+Remote media download cache.
+
+Maps source URLs to content-addressed media files so that repeated runs on the
+same link (bulk batches, retries, re-runs for another language) skip the
+yt-dlp download entirely. Entries expire after a TTL and the cache is kept
+under a byte budget by evicting the least recently used downloads.
+
+Concurrent requests for the same URL are coalesced: the first caller performs
+the download and every other caller awaits its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import urllib.parse
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+MEDIA_SUBDIR = "media"
+STAGING_SUBDIR = "staging"
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def normalize_source_url(url: str) -> str:
+    """Canonicalize a URL so trivially different spellings share a cache entry."""
+    parsed = urllib.parse.urlsplit(url.strip())
+    return urllib.parse.urlunsplit(
+        (parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, parsed.query, "")
+    )
+
+
+def url_cache_key(url: str) -> str:
+    return hashlib.sha1(normalize_source_url(url).encode("utf-8")).hexdigest()
+
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha1()
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@dataclass
+class DownloadCacheEntry:
+    url: str
+    digest: str
+    filename: str  # relative to the cache root
+    size: int
+    fetched_at: float
+    last_access: float
+
+
+class RemoteMediaCache:
+    """URL -> media digest cache with TTL, byte budget and in-flight coalescing."""
+
+    def __init__(self, root: Path, *, ttl_seconds: float, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._index_path = self.root / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, DownloadCacheEntry]] = None
+        self._inflight: Dict[str, asyncio.Future[Path]] = {}
+
+    # ------------------------------------------------------------------ index
+
+    def _load_index(self) -> Dict[str, DownloadCacheEntry]:
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, DownloadCacheEntry] = {}
+        if self._index_path.exists():
+            try:
+                raw = json.loads(self._index_path.read_text())
+                for key, value in raw.items():
+                    entries[key] = DownloadCacheEntry(**value)
+            except (OSError, ValueError, TypeError) as exc:
+                logger.warning("Download cache index unreadable (%s); starting empty", exc)
+                entries = {}
+        self._entries = entries
+        return entries
+
+    def _save_index(self) -> None:
+        entries = self._load_index()
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps({k: asdict(v) for k, v in entries.items()}, indent=2))
+        os.replace(tmp_path, self._index_path)
+
+    def _drop_entry(self, key: str) -> None:
+        entries = self._load_index()
+        entry = entries.pop(key, None)
+        if entry is None:
+            return
+        if any(other.filename == entry.filename for other in entries.values()):
+            return
+        media_path = self.root / entry.filename
+        media_path.unlink(missing_ok=True)
+        try:
+            media_path.parent.rmdir()
+        except OSError:
+            pass
+
+    # ----------------------------------------------------------------- public
+
+    def media_path(self, entry: DownloadCacheEntry) -> Path:
+        return self.root / entry.filename
+
+    def digest_for_path(self, path: Path) -> Optional[str]:
+        """Return the media digest when ``path`` lives inside this cache."""
+        try:
+            relative = Path(path).resolve().relative_to((self.root / MEDIA_SUBDIR).resolve())
+        except ValueError:
+            return None
+        parts = relative.parts
+        if len(parts) < 3:
+            return None
+        digest, filename = parts[1], parts[2]
+        if digest and filename.startswith(digest):
+            return digest
+        return None
+
+    def lookup(self, url: str) -> Optional[Path]:
+        key = url_cache_key(url)
+        now = time.time()
+        with self._lock:
+            entries = self._load_index()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            media_path = self.media_path(entry)
+            if now - entry.fetched_at > self.ttl_seconds or not media_path.exists():
+                self._drop_entry(key)
+                self._save_index()
+                return None
+            entry.last_access = now
+            self._save_index()
+            return media_path
+
+    def store(self, url: str, downloaded: Path) -> Path:
+        """Move a freshly downloaded file into the cache and index it by URL."""
+        digest = _hash_file(downloaded)
+        suffix = downloaded.suffix.lower() or ".bin"
+        relative = Path(MEDIA_SUBDIR) / digest[:2] / digest / f"{digest}{suffix}"
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            downloaded.unlink(missing_ok=True)
+        else:
+            shutil.move(str(downloaded), str(target))
+
+        now = time.time()
+        with self._lock:
+            entries = self._load_index()
+            entries[url_cache_key(url)] = DownloadCacheEntry(
+                url=normalize_source_url(url),
+                digest=digest,
+                filename=relative.as_posix(),
+                size=target.stat().st_size,
+                fetched_at=now,
+                last_access=now,
+            )
+            self._prune_locked(now)
+            self._save_index()
+        return target
+
+    def prune(self) -> int:
+        with self._lock:
+            removed = self._prune_locked(time.time())
+            if removed:
+                self._save_index()
+            return removed
+
+    def _prune_locked(self, now: float) -> int:
+        entries = self._load_index()
+        removed = 0
+        for key in [k for k, e in entries.items() if now - e.fetched_at > self.ttl_seconds]:
+            self._drop_entry(key)
+            removed += 1
+
+        sizes: Dict[str, int] = {e.filename: e.size for e in entries.values()}
+        total = sum(sizes.values())
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].last_access):
+            if total <= self.max_bytes:
+                break
+            still_shared = any(k != key and e.filename == entry.filename for k, e in entries.items())
+            self._drop_entry(key)
+            removed += 1
+            if not still_shared:
+                total -= sizes.get(entry.filename, 0)
+        if removed:
+            logger.info("🧹 Download cache evicted %d entr%s", removed, "y" if removed == 1 else "ies")
+        return removed
+
+    async def fetch(self, url: str, download: Callable[[Path], Awaitable[Path]]) -> Path:
+        """Return the cached media for ``url``, downloading it at most once.
+
+        Args:
+            url: Remote media URL.
+            download: Coroutine that downloads the media into the given staging
+                directory and returns the downloaded file path.
+
+        Returns:
+            Path to the media file inside the cache.
+        """
+        key = url_cache_key(url)
+        while True:
+            cached = await asyncio.to_thread(self.lookup, url)
+            if cached is not None:
+                return cached
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leading download was cancelled by its own caller; retry unless we were too.
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Path] = loop.create_future()
+        # Mark failures as retrieved even when nobody else was waiting.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        staging_dir = self.root / STAGING_SUBDIR / uuid.uuid4().hex
+        try:
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            downloaded = await download(staging_dir)
+            cached_path = await asyncio.to_thread(self.store, url, downloaded)
+            future.set_result(cached_path)
+            return cached_path
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            shutil.rmtree(staging_dir, ignore_errors=True)
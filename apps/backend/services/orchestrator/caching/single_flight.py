@@ -0,0 +1,147 @@
+"""
+Single-flight registry for expensive pipeline artifacts.
+
+Pipeline stages (raw audio extraction, stem separation, ASR, TTS segments) are
+keyed by an artifact key. A caller that finds the artifact missing from its
+cache enters ``hold(key)``; any concurrent caller asking for the same key waits
+until the first one leaves, then re-checks the cache instead of recomputing::
+
+    if not await load_from_cache(key):
+        async with SINGLE_FLIGHT.hold(f"stems:{key}"):
+            if not await load_from_cache(key):
+                await compute_and_store(key)
+
+Waiting is coordinated in-process with asyncio locks and across orchestrator
+worker processes with ``flock`` on a per-key lock file. The holder removes the
+lock file before unlocking it, so lock files do not pile up; a waiter that then
+gets the lock on the removed file notices and starts over on a fresh one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to in-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _KeyState:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class SingleFlight:
+    """Keyed mutual exclusion shared by coroutines and worker processes."""
+
+    def __init__(
+        self,
+        lock_dir: Optional[Path],
+        *,
+        poll_interval: float = 0.1,
+        max_poll_interval: float = 2.0,
+    ) -> None:
+        self.lock_dir = Path(lock_dir) if lock_dir is not None else None
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._keys: Dict[str, _KeyState] = {}
+
+    def in_flight(self) -> List[str]:
+        """Keys currently held or awaited in this process."""
+        return [key for key, state in self._keys.items() if state.lock.locked()]
+
+    def _lock_file(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.lock_dir / f"{digest}.lock"
+
+    @staticmethod
+    def _is_current(fd: int, path: Path) -> bool:
+        """Whether ``fd`` is still the file at ``path`` (and not one its holder already removed)."""
+        try:
+            on_disk = os.stat(path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(fd)
+        return (on_disk.st_dev, on_disk.st_ino) == (opened.st_dev, opened.st_ino)
+
+    async def _acquire_file_lock(self, key: str) -> Optional[int]:
+        if fcntl is None or self.lock_dir is None:
+            return None
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        path = self._lock_file(key)
+        delay = self.poll_interval
+        waited = False
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    if not waited:
+                        logger.info("⏳ %s is being computed by another worker; waiting", key)
+                        waited = True
+                    # Poll instead of blocking in a thread so cancellation never strands a lock.
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_poll_interval)
+                    continue
+                if self._is_current(fd, path):
+                    if waited:
+                        logger.info("🔓 Other worker finished %s", key)
+                    return fd
+                # The previous holder removed this file on release; lock the current one instead
+                os.close(fd)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        except BaseException:
+            os.close(fd)
+            raise
+
+    def _release_file_lock(self, key: str, fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        try:
+            # Removed while still locked, so nobody can lock this file and believe it is current
+            self._lock_file(key).unlink(missing_ok=True)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Hold ``key`` exclusively; concurrent holders of the same key wait."""
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState()
+        state.users += 1
+        try:
+            if state.lock.locked():
+                logger.info("⏳ Waiting for in-flight %s", key)
+            async with state.lock:
+                fd = await self._acquire_file_lock(key)
+                try:
+                    yield
+                finally:
+                    self._release_file_lock(key, fd)
+        finally:
+            state.users -= 1
+            if state.users == 0:
+                self._keys.pop(key, None)
+
+    @asynccontextmanager
+    async def hold_many(self, keys: Iterable[str]) -> AsyncIterator[None]:
+        """Hold several keys at once, acquired in sorted order to avoid deadlocks."""
+        async with AsyncExitStack() as stack:
+            for key in sorted(set(keys)):
+                await stack.enter_async_context(self.hold(key))
+            yield
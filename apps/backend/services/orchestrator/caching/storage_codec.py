@@ -0,0 +1,111 @@
+"""
+Storage codec for cached and persisted audio artifacts.
+
+Cache entries (separated stems, raw audio, TTS segments) and persisted
+intermediates are stored losslessly compressed (FLAC by default) and decoded
+back to PCM WAV when a job loads them, so pipeline stages keep working on
+plain WAV files. Audio whose sample format FLAC cannot hold losslessly
+(32-bit float) is kept as WAV.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+FORMAT_EXTENSIONS = {"wav": ".wav", "flac": ".flac"}
+FLAC_SUBTYPES = {"PCM_S8", "PCM_U8", "PCM_16", "PCM_24"}
+BLOCK_FRAMES = 1 << 16
+
+
+def _transcode(source: Path, target: Path, fmt: str, subtype: str, compression_level: Optional[float]) -> None:
+    tmp_target = target.with_name(f".{target.name}.partial")
+    kwargs = {}
+    if fmt == "FLAC" and compression_level is not None:
+        kwargs["compression_level"] = compression_level
+    with sf.SoundFile(str(source)) as src:
+        with sf.SoundFile(
+            str(tmp_target), "w", samplerate=src.samplerate, channels=src.channels,
+            format=fmt, subtype=subtype, **kwargs,
+        ) as dst:
+            for block in src.blocks(blocksize=BLOCK_FRAMES, dtype="int32" if subtype != "FLOAT" else "float32"):
+                dst.write(block)
+    os.replace(tmp_target, target)
+
+
+@dataclass(frozen=True)
+class StorageCodec:
+    format: str = "flac"
+    compression_level: Optional[float] = None
+
+    @property
+    def extension(self) -> str:
+        return FORMAT_EXTENSIONS.get(self.format, ".wav")
+
+    def find(self, directory: Path, stem: str) -> Optional[Path]:
+        """Locate a stored artifact regardless of the codec it was written with."""
+        for extension in (self.extension, *FORMAT_EXTENSIONS.values()):
+            candidate = directory / f"{stem}{extension}"
+            if candidate.exists():
+                return candidate
+        return None
+
+    def encode(self, source: Path, directory: Path, stem: str) -> Path:
+        """Store ``source`` as ``directory/stem.<ext>`` using the configured codec."""
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{stem}{self.extension}"
+        subtype = sf.info(str(source)).subtype
+        if self.format == "flac" and subtype in FLAC_SUBTYPES:
+            _transcode(source, target, "FLAC", subtype, self.compression_level)
+        else:
+            target = directory / f"{stem}.wav"
+            if Path(source).resolve() != target.resolve():
+                shutil.copy(source, target)
+        for extension in FORMAT_EXTENSIONS.values():
+            stale = directory / f"{stem}{extension}"
+            if stale != target:
+                stale.unlink(missing_ok=True)
+        return target
+
+    @staticmethod
+    def decode(stored: Path, target: Path) -> None:
+        """Materialize a stored artifact as a PCM WAV file at ``target``."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if stored.suffix.lower() == ".wav":
+            shutil.copy(stored, target)
+            return
+        subtype = sf.info(str(stored)).subtype
+        _transcode(stored, target, "WAV", subtype if subtype in FLAC_SUBTYPES else "PCM_16", None)
+
+    def compact(self, path: Path) -> Path:
+        """Re-encode a WAV artifact in place; returns the (possibly renamed) path."""
+        if self.format == "wav" or path.suffix.lower() != ".wav":
+            return path
+        stored = self.encode(path, path.parent, path.stem)
+        if stored != path:
+            path.unlink(missing_ok=True)
+        return stored
+
+    def compact_tree(self, roots: Iterable[Path]) -> Dict[str, str]:
+        """Compact every WAV below ``roots``; returns a map of old -> new paths."""
+        renamed: Dict[str, str] = {}
+        for root in roots:
+            if not root.exists():
+                continue
+            for wav_path in sorted(root.rglob("*.wav")):
+                try:
+                    new_path = self.compact(wav_path)
+                except (RuntimeError, sf.LibsndfileError) as exc:
+                    logger.warning("Keeping %s uncompressed: %s", wav_path, exc)
+                    continue
+                if new_path != wav_path:
+                    renamed[str(wav_path)] = str(new_path)
+        return renamed
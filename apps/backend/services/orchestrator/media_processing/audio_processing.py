@@ -1,37 +1,46 @@
-import subprocess
+import bisect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Tuple
-import threading
-import librosa
+from typing import List, Dict, Optional, Sequence, Union, Tuple
 import soundfile as sf
 import numpy as np
-import json
 from scipy import signal
-import pyrubberband as prb
 import os
 import shutil
 import torch
 import torchaudio
 import tempfile
 
+from .batch_stretch import StretchJob, run_stretch_jobs
+from .media_info import MEDIA_INFO, get_audio_duration
+from .resampling import RESAMPLER
+from .time_stretch import policy_for, stretch_file
+from .timeline_renderer import Placement, concatenate_files, mix_onto_background, render_timeline
+from .vad_backend import get_vad_backend, read_audio
+
+logger = logging.getLogger(__name__)
+
 # Import strict timing functions for segment-by-segment synchronization
 try:
     from .strict_timing import (
         concatenate_audio_strict_timing,
         adjust_segment_to_exact_timing,
         calculate_segment_timing_stats,
-        get_audio_duration  # Use canonical implementation from strict_timing
     )
     STRICT_TIMING_AVAILABLE = True
 except ImportError as e:
     STRICT_TIMING_AVAILABLE = False
-    import logging
-    logger = logging.getLogger(__name__)
     logger.warning(f"Strict timing module not available: {e}")
     logger.warning("Falling back to legacy timing mode")
 
-_silero_vad_lock = threading.Lock()
-_silero_vad_bundle: Optional[Tuple[torch.nn.Module, Tuple]] = None
+# Ducking envelope resolution and block size for in-place mixing
+ENVELOPE_FRAME_SECONDS = 0.001
+MIX_BLOCK_FRAMES = 1 << 18
+# Batch VAD trimming: silence between concatenated segments and decode/write threads
+VAD_BATCH_SEPARATOR_SECONDS = 0.5
+VAD_BATCH_MAX_WORKERS = 8
 
 _AUDIO_EXTENSIONS = {
     ".wav",
@@ -58,40 +67,18 @@ _VIDEO_EXTENSIONS = {
 }
 
 
-def _load_silero_vad():
-    global _silero_vad_bundle
-    if _silero_vad_bundle is None:
-        with _silero_vad_lock:
-            if _silero_vad_bundle is None:
-                model, utils = torch.hub.load(
-                    repo_or_dir='snakers4/silero-vad',
-                    model='silero_vad',
-                    force_reload=False,
-                    onnx=False
-                )
-                _silero_vad_bundle = (model, utils)
-    return _silero_vad_bundle
-
-
-_duration_cache_lock = threading.Lock()
-_duration_cache: Dict[str, float] = {}
+def _speech_timestamps_seconds(audio_path: str, sampling_rate: int = 16000) -> List[Dict[str, float]]:
+    wav = read_audio(audio_path, sampling_rate=sampling_rate)
+    return [
+        {'start': ts['start'] / sampling_rate, 'end': ts['end'] / sampling_rate}
+        for ts in get_vad_backend().speech_timestamps(wav, sampling_rate)
+    ]
 
 
 def check_audio_structure(audio_file: str):
 
-    model, utils = _load_silero_vad()
-
-    (get_speech_timestamps, _, read_audio, *_) = utils
-    
-    # Read audio file
-    wav = read_audio(audio_file)
-    
-    # Get speech timestamps (returns sample indices by default)
-    speech_timestamps = get_speech_timestamps(
-        wav,
-        model,
-        return_seconds=True  # ← Add this parameter to get seconds instead of samples
-    )
+    # Get speech timestamps in seconds
+    speech_timestamps = _speech_timestamps_seconds(audio_file)
 
     # Extract speech timestamps
     for i, segment in enumerate(speech_timestamps):
@@ -151,16 +138,7 @@ def trim_audio_with_vad(
     if not several_seg and not output_path.suffix:
         output_path = output_path.with_suffix('.wav')
 
-    model, utils = _load_silero_vad()
-    (get_speech_timestamps, _, read_audio, *_) = utils
-
-    wav = read_audio(str(audio_path), sampling_rate=sampling_rate)
-
-    speech_timestamps = get_speech_timestamps(
-        wav,
-        model,
-        return_seconds=True
-    )
+    speech_timestamps = _speech_timestamps_seconds(str(audio_path), sampling_rate)
 
     if not speech_timestamps:
         if audio_path != output_path and not several_seg:
@@ -216,56 +194,125 @@ def trim_audio_with_vad(
     duration = trimmed_waveform.shape[1] / original_sr
     return duration, str(output_path)
 
-def rubberband_to_duration(in_wav, target_ms, out_wav):
+@dataclass(frozen=True)
+class VadTrimResult:
+    output_path: str
+    duration: float
+    trimmed: bool  # False when no speech was found and the audio was kept as is
+
+
+def _load_for_vad(audio_path: str, sampling_rate: int) -> Tuple[np.ndarray, int, str, np.ndarray]:
+    info = sf.info(audio_path)
+    waveform, original_sr = sf.read(audio_path, dtype="float32", always_2d=True)
+    mono = waveform.mean(axis=1)
+    mono = RESAMPLER.resample(mono, original_sr, sampling_rate)
+    return waveform, original_sr, info.subtype, mono.astype(np.float32)
+
+
+def _split_batch_timestamps(
+    timestamps: List[Dict[str, int]], offsets: List[int], lengths: List[int]
+) -> List[List[Tuple[int, int]]]:
+    """Map speech timestamps of the concatenated batch back to (start, end) samples per segment."""
+    per_segment: List[List[Tuple[int, int]]] = [[] for _ in offsets]
+    for ts in timestamps:
+        first = max(0, bisect.bisect_right(offsets, ts["start"]) - 1)
+        for idx in range(first, len(offsets)):
+            if offsets[idx] >= ts["end"]:
+                break
+            start = max(ts["start"], offsets[idx]) - offsets[idx]
+            end = min(ts["end"], offsets[idx] + lengths[idx]) - offsets[idx]
+            if end > start:
+                per_segment[idx].append((start, end))
+    return per_segment
+
+
+def _batch_speech_timestamps(waves: List[np.ndarray], sampling_rate: int) -> List[List[Tuple[int, int]]]:
     """
-    Adjust audio duration using Rubberband with high-quality settings.
+    Run VAD once over all segments, concatenated with silence separators long enough
+    that no detected speech region bridges two segments.
     """
-    in_wav_path = str(in_wav) if isinstance(in_wav, Path) else in_wav
-    y, sr = sf.read(in_wav_path, always_2d=False, dtype="float32")
-
-    # Compute target and current samples (use frames along axis 0)
-    target_samples = int(round(target_ms * sr / 1000))
-    current_samples = y.shape[0]
-    rate = current_samples / target_samples
-
-    print("🎵 Rubberband time stretch:")
-    print(f"   Current: {current_samples/sr:.3f}s ({current_samples} samples)")
-    print(f"   Target:  {target_ms/1000:.3f}s ({target_samples} samples)")
-    print(f"   Rate:    {rate:.3f}x")
-    print(f"   Shape in: {y.shape}, dtype: {y.dtype}")
-
-    # pyrubberband expects (samples,) or (samples, channels)
-    y_input = y
-
-    y2 = prb.time_stretch(
-        y_input,
-        sr,
-        rate,
-        rbargs={
-            "--formant": "",
-            "--pitch-hq": ""
-        }
-    )
+    separator = np.zeros(int(VAD_BATCH_SEPARATOR_SECONDS * sampling_rate), dtype=np.float32)
+    offsets: List[int] = []
+    parts: List[np.ndarray] = []
+    cursor = 0
+    for wave in waves:
+        offsets.append(cursor)
+        parts.extend([wave, separator])
+        cursor += len(wave) + len(separator)
 
-    y2_output = y2  # already (samples,) or (samples, channels)
+    timestamps = get_vad_backend().speech_timestamps(np.concatenate(parts), sampling_rate)
+    return _split_batch_timestamps(timestamps, offsets, [len(w) for w in waves])
 
-    # Pad or trim to exact length
-    current_length = y2_output.shape[0] if y2_output.ndim > 1 else len(y2_output)
-    if current_length < target_samples:
-        pad = target_samples - current_length
-        if y2_output.ndim == 1:
-            y2_output = np.concatenate([y2_output, np.zeros(pad, dtype=y2_output.dtype)])
-        else:
-            y2_output = np.vstack([y2_output, np.zeros((pad, y2_output.shape[1]), dtype=y2_output.dtype)])
-        print(f"   Padded {pad} samples")
-    elif current_length > target_samples:
-        if y2_output.ndim == 1:
-            y2_output = y2_output[:target_samples]
-        else:
-            y2_output = y2_output[:target_samples, :]
-        print(f"   Trimmed {current_length - target_samples} samples")
 
-    sf.write(out_wav, y2_output, sr)
+def trim_audio_batch(
+    items: Sequence[Tuple[str | Path, str | Path]],
+    sampling_rate: int = 16000,
+    post_pad: float = 0.10,
+    max_workers: Optional[int] = None,
+) -> List[Optional[VadTrimResult]]:
+    """
+    Trim trailing non-speech from many files at once (same rule as trim_audio_with_vad):
+    every (audio_path, output_path) pair is decoded once on a thread pool, VAD runs in a
+    single pass over the whole batch, and the trimmed outputs are written in parallel.
+    The returned durations are registered with the media info cache. An item that
+    cannot be read or written gets ``None`` and does not affect the others.
+    """
+    if not items:
+        return []
+
+    def _load(item: Tuple[str | Path, str | Path]) -> Optional[Tuple[np.ndarray, int, str, np.ndarray]]:
+        try:
+            return _load_for_vad(str(item[0]), sampling_rate)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("VAD trim: could not read %s, keeping it untrimmed: %s", item[0], exc)
+            return None
+
+    workers = max_workers or min(VAD_BATCH_MAX_WORKERS, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = list(pool.map(_load, items))
+        readable = [index for index, entry in enumerate(loaded) if entry is not None]
+        speech = (
+            dict(zip(readable, _batch_speech_timestamps([loaded[i][3] for i in readable], sampling_rate)))
+            if readable
+            else {}
+        )
+
+        def _write(index: int) -> Optional[VadTrimResult]:
+            if loaded[index] is None:
+                return None
+            waveform, original_sr, subtype, _ = loaded[index]
+            output_path = Path(items[index][1])
+            if not output_path.suffix:
+                output_path = output_path.with_suffix(".wav")
+            regions = speech[index]
+            if regions:
+                last_end = regions[-1][1] / sampling_rate
+                end_sample = min(len(waveform), int(round((last_end + post_pad) * original_sr)))
+            else:
+                end_sample = len(waveform)
+            if end_sample <= 0:
+                end_sample = len(waveform)
+            trimmed = waveform[:end_sample]
+            if subtype not in sf.available_subtypes("WAV"):
+                subtype = "PCM_16"
+            try:
+                sf.write(str(output_path), trimmed, original_sr, format="WAV", subtype=subtype)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("VAD trim: could not write %s, keeping %s untrimmed: %s", output_path, items[index][0], exc)
+                return None
+            duration = len(trimmed) / original_sr
+            MEDIA_INFO.record_audio(output_path, duration, original_sr, trimmed.shape[1])
+            return VadTrimResult(str(output_path), duration, bool(regions))
+
+        return list(pool.map(_write, range(len(items))))
+
+
+def rubberband_to_duration(in_wav, target_ms, out_wav, stretch_tier: Optional[str] = None):
+    """
+    Adjust audio duration with the time-stretch engine selected for ``stretch_tier``.
+    """
+    samples, sr, _ = stretch_file(in_wav, None, out_wav, policy_for(stretch_tier), target_ms=target_ms)
+    print(f"🎵 Time stretch: {in_wav} → {samples/sr:.3f}s ({samples} samples)")
     print(f"   ✅ Saved: {out_wav}")
     return out_wav
 
@@ -342,7 +389,9 @@ def concatenate_audio(
     min_dur: float = 0.3, 
     translation_segments: Optional[List[Dict]] = None,
     strict_timing: bool = True,  # NEW: Enable strict segment-by-segment timing
-    max_speed_ratio: float = 1.35  # NEW: Maximum speed adjustment for strict timing
+    max_speed_ratio: float = 1.35,  # NEW: Maximum speed adjustment for strict timing
+    stretch_tier: Optional[str] = None,
+    sample_rate: Optional[int] = None,
 ) -> Tuple[str, Optional[List[Dict]]]:
     """
     Concatenate audio segments with intelligent duration adjustment.
@@ -358,6 +407,8 @@ def concatenate_audio(
         translation_segments (list, optional): List of translation segment dicts to update timings
         strict_timing (bool): If True, force exact segment timing (recommended for correct sync)
         max_speed_ratio (float): Maximum speed adjustment allowed in strict mode (1.35 = 35%)
+        stretch_tier (str, optional): Time-stretch quality tier (control_center.yaml time_stretch.tiers)
+        sample_rate (int, optional): Working rate of the run's timeline (default: first segment's rate)
         
     Returns:
         Tuple of (output_file_path, updated_translation_segments)
@@ -381,7 +432,9 @@ def concatenate_audio(
                 output_file=output_file,
                 target_duration=target_duration,
                 max_speed_ratio=max_speed_ratio,
-                translation_segments=translation_segments
+                translation_segments=translation_segments,
+                stretch_tier=stretch_tier,
+                sample_rate=sample_rate,
             )
             
             if quality_warnings > 0:
@@ -409,7 +462,7 @@ def concatenate_audio(
             actual_duration = get_audio_duration(Path(audio_files[0]))
             if actual_duration > target_duration:
                 # Compress to fit target duration
-                rubberband_to_duration(audio_files[0], target_duration * 1000, output_file)
+                rubberband_to_duration(audio_files[0], target_duration * 1000, output_file, stretch_tier)
                 # Update translation segment timings
                 if translation_segments and len(translation_segments) >= 1:
                     translation_segments[0]["start"] = 0.0
@@ -427,8 +480,11 @@ def concatenate_audio(
                 silence_before = new_start  # From 0 to new_start
                 silence_after = target_duration - new_end  # From new_end to target_duration
                 
-                # Use weighted silence concatenation
-                _concat_with_weighted_silence([audio_files[0]], output_file, [silence_before, silence_after])
+                # Place the segment at its centered start, followed by the trailing silence
+                render_timeline(
+                    [Placement(audio_files[0], silence_before)], output_file,
+                    total_duration=silence_before + actual_duration + silence_after, sample_rate=sample_rate,
+                )
                 # Update translation segment timings
                 if translation_segments and len(translation_segments) >= 1:
                     translation_segments[0]["start"] = float(new_start)
@@ -441,7 +497,7 @@ def concatenate_audio(
     
     # ========== NO TARGET DURATION ==========
     if target_duration is None:
-        return _simple_concat(audio_files, output_file)
+        return concatenate_files(audio_files, output_file)
     
     # ========== CENTERING LOGIC WITH SILENCE PADDING ==========
     print("\n" + "="*60)
@@ -540,6 +596,8 @@ def concatenate_audio(
         right_gap = max(0.0, right_boundary - segment_info[idx]['centered_end'])
         return left_gap, right_gap
 
+    stretch_jobs: List[StretchJob] = []
+    stretch_plan: List[Tuple[int, float, float, float]] = []
     for i in range(len(segment_info)):
         seg = segment_info[i]
         actual = float(seg['actual_duration'])
@@ -583,21 +641,26 @@ def concatenate_audio(
             print(f"   Segment {i}: insufficient gap after allocation, skipping stretch.")
             continue
 
-        # Time-stretch audio file
-        src_path = Path(seg['audio_url'])
+        # Reserve the space now; the audio is stretched in one batch after planning
         dst_path = stretch_temp_dir / f"stretched_{i:03d}.wav"
-        try:
-            rubberband_to_duration(str(src_path), desired * 1000.0, str(dst_path))
-        except Exception as e:
-            print(f"   Segment {i}: stretch failed ({e}), skipping.")
-            continue
-
-        # Update segment info: duration, file, and centered bounds
-        seg['audio_url'] = str(dst_path)
-        seg['actual_duration'] = desired
+        stretch_jobs.append(StretchJob.for_duration(seg['audio_url'], dst_path, desired, policy=policy_for(stretch_tier)))
+        stretch_plan.append((i, desired, expand_left, expand_right))
         seg['centered_start'] -= expand_left
         seg['centered_end'] += expand_right
 
+    for (i, desired, expand_left, expand_right), result in zip(stretch_plan, run_stretch_jobs(stretch_jobs)):
+        seg = segment_info[i]
+        if not result.ok:
+            print(f"   Segment {i}: stretch failed ({result.error}), skipping.")
+            # Give the reserved space back; the original take still fits its old bounds
+            seg['centered_start'] += expand_left
+            seg['centered_end'] -= expand_right
+            continue
+
+        # Update segment info: duration and file
+        seg['audio_url'] = result.output_path
+        seg['actual_duration'] = result.duration
+
         print(f"   Segment {i}: stretched to {desired:.3f}s, adjusted to [{seg['centered_start']:.3f}-{seg['centered_end']:.3f}]")
 
     # ========== WRITE BACK FINAL BOUNDARIES TO TRANSLATION SEGMENTS ==========
@@ -614,103 +677,18 @@ def concatenate_audio(
             translation_segments[k]["start"] = start
             translation_segments[k]["end"] = end
 
-    # ========== BUILD TIMELINE WITH SILENCE ==========
-    print("\n🔇 Building timeline with silence padding...")
-    
-    # Create timeline events (segments + silence gaps)
-    timeline = []
-    current_time = 0.0
-    
+    # ========== RENDER SEGMENTS AT THEIR CENTERED POSITIONS ==========
+    print(f"\n🎵 Rendering {len(segment_info)} segments onto a {target_duration:.3f}s timeline...")
     for i, seg_info in enumerate(segment_info):
-        # Add silence before segment if needed
-        if current_time < seg_info['centered_start']:
-            silence_duration = seg_info['centered_start'] - current_time
-            timeline.append({
-                'type': 'silence',
-                'duration': silence_duration,
-                'start': current_time,
-                'end': seg_info['centered_start']
-            })
-            print(f"   Silence gap {len([t for t in timeline if t['type'] == 'silence'])}: {silence_duration:.3f}s")
-        
-        # Add segment
-        timeline.append({
-            'type': 'audio',
-            'audio_url': seg_info['audio_url'],
-            'duration': seg_info['actual_duration'],
-            'start': seg_info['centered_start'],
-            'end': seg_info['centered_end']
-        })
         print(f"   Segment {i}: {seg_info['actual_duration']:.3f}s at [{seg_info['centered_start']:.3f}-{seg_info['centered_end']:.3f}]")
-        
-        current_time = seg_info['centered_end']
-    
-    # Add final silence if needed
-    if current_time < target_duration:
-        final_silence = target_duration - current_time
-        timeline.append({
-            'type': 'silence',
-            'duration': final_silence,
-            'start': current_time,
-            'end': target_duration
-        })
-        print(f"   Final silence: {final_silence:.3f}s")
-    
-    # ========== CONCATENATE WITH FFMPEG ==========
-    print(f"\n🎵 Concatenating {len(timeline)} elements...")
-    
-    import tempfile
-    silence_temp_dir = Path(tempfile.mkdtemp())
-    
+
     try:
-        # Get audio properties from first audio segment
-        first_audio = next(t for t in timeline if t['type'] == 'audio')['audio_url']
-        probe_cmd = [
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'a:0',
-            '-show_entries', 'stream=sample_rate,channels',
-            '-of', 'json',
-            first_audio
-        ]
-        probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        audio_info = json.loads(probe_result.stdout)
-        sample_rate = audio_info['streams'][0]['sample_rate']
-        channels = audio_info['streams'][0]['channels']
-        
-        # Create silence files and build file list
-        filelist_path = silence_temp_dir / "filelist.txt"
-        silence_counter = 0
-        
-        with open(filelist_path, 'w') as f:
-            for element in timeline:
-                if element['type'] == 'silence':
-                    if element['duration'] > 0.001:  # Only create if > 1ms
-                        silence_file = silence_temp_dir / f"silence_{silence_counter}.wav"
-                        silence_cmd = [
-                            'ffmpeg', '-y',
-                            '-f', 'lavfi',
-                            '-i', f'anullsrc=channel_layout={"stereo" if channels == 2 else "mono"}:sample_rate={sample_rate}',
-                            '-t', str(element['duration']),
-                            str(silence_file)
-                        ]
-                        subprocess.run(silence_cmd, capture_output=True, text=True, check=True)
-                        f.write(f"file '{silence_file.absolute()}'\n")
-                        silence_counter += 1
-                else:
-                    # Audio segment
-                    f.write(f"file '{Path(element['audio_url']).absolute()}'\n")
-        
-        # Final concatenation
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(filelist_path),
-            '-c', 'copy',
-            str(output_file)
-        ]
-        
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        render_timeline(
+            [Placement(seg_info['audio_url'], seg_info['centered_start']) for seg_info in segment_info],
+            output_file,
+            total_duration=target_duration,
+            sample_rate=sample_rate,
+        )
         
         # Verify final duration
         final_duration = get_audio_duration(output_file)
@@ -728,13 +706,12 @@ def concatenate_audio(
             result = str(output_file)
         elif final_duration - target_duration > 0.1:
             print(f"⚠️  Duration mismatch > 0.1s, applying final trim/pad...")
-            result = rubberband_to_duration(str(output_file), target_duration * 1000, str(output_file))
+            result = rubberband_to_duration(str(output_file), target_duration * 1000, str(output_file), stretch_tier)
         else:
             result = str(output_file)
     
     finally:
         # Clean up temp dirs
-        shutil.rmtree(silence_temp_dir, ignore_errors=True)
         shutil.rmtree(stretch_temp_dir, ignore_errors=True)
     
     print("\n" + "="*60)
@@ -747,129 +724,6 @@ def concatenate_audio(
     return result, translation_segments
 
 
-def _simple_concat(audio_files, output_file):
-    """Helper: Simple concatenation without any adjustments"""
-    import tempfile
-    temp_dir = tempfile.mkdtemp()
-    filelist_path = os.path.join(temp_dir, "temp_filelist.txt")
-    
-    try:
-        # Write file list
-        with open(filelist_path, 'w') as f:
-            for audio_file in audio_files:
-                f.write(f"file '{os.path.abspath(audio_file)}'\n")
-        
-        # Build ffmpeg command for concatenation
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', filelist_path,
-            '-c', 'copy',
-            output_file
-        ]
-        
-        print(f"Concatenating {len(audio_files)} audio files...")
-        
-        # Execute ffmpeg command
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print(f"Successfully concatenated audio files to: {output_file}")
-        return output_file
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Error concatenating audio files: {e}")
-        print(f"FFmpeg stderr: {e.stderr}")
-        raise
-    finally:
-        # Clean up temporary directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
-
-
-def _concat_with_weighted_silence(audio_files, output_file, silence_gaps):
-    """
-    Helper: Concatenate audio files with weighted silence gaps.
-    
-    Args:
-        audio_files: List of audio file paths
-        output_file: Output file path
-        silence_gaps: List of silence durations. Length should be len(audio_files) + 1
-                     [before_first, between_1_2, between_2_3, ..., after_last]
-    """
-    import tempfile
-    
-    temp_dir = tempfile.mkdtemp()
-    
-    try:
-        # Get sample rate and channels from first audio file
-        probe_cmd = [
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'a:0',
-            '-show_entries', 'stream=sample_rate,channels',
-            '-of', 'json',
-            audio_files[0]
-        ]
-        probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        audio_info = json.loads(probe_result.stdout)
-        sample_rate = audio_info['streams'][0]['sample_rate']
-        channels = audio_info['streams'][0]['channels']
-        
-        # Create silence files for each gap
-        silence_files = []
-        for i, silence_duration in enumerate(silence_gaps):
-            if silence_duration > 0.001:  # Only create if > 1ms
-                silence_file = os.path.join(temp_dir, f"silence_{i}.wav")
-                silence_cmd = [
-                    'ffmpeg', '-y',
-                    '-f', 'lavfi',
-                    '-i', f'anullsrc=channel_layout={"stereo" if channels == 2 else "mono"}:sample_rate={sample_rate}',
-                    '-t', str(silence_duration),
-                    silence_file
-                ]
-                subprocess.run(silence_cmd, capture_output=True, text=True, check=True)
-                silence_files.append(silence_file)
-            else:
-                silence_files.append(None)
-        
-        # Build file list with weighted silence
-        filelist_path = os.path.join(temp_dir, "filelist.txt")
-        with open(filelist_path, 'w') as f:
-            # Silence before first segment
-            if silence_files[0]:
-                f.write(f"file '{os.path.abspath(silence_files[0])}'\n")
-            
-            # Interleave audio files and silence gaps
-            for i, audio_file in enumerate(audio_files):
-                f.write(f"file '{os.path.abspath(audio_file)}'\n")
-                
-                # Add silence after this segment (if not last segment or if silence after last exists)
-                silence_idx = i + 1
-                if silence_idx < len(silence_files) and silence_files[silence_idx]:
-                    f.write(f"file '{os.path.abspath(silence_files[silence_idx])}'\n")
-        
-        # Concatenate with weighted silence
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', filelist_path,
-            '-c', 'copy',
-            output_file
-        ]
-        
-        print(f"Concatenating {len(audio_files)} files with weighted silence...")
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print(f"✅ Successfully concatenated with weighted silence to: {output_file}")
-        
-        return output_file
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Error concatenating with weighted silence: {e}")
-        print(f"FFmpeg stderr: {e.stderr}")
-        raise
-    finally:
-        # Clean up temporary directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
-
 def overlay_on_background_default(
     dubbed_segments: List[Dict],
     background_path: Path | str,
@@ -898,15 +752,9 @@ def overlay_on_background_default(
     if not background_path.exists():
         raise FileNotFoundError(f"Background track not found: {background_path}")
 
-    bg_wave, sr = sf.read(str(background_path), always_2d=True)
-    bg_wave = bg_wave.astype(np.float32)
-
-    if ducking_db != 0.0:
-        gain = 10 ** (ducking_db / 20.0)
-        bg_wave *= gain
-
-    mix = bg_wave.copy()
-
+    placements: List[Placement] = []
+    stretch_jobs: List[StretchJob] = []
+    stretched: List[int] = []
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir = Path(tmpdir)
 
@@ -925,44 +773,21 @@ def overlay_on_background_default(
             if not source_path.exists():
                 continue
 
-            target_ms = (end - start) * 1000.0
-            adjusted_path = source_path
+            placements.append(Placement(str(source_path), start))
             source_duration = get_audio_duration(str(source_path))
 
             if abs(source_duration - (end - start)) > 1e-3:
-                adjusted_path = tmpdir / f"segment_{idx:03d}.wav"
-                rubberband_to_duration(str(source_path), target_ms, str(adjusted_path))
-
-            seg_wave, seg_sr = sf.read(str(adjusted_path), always_2d=True)
-            seg_wave = seg_wave.astype(np.float32)
-
-            if seg_sr != sr:
-                seg_wave = librosa.resample(seg_wave.T, orig_sr=seg_sr, target_sr=sr).T
-
-            if seg_wave.shape[1] != mix.shape[1]:
-                if seg_wave.shape[1] == 1 and mix.shape[1] == 2:
-                    seg_wave = np.tile(seg_wave, (1, 2))
-                elif seg_wave.shape[1] == 2 and mix.shape[1] == 1:
-                    seg_wave = seg_wave.mean(axis=1, keepdims=True)
-                else:
-                    raise ValueError(
-                        f"Unsupported channel layout: segment {seg_wave.shape[1]} vs background {mix.shape[1]}"
-                    )
+                stretched.append(len(placements) - 1)
+                stretch_jobs.append(StretchJob.for_duration(source_path, tmpdir / f"segment_{idx:03d}.wav", end - start))
 
-            start_idx = int(round(start * sr))
-            end_idx = start_idx + seg_wave.shape[0]
+        # All off-length segments are stretched in one parallel batch; failures keep the original take
+        for position, result in zip(stretched, run_stretch_jobs(stretch_jobs)):
+            if result.ok:
+                placements[position] = Placement(result.output_path, placements[position].start)
 
-            if end_idx > mix.shape[0]:
-                pad = np.zeros((end_idx - mix.shape[0], mix.shape[1]), dtype=np.float32)
-                mix = np.vstack([mix, pad])
+        gain = 10 ** (ducking_db / 20.0) if ducking_db != 0.0 else 1.0
+        mix_onto_background(background_path, placements, output_path, background_gain=gain)
 
-            mix[start_idx:end_idx, :seg_wave.shape[1]] += seg_wave
-
-    peak = np.max(np.abs(mix))
-    if peak > 1.0:
-        mix /= peak * 1.01
-
-    sf.write(str(output_path), mix, sr)
     return str(output_path) # No translation segments updated in this simple overlay
 
 def overlay_on_background_sophisticated(
@@ -998,15 +823,15 @@ def overlay_on_background_sophisticated(
         if not speech_path.exists():
             raise FileNotFoundError(f"Speech track not found: {speech_path}")
         # No temp dir needed when using a provided speech track
-        bg_wave, bg_sr = sf.read(str(background_path), always_2d=True)
-        sp_wave, sp_sr = sf.read(str(speech_path), always_2d=True)
+        bg_wave, bg_sr = sf.read(str(background_path), always_2d=True, dtype="float32")
+        sp_wave, sp_sr = sf.read(str(speech_path), always_2d=True, dtype="float32")
     else:
         raise ValueError(" Speech_track must be provided.")
         
 
     # Resample speech to background SR if needed
     if sp_sr != bg_sr:
-        sp_wave = librosa.resample(sp_wave.T, orig_sr=sp_sr, target_sr=bg_sr).T
+        sp_wave = RESAMPLER.resample(sp_wave, sp_sr, bg_sr)
 
     # Match channel count (map to background layout)
     if sp_wave.shape[1] != bg_wave.shape[1]:
@@ -1019,47 +844,74 @@ def overlay_on_background_sophisticated(
                 f"Unsupported channel layout: speech {sp_wave.shape[1]} vs background {bg_wave.shape[1]}"
             )
 
-    # Pad/trim to exact background length (concatenate_audio targets this already, but guard anyway)
+    # Speech beyond the background is dropped, a shorter speech track leaves the tail unducked
     bg_len = bg_wave.shape[0]
-    sp_len = sp_wave.shape[0]
-    if sp_len < bg_len:
-        pad = np.zeros((bg_len - sp_len, sp_wave.shape[1]), dtype=sp_wave.dtype)
-        sp_wave = np.vstack([sp_wave, pad])
-    elif sp_len > bg_len:
-        sp_wave = sp_wave[:bg_len, :]
-
-    # Prepare dynamic ducking envelope from speech
+    sp_wave = sp_wave[:bg_len]
+
+    # Dynamic ducking envelope from speech, computed at 1 kHz and interpolated back per block
     if ducking_db != 0.0:
-        env = np.mean(np.abs(sp_wave), axis=1).astype(np.float32)
-        win = max(1, int(0.02 * bg_sr))
-        if win > 1:
-            kernel = np.ones(win, dtype=np.float32) / win
-            env = np.convolve(env, kernel, mode="same")
-        max_env = float(env.max()) if env.size > 0 else 0.0
-        env = (env / max_env) if max_env > 1e-8 else np.zeros_like(env, dtype=np.float32)
-        rel_win = max(1, int(0.10 * bg_sr))
-        if rel_win > 1:
-            kernel_rel = np.ones(rel_win, dtype=np.float32) / rel_win
-            env = np.convolve(env, kernel_rel, mode="same")
+        hop = max(1, int(bg_sr * ENVELOPE_FRAME_SECONDS))
+        env = _speech_envelope(sp_wave, hop, bg_len, attack_frames=20, release_frames=100)
         min_gain = float(10.0 ** (ducking_db / 20.0))
-        gain_curve = 1.0 + (min_gain - 1.0) * env
-        gain_curve = gain_curve[:, None]
+        frame_gain = (1.0 + (min_gain - 1.0) * env).astype(np.float32)
+        frame_pos = (np.arange(len(frame_gain)) + 0.5) * hop
     else:
-        gain_curve = 1.0
-
-    # Mix: ducked background + speech
-    bg_wave = bg_wave.astype(np.float32)
-    sp_wave = sp_wave.astype(np.float32)
-    mix = bg_wave * gain_curve + sp_wave
+        frame_gain = None
+
+    # Mix in place: ducked background + speech
+    mix = bg_wave
+    for offset in range(0, bg_len, MIX_BLOCK_FRAMES):
+        block = mix[offset:offset + MIX_BLOCK_FRAMES]
+        if frame_gain is not None:
+            positions = np.arange(offset, offset + len(block))
+            block *= np.interp(positions, frame_pos, frame_gain).astype(np.float32)[:, None]
+        speech = sp_wave[offset:offset + len(block)]
+        block[:len(speech)] += speech
 
     # Normalize to prevent clipping
     peak = float(np.max(np.abs(mix))) if mix.size else 0.0
     if peak > 1.0:
-        mix = mix / (peak * 1.01)
+        mix /= peak * 1.01
 
     sf.write(str(output_path), mix, bg_sr)
     return str(output_path)
 
+
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average (zero padded, like ``np.convolve(..., mode="same")``) via a cumulative sum."""
+    if window <= 1 or values.size == 0:
+        return values
+    csum = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    left = window // 2
+    idx = np.arange(values.size)
+    hi = np.minimum(idx - left + window, values.size)
+    lo = np.maximum(idx - left, 0)
+    return ((csum[hi] - csum[lo]) / window).astype(np.float32)
+
+
+def _speech_envelope(
+    speech: np.ndarray, hop: int, total_samples: int, attack_frames: int, release_frames: int
+) -> np.ndarray:
+    """
+    Normalized speech envelope with one value per ``hop`` samples of ``total_samples``: mean
+    absolute level per frame, smoothed by the attack window, normalized to 1, then smoothed
+    by the release window. Frames past the end of ``speech`` are silent.
+    """
+    frames = -(-total_samples // hop)
+    level = np.zeros(frames, dtype=np.float32)
+    block_frames = max(1, MIX_BLOCK_FRAMES // hop)
+    for first in range(0, frames, block_frames):
+        chunk = speech[first * hop:(first + block_frames) * hop]
+        full = chunk.shape[0] // hop
+        if full:
+            level[first:first + full] = np.abs(chunk[:full * hop]).reshape(full, hop, -1).mean(axis=(1, 2))
+        if chunk.shape[0] > full * hop:
+            level[first + full] = np.abs(chunk[full * hop:]).mean()
+    env = _moving_average(level, attack_frames)
+    max_env = float(env.max()) if env.size > 0 else 0.0
+    env = (env / max_env) if max_env > 1e-8 else np.zeros_like(env)
+    return _moving_average(env, release_frames)
+
 # overlay functions selector
 def overlay_on_background(dubbed_segments: List[Dict],
     background_path: Path | str,
@@ -1089,31 +941,3 @@ def overlay_on_background(dubbed_segments: List[Dict],
         return overlay_on_background_default(
             dubbed_segments, background_path, output_path, ducking_db
         )
-
-
-
-# NOTE: get_audio_duration is imported from strict_timing module when available
-# Fallback implementation if strict_timing is not available
-if not STRICT_TIMING_AVAILABLE:
-    def get_audio_duration(path: Path | str) -> float:
-        """Get audio duration in seconds (fallback, ffprobe-based)."""
-        resolved = str(Path(path))
-        try:
-            out = subprocess.check_output(
-                [
-                    "ffprobe",
-                    "-v",
-                    "error",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "default=noprint_wrappers=1:nokey=1",
-                    resolved,
-                ],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            )
-            return float(out.strip())
-        except Exception as e:
-            logger.error(f"Failed to get audio duration for {resolved}: {e}")
-            raise
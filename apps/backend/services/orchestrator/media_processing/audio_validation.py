@@ -5,14 +5,118 @@ Provides validation functions to detect corrupted, silent, or invalid audio
 files early in the dubbing pipeline before expensive processing.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import os
 import numpy as np
 import soundfile as sf
 import logging
 
+from .media_info import MEDIA_INFO
+
 logger = logging.getLogger(__name__)
 
+VALIDATION_BLOCK_FRAMES = 1 << 16
+VALIDATION_MAX_WORKERS = 8
+SILENCE_RMS = 0.001
+MAX_CLIPPED_PERCENT = 5.0
+
+
+@dataclass(frozen=True)
+class AudioCheck:
+    """Outcome of validating one file; ``check`` names the failed test ("" when valid)."""
+
+    audio_path: str
+    valid: bool
+    error: str = ""
+    check: str = ""
+    duration: float = 0.0
+
+
+@dataclass
+class ValidationReport:
+    results: List[AudioCheck] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return all(result.valid for result in self.results)
+
+    @property
+    def failed_indices(self) -> List[int]:
+        return [idx for idx, result in enumerate(self.results) if not result.valid]
+
+    def to_dict(self) -> Dict:
+        return {
+            "checked": len(self.results),
+            "failed": len(self.failed_indices),
+            "failures": [dict(asdict(self.results[idx]), index=idx) for idx in self.failed_indices],
+        }
+
+
+def _fail(audio_path: Path, check: str, error: str, duration: float = 0.0) -> AudioCheck:
+    return AudioCheck(str(audio_path), False, error, check, duration)
+
+
+def check_audio_file(
+    audio_path: Union[Path, str],
+    min_duration: float = 0.1,
+    expected_duration: Optional[float] = None,
+    tolerance: float = 0.5,
+) -> AudioCheck:
+    """
+    Run every check in one streamed pass over ``audio_path``.
+
+    Duration checks come from the header before any sample is decoded; NaN/Inf
+    fail on the first block that has them and clipping fails as soon as the
+    clipped count exceeds the limit for the whole file. Only silence needs the
+    full pass.
+    """
+    audio_path = Path(audio_path)
+    try:
+        with sf.SoundFile(str(audio_path)) as source:
+            sr, frames, channels = source.samplerate, source.frames, source.channels
+            # Check duration
+            duration = frames / sr if sr > 0 else 0
+            if duration < min_duration:
+                return _fail(audio_path, "duration", f"Audio too short: {duration:.3f}s (minimum {min_duration}s)", duration)
+            if expected_duration is not None and abs(duration - expected_duration) > tolerance:
+                return _fail(audio_path, "duration", (
+                    f"Duration mismatch: expected {expected_duration:.2f}s, "
+                    f"got {duration:.2f}s (deviation: {abs(duration - expected_duration):.2f}s)"
+                ), duration)
+
+            clip_limit = MAX_CLIPPED_PERCENT / 100 * frames * channels
+            energy = np.zeros(channels, dtype=np.float64)
+            clipped = 0
+            for block in source.blocks(VALIDATION_BLOCK_FRAMES, dtype="float32", always_2d=True):
+                # Check for NaN/Inf values
+                if not np.isfinite(block).all():
+                    if np.isnan(block).any():
+                        return _fail(audio_path, "nan", "Audio contains NaN values (corrupted data)", duration)
+                    return _fail(audio_path, "inf", "Audio contains Inf values (corrupted data)", duration)
+                energy += np.einsum("ij,ij->j", block, block, dtype=np.float64)
+                # Check for clipping (values outside [-1, 1])
+                clipped += int(np.count_nonzero(np.abs(block) > 1.0))
+                if clipped > clip_limit:
+                    clipped_pct = 100 * clipped / (frames * channels)
+                    return _fail(audio_path, "clipping", f"Audio is clipped: at least {clipped_pct:.1f}% of samples exceed range", duration)
+    except FileNotFoundError:
+        return _fail(audio_path, "read", f"Audio file not found: {audio_path}")
+    except Exception as e:
+        if not audio_path.exists():
+            return _fail(audio_path, "read", f"Audio file not found: {audio_path}")
+        return _fail(audio_path, "read", f"Failed to read audio: {type(e).__name__}: {e}")
+
+    # Check if silent (RMS threshold, loudest channel)
+    max_rms = float(np.sqrt(energy / frames).max())
+    if max_rms < SILENCE_RMS:
+        return _fail(audio_path, "silence", f"Audio is silent (RMS: {max_rms:.6f})", duration)
+
+    MEDIA_INFO.record_audio(audio_path, duration, sr, channels)
+    return AudioCheck(str(audio_path), True, duration=duration)
+
 
 def validate_audio_quality(audio_path: Path, min_duration: float = 0.1) -> Tuple[bool, str]:
     """
@@ -30,46 +134,8 @@ def validate_audio_quality(audio_path: Path, min_duration: float = 0.1) -> Tuple
         if not is_valid:
             logger.error(f"Invalid audio: {error}")
     """
-    try:
-        # Read audio file
-        audio, sr = sf.read(str(audio_path))
-        
-        # Check duration
-        duration = len(audio) / sr if sr > 0 else 0
-        if duration < min_duration:
-            return False, f"Audio too short: {duration:.3f}s (minimum {min_duration}s)"
-        
-        # Check if silent (RMS threshold)
-        if len(audio.shape) > 1:
-            # Stereo - check both channels
-            rms = np.sqrt(np.mean(audio**2, axis=0))
-            max_rms = np.max(rms)
-        else:
-            # Mono
-            rms = np.sqrt(np.mean(audio**2))
-            max_rms = rms
-            
-        if max_rms < 0.001:
-            return False, f"Audio is silent (RMS: {max_rms:.6f})"
-        
-        # Check for NaN/Inf values
-        if np.any(np.isnan(audio)):
-            return False, "Audio contains NaN values (corrupted data)"
-        if np.any(np.isinf(audio)):
-            return False, "Audio contains Inf values (corrupted data)"
-        
-        # Check for clipping (values outside [-1, 1])
-        if np.any(np.abs(audio) > 1.0):
-            clipped_pct = 100 * np.sum(np.abs(audio) > 1.0) / audio.size
-            if clipped_pct > 5:  # More than 5% clipped
-                return False, f"Audio is clipped: {clipped_pct:.1f}% of samples exceed range"
-        
-        return True, ""
-        
-    except FileNotFoundError:
-        return False, f"Audio file not found: {audio_path}"
-    except Exception as e:
-        return False, f"Failed to read audio: {type(e).__name__}: {e}"
+    result = check_audio_file(audio_path, min_duration=min_duration)
+    return result.valid, result.error
 
 
 def validate_segment_audio(segment_path: Path, expected_duration: float, tolerance: float = 0.5) -> Tuple[bool, str]:
@@ -84,23 +150,41 @@ def validate_segment_audio(segment_path: Path, expected_duration: float, toleran
     Returns:
         (is_valid, error_message): Validation result and error description
     """
-    # Basic quality check
-    is_valid, error = validate_audio_quality(segment_path, min_duration=0.05)
-    if not is_valid:
-        return False, error
+    result = check_audio_file(segment_path, min_duration=0.05, expected_duration=expected_duration, tolerance=tolerance)
+    return result.valid, result.error
+
+
+def validate_segments_batch(
+    segment_paths: Sequence[Union[Path, str]],
+    expected_durations: Optional[Sequence[Optional[float]]] = None,
+    min_duration: float = 0.05,
+    tolerance: float = 0.5,
+    max_workers: Optional[int] = None,
+) -> ValidationReport:
+    """
+    Validate many segments in parallel on a thread pool (decoding and the NumPy
+    reductions release the GIL). Results are in input order.
     
-    # Duration check
-    try:
-        audio, sr = sf.read(str(segment_path))
-        actual_duration = len(audio) / sr
-        deviation = abs(actual_duration - expected_duration)
-        
-        if deviation > tolerance:
-            return False, (
-                f"Duration mismatch: expected {expected_duration:.2f}s, "
-                f"got {actual_duration:.2f}s (deviation: {deviation:.2f}s)"
-            )
+    Args:
+        segment_paths: Segment audio files
+        expected_durations: Optional expected duration per segment (None skips the check)
+        min_duration: Minimum acceptable duration in seconds
+        tolerance: Acceptable deviation from the expected duration in seconds
+        max_workers: Thread count (default: one per core, at most 8)
         
-        return True, ""
-    except Exception as e:
-        return False, f"Duration check failed: {e}"
+    Returns:
+        ValidationReport with one AudioCheck per segment
+    """
+    if not segment_paths:
+        return ValidationReport()
+    expected = list(expected_durations) if expected_durations is not None else [None] * len(segment_paths)
+    workers = max_workers or min(VALIDATION_MAX_WORKERS, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda args: check_audio_file(args[0], min_duration, args[1], tolerance),
+            zip(segment_paths, expected),
+        ))
+    report = ValidationReport(results)
+    for idx in report.failed_indices:
+        logger.warning("Segment %d failed validation: %s", idx, results[idx].error)
+    return report
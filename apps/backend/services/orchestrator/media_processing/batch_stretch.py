@@ -0,0 +1,150 @@
+"""
+Batch time-stretching on a process pool.
+
+Segment stretch jobs (input file, exact target length in samples, stretch
+policy) are submitted together and spread over one worker process per
+core instead of running one after another. Each result carries the length of
+the buffer that was written, so callers never re-probe the output files.
+Stretches already in ``STRETCH_CACHE`` are served from it without dispatch.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import soundfile as sf
+
+from .media_info import MEDIA_INFO
+from .stretch_cache import STRETCH_CACHE
+from .time_stretch import StretchPolicy, policy_for, stretch_buffer
+
+logger = logging.getLogger(__name__)
+
+# Batches this small are stretched in-process; the pool round trip would dominate
+INLINE_MAX_JOBS = 2
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+_WORKERS = 0
+
+
+@dataclass(frozen=True)
+class StretchJob:
+    input_path: str
+    output_path: str
+    target_samples: int
+    policy: StretchPolicy = field(default_factory=policy_for)
+
+    @classmethod
+    def for_duration(cls, input_path: Union[str, Path], output_path: Union[str, Path], seconds: float, **kwargs) -> "StretchJob":
+        """Job whose target length is ``seconds`` at the input's own sample rate."""
+        sample_rate = MEDIA_INFO.probe(input_path).sample_rate
+        return cls(str(input_path), str(output_path), int(round(seconds * sample_rate)), **kwargs)
+
+
+@dataclass(frozen=True)
+class StretchResult:
+    output_path: str
+    samples: int = 0
+    sample_rate: int = 0
+    channels: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sample_rate if self.sample_rate else 0.0
+
+
+def _stretch_one(job: StretchJob) -> StretchResult:
+    try:
+        y, sr = sf.read(job.input_path, always_2d=False, dtype="float32")
+        y2 = stretch_buffer(y, sr, job.target_samples, job.policy)
+        sf.write(job.output_path, y2, sr)
+    except Exception as exc:  # noqa: BLE001 - reported per job, the batch keeps going
+        return StretchResult(job.output_path, error=f"{type(exc).__name__}: {exc}")
+    return StretchResult(job.output_path, samples=len(y2), sample_rate=sr, channels=1 if y2.ndim == 1 else y2.shape[1])
+
+
+def configure(workers: int = 0) -> None:
+    """Set the pool size (0 = one worker per core); takes effect for the next batch."""
+    global _WORKERS
+    with _POOL_LOCK:
+        _WORKERS = max(0, int(workers or 0))
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            workers = _WORKERS or os.cpu_count() or 1
+            # spawn: the orchestrator holds torch/CUDA state that must not be forked
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info("🧮 Started %d time-stretch worker processes", workers)
+        return _POOL
+
+
+def shutdown() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def _cache_key(job: StretchJob) -> Optional[str]:
+    try:
+        return STRETCH_CACHE.key(job)
+    except (OSError, RuntimeError) as exc:
+        logger.debug("Stretch of %s is not cacheable: %s", job.input_path, exc)
+        return None
+
+
+def _run(jobs: Sequence[StretchJob]) -> List[StretchResult]:
+    if len(jobs) <= INLINE_MAX_JOBS:
+        return [_stretch_one(job) for job in jobs]
+    try:
+        return list(_executor().map(_stretch_one, jobs, chunksize=max(1, len(jobs) // 64)))
+    except Exception as exc:  # noqa: BLE001 - a broken pool must not fail the render
+        logger.warning("Stretch pool failed (%s); stretching in-process", exc)
+        shutdown()
+        return [_stretch_one(job) for job in jobs]
+
+
+def run_stretch_jobs(jobs: Sequence[StretchJob]) -> List[StretchResult]:
+    """Run ``jobs`` in parallel; results are returned in job order."""
+    if not jobs:
+        return []
+    results: List[Optional[StretchResult]] = [None] * len(jobs)
+    keys: List[Optional[str]] = [None] * len(jobs)
+    if STRETCH_CACHE.enabled:
+        for i, job in enumerate(jobs):
+            keys[i] = _cache_key(job)
+            cached = STRETCH_CACHE.fetch(keys[i], job.output_path) if keys[i] else None
+            if cached is not None:
+                results[i] = StretchResult(job.output_path, *cached)
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    if len(pending) < len(jobs):
+        logger.info("♻️ %d/%d stretches served from cache", len(jobs) - len(pending), len(jobs))
+    for i, result in zip(pending, _run([jobs[i] for i in pending])):
+        results[i] = result
+        if result.ok and keys[i]:
+            STRETCH_CACHE.store(keys[i], result.output_path)
+
+    for result in results:
+        if result.ok:
+            MEDIA_INFO.record_audio(result.output_path, result.duration, result.sample_rate, result.channels)
+        else:
+            logger.error("Time stretch failed for %s: %s", result.output_path, result.error)
+    return results
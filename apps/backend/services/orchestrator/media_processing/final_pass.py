@@ -1,8 +1,139 @@
 import subprocess
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from .subtitles_handling import burn_subtitles_to_video, SubtitleStyle
-from .audio_processing import get_audio_duration
-from typing import Optional
+from . import parallel_burn, streaming_output
+from .subtitles_handling import build_subtitle_filter, SubtitleStyle
+from .media_info import get_audio_duration
+from typing import List, Mapping, Optional, Sequence
+
+# MP4/MKV language tags are ISO 639-2; the pipeline uses ISO 639-1 codes
+ISO639_2 = {
+    "ar": "ara", "bn": "ben", "cs": "ces", "da": "dan", "de": "deu", "el": "ell", "en": "eng",
+    "es": "spa", "fa": "fas", "fi": "fin", "fr": "fra", "he": "heb", "hi": "hin", "hu": "hun",
+    "id": "ind", "it": "ita", "ja": "jpn", "ko": "kor", "ms": "msa", "nl": "nld", "no": "nor",
+    "pl": "pol", "pt": "por", "ro": "ron", "ru": "rus", "sv": "swe", "th": "tha", "tr": "tur",
+    "uk": "ukr", "ur": "urd", "vi": "vie", "zh": "zho",
+}
+# Text subtitle codec per container when none is configured
+SUBTITLE_CODECS = {".mp4": "mov_text", ".m4v": "mov_text", ".mov": "mov_text", ".mkv": "srt"}
+
+
+@dataclass(frozen=True)
+class LanguageTrack:
+    """One dubbed language of a multi-track package: its final audio and optional subtitle file."""
+
+    lang: str
+    audio_path: str
+    subtitle_path: Optional[str] = None
+
+
+def language_tag(lang: str) -> str:
+    base = lang.split("-")[0].split("_")[0].lower()
+    return ISO639_2.get(base, base if len(base) == 3 else "und")
+
+
+def _audio_graph(
+    dubbing_strategy: str,
+    vd: float,
+    orig_duck: float,
+    voice: str = "1:a",
+    orig: str = "0:a",
+    out: str = "aout",
+    suffix: str = "",
+) -> str:
+    """
+    Audio part of the final filter graph, ending in ``[out]``.
+    - default: replace original audio with TTS (pad and trim to video duration).
+    - translation_over: overlay TTS as voice-over on the ducked original audio.
+    ``suffix`` keeps intermediate labels unique when several graphs share one filter_complex.
+    """
+    if dubbing_strategy == "translation_over":  # translation_over
+        # Inputs:
+        #  - orig: original audio
+        #  - voice: TTS (voice-over)
+        #
+        # Steps:
+        #  - Ensure both audios are exactly video length.
+        #  - Duck original and mix ducked original + TTS.
+        return (
+            f"[{voice}]apad[padded{suffix}];"
+            f"[padded{suffix}]atrim=0:{vd:.3f},asetpts=PTS-STARTPTS[voice{suffix}];"
+            f"[{orig}]atrim=0:{vd:.3f},asetpts=PTS-STARTPTS,volume={orig_duck}[orig{suffix}];"
+            f"[orig{suffix}][voice{suffix}]amix=inputs=2:weights=1|1:normalize=0,aresample=async=1:first_pts=0[{out}]"
+        )
+    # default: full_replacement, pad and trim TTS to exact video duration
+    return f"[{voice}]apad,atrim=0:{vd:.3f},asetpts=PTS-STARTPTS[{out}]"
+
+
+def build_final_command(
+    video_path: Path | str,
+    audio_path: Path | str | None,
+    output_path: Path | str,
+    subtitle_filter: Optional[str] = None,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+) -> List[str]:
+    """
+    One ffmpeg invocation for the final render: the audio replacement or voice-over
+    mix and, when ``subtitle_filter`` is given, the subtitle burn-in share a single
+    filter graph, so the video is decoded and encoded once with no intermediate file.
+    Without subtitles the video stream is copied; without ``audio_path`` the
+    original audio is copied. The output is progressive when streaming is enabled.
+    """
+    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
+    graph: List[str] = []
+    if audio_path:
+        cmd += ["-i", str(audio_path)]
+        graph.append(_audio_graph(dubbing_strategy, get_audio_duration(video_path), orig_duck))
+    if subtitle_filter:
+        graph.append(f"[0:v]{subtitle_filter}[vout]")
+    if graph:
+        cmd += ["-filter_complex", ";".join(graph)]
+
+    cmd += ["-map", "[vout]" if subtitle_filter else "0:v:0"]
+    cmd += ["-map", "[aout]" if audio_path else "0:a?"]
+    if subtitle_filter:
+        cmd += ["-c:v", "libx264", "-crf", "23", "-preset", "veryfast"]
+    else:
+        cmd += ["-c:v", "copy"]
+    if audio_path:
+        cmd += ["-c:a", "aac", "-b:a", "192k"]
+    else:
+        cmd += ["-c:a", "copy"]
+    cmd += streaming_output.output_args(output_path)
+    return cmd
+
+
+def build_concat_command(
+    concat_list: Path | str,
+    video_path: Path | str,
+    audio_path: Path | str | None,
+    output_path: Path | str,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+) -> List[str]:
+    """
+    Join burned chunks (a concat-demuxer list) with stream copy and mux the final
+    audio in the same call: the dubbed track through the usual audio graph, or the
+    source's own audio when ``audio_path`` is empty.
+    """
+    cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(concat_list), "-i", str(video_path)]
+    if audio_path:
+        cmd += ["-i", str(audio_path)]
+        graph = _audio_graph(dubbing_strategy, get_audio_duration(video_path), orig_duck, voice="2:a", orig="1:a")
+        cmd += ["-filter_complex", graph, "-map", "0:v:0", "-map", "[aout]", "-c:v", "copy", "-c:a", "aac", "-b:a", "192k"]
+    else:
+        cmd += ["-map", "0:v:0", "-map", "1:a?", "-c:v", "copy", "-c:a", "copy"]
+    cmd += streaming_output.output_args(output_path)
+    return cmd
+
+
+def _run_ffmpeg(cmd: List[str]) -> None:
+    try:
+        subprocess.run(cmd, check=True, text=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"FFmpeg failed:\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
 
 
 def apply_audio_to_video(
@@ -13,9 +144,9 @@ def apply_audio_to_video(
     orig_duck: float = 0.2,
 ) -> Path:
     """
-    Replace or overlay audio on a video.
+    Replace or overlay audio on a video, copying the video stream.
     - default: replace original audio with TTS (pad and trim to video duration).
-    - translation_over: overlay TTS as voice-over and duck original audio when TTS speaks.
+    - translation_over: overlay TTS as voice-over and duck original audio.
     """
     video_path = Path(video_path)
     audio_path = Path(audio_path)
@@ -26,66 +157,220 @@ def apply_audio_to_video(
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio not found: {audio_path}")
 
-    vd = get_audio_duration(video_path)  # video duration in seconds (ms precision)
+    with streaming_output.writing(output_path):
+        _run_ffmpeg(build_final_command(video_path, audio_path, output_path, None, dubbing_strategy, orig_duck))
+    return output_path
 
-    if dubbing_strategy == "translation_over":  # translation_over
-        # Inputs:
-        #  - 0:v video
-        #  - 0:a original audio
-        #  - 1:a TTS (voice-over)
-        #
-        # Steps:
-        #  - Ensure both audios are exactly video length.
-        #  - Duck original with TTS as sidechain.
-        #  - Mix ducked original + TTS.
-        #
-        # Notes:
-        #  - sidechaincompress reduces original's gain only when TTS is present.
-        #  - Adjust ratio/threshold/attack/release to taste.
-        
-        filter_complex = (
-            f"[1:a]apad[padded];"
-            f"[padded]atrim=0:{vd:.3f},asetpts=PTS-STARTPTS[voice];"
-            f"[0:a]atrim=0:{vd:.3f},asetpts=PTS-STARTPTS,volume={orig_duck}[orig];"
-            f"[orig][voice]amix=inputs=2:weights=1|1:normalize=0,aresample=async=1:first_pts=0[aout]"
-        )
 
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(video_path),
-            "-i", str(audio_path),
-            "-filter_complex", filter_complex,
-            "-map", "0:v:0",
-            "-map", "[aout]",
-            "-c:v", "copy",
-            "-c:a", "aac", "-b:a", "192k",
-            "-movflags", "+faststart",
-            str(output_path),
+def build_package_command(
+    video_path: Path | str,
+    tracks: Sequence[LanguageTrack],
+    output_path: Path | str,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+    subtitle_codec: Optional[str] = None,
+) -> List[str]:
+    """
+    One stream-copy mux of every language: the source video stream copied once, one
+    AAC track per dubbed language and one soft subtitle track per language that has
+    subtitles, each tagged with its language. The first track is the default one.
+    """
+    output_path = Path(output_path)
+    codec = subtitle_codec or SUBTITLE_CODECS.get(output_path.suffix.lower(), "mov_text")
+    vd = get_audio_duration(video_path)
+
+    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
+    for track in tracks:
+        cmd += ["-i", str(track.audio_path)]
+    subtitled = [track for track in tracks if track.subtitle_path]
+    for track in subtitled:
+        cmd += ["-i", str(track.subtitle_path)]
+
+    graph: List[str] = []
+    sources = ["0:a"] * len(tracks)
+    if dubbing_strategy == "translation_over" and len(tracks) > 1:
+        # The original audio feeds every language's mix
+        sources = [f"src{i}" for i in range(len(tracks))]
+        graph.append("[0:a]asplit=" + str(len(tracks)) + "".join(f"[{label}]" for label in sources))
+    for i in range(len(tracks)):
+        graph.append(_audio_graph(dubbing_strategy, vd, orig_duck, voice=f"{i + 1}:a", orig=sources[i], out=f"a{i}", suffix=str(i)))
+    cmd += ["-filter_complex", ";".join(graph), "-map", "0:v:0"]
+    for i in range(len(tracks)):
+        cmd += ["-map", f"[a{i}]"]
+    for j in range(len(subtitled)):
+        cmd += ["-map", f"{len(tracks) + 1 + j}:0"]
+
+    cmd += ["-c:v", "copy", "-c:a", "aac", "-b:a", "192k"]
+    if subtitled:
+        cmd += ["-c:s", codec]
+    for i, track in enumerate(tracks):
+        cmd += [
+            f"-metadata:s:a:{i}", f"language={language_tag(track.lang)}",
+            f"-metadata:s:a:{i}", f"title={track.lang}",
+            f"-disposition:a:{i}", "default" if i == 0 else "0",
         ]
-        
-    else : # default: full_replacement
-        # full_replacement: replace original audio with TTS, pad and trim to exact video duration
-        filter_complex = f"[1:a]apad,atrim=0:{vd:.3f},asetpts=PTS-STARTPTS[aout]"
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(video_path),
-            "-i", str(audio_path),
-            "-filter_complex", filter_complex,
-            "-map", "0:v:0",
-            "-map", "[aout]",
-            "-c:v", "copy",
-            "-c:a", "aac", "-b:a", "192k",
-            "-movflags", "+faststart",
-            str(output_path),
+    for j, track in enumerate(subtitled):
+        cmd += [
+            f"-metadata:s:s:{j}", f"language={language_tag(track.lang)}",
+            f"-metadata:s:s:{j}", f"title={track.lang}",
+            f"-disposition:s:{j}", "0",
         ]
-    
+    if output_path.suffix.lower() in (".mp4", ".m4v", ".mov"):
+        cmd += ["-movflags", "+faststart"]
+    cmd.append(str(output_path))
+    return cmd
 
-    try:
-        subprocess.run(cmd, check=True, text=True, capture_output=True)
+
+def package_languages(
+    video_path: Path | str,
+    tracks: Sequence[LanguageTrack],
+    output_path: Path | str,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+    subtitle_codec: Optional[str] = None,
+) -> Path:
+    """Mux all dubbed languages into a single container without re-encoding the video."""
+    video_path = Path(video_path)
+    output_path = Path(output_path)
+    if not tracks:
+        raise ValueError("No language tracks to package")
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video not found: {video_path}")
+    for track in tracks:
+        if not Path(track.audio_path).exists():
+            raise FileNotFoundError(f"Audio not found for {track.lang}: {track.audio_path}")
+
+    print(f"📦 Packaging {len(tracks)} language(s) into {output_path.name}...")
+    _run_ffmpeg(build_package_command(video_path, tracks, output_path, dubbing_strategy, orig_duck, subtitle_codec))
+    return output_path
+
+
+def render_final(
+    video_path: Path | str,
+    audio_path: Path | str | None,
+    output_path: Path | str,
+    subtitle_path: Path | str,
+    sub_style: Optional[SubtitleStyle] = None,
+    mobile_optimized: bool = False,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+) -> Path:
+    """
+    Apply the dubbed audio (if any) and burn subtitles in a single ffmpeg pass.
+    Long videos are burned in parallel chunks when ``parallel_burn`` is enabled;
+    the chunks are then joined and the audio muxed in one stream-copy call.
+    """
+    video_path = Path(video_path)
+    output_path = Path(output_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video not found: {video_path}")
+    if audio_path and not Path(audio_path).exists():
+        raise FileNotFoundError(f"Audio not found: {audio_path}")
+
+    if parallel_burn.SETTINGS.applies_to(get_audio_duration(video_path)):
+        with tempfile.TemporaryDirectory(prefix=".burn_", dir=output_path.parent) as work_dir:
+            concat_list = parallel_burn.burn_chunks(video_path, subtitle_path, work_dir, sub_style, mobile_optimized)
+            with streaming_output.writing(output_path):
+                _run_ffmpeg(build_concat_command(concat_list, video_path, audio_path, output_path, dubbing_strategy, orig_duck))
         return output_path
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"FFmpeg failed:\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
-    
+
+    sub_filter = build_subtitle_filter(video_path, subtitle_path, sub_style, mobile_optimized)
+    print("🔥 Rendering final video (audio + subtitles in one pass)...")
+    with streaming_output.writing(output_path):
+        _run_ffmpeg(build_final_command(video_path, audio_path, output_path, sub_filter, dubbing_strategy, orig_duck))
+    return output_path
+
+
+@dataclass(frozen=True)
+class PreviewSettings:
+    """Proxy render for review: small frame, fast encoder settings, low-bitrate audio."""
+
+    kind: str = "video"  # video: proxy MP4 with burned subtitles; audio: Opus only, subtitles stay a sidecar
+    height: int = 360
+    crf: int = 32
+    preset: str = "ultrafast"
+    audio_bitrate: str = "64k"
+
+    @property
+    def extension(self) -> str:
+        return ".ogg" if self.kind == "audio" else ".mp4"
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Mapping] = None) -> "PreviewSettings":
+        cfg = cfg or {}
+        return cls(
+            kind=str(cfg.get("kind", "video")).lower(),
+            height=int(cfg.get("height", 360)),
+            crf=int(cfg.get("crf", 32)),
+            preset=str(cfg.get("preset", "ultrafast")),
+            audio_bitrate=str(cfg.get("audio_bitrate", "64k")),
+        )
+
+
+def build_preview_command(
+    video_path: Path | str,
+    audio_path: Path | str | None,
+    output_path: Path | str,
+    settings: PreviewSettings,
+    subtitle_filter: Optional[str] = None,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+) -> List[str]:
+    """
+    One ffmpeg invocation for a review proxy: the same audio graph as the final render,
+    with the video scaled down before the subtitle burn and encoded with cheap settings,
+    or no video at all for an audio-only (Opus) preview.
+    """
+    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
+    graph: List[str] = []
+    if audio_path:
+        cmd += ["-i", str(audio_path)]
+        graph.append(_audio_graph(dubbing_strategy, get_audio_duration(video_path), orig_duck))
+    audio_map = "[aout]" if audio_path else "0:a:0"
+
+    if settings.kind == "audio":
+        if graph:
+            cmd += ["-filter_complex", ";".join(graph)]
+        cmd += ["-map", audio_map, "-vn", "-c:a", "libopus", "-b:a", settings.audio_bitrate, str(output_path)]
+        return cmd
+
+    video_chain = f"[0:v]scale=-2:{settings.height}"
+    if subtitle_filter:
+        # original_size keeps the subtitle layout of the full-size render on the small frame
+        video_chain += f",{subtitle_filter}"
+    graph.append(f"{video_chain}[vout]")
+    cmd += ["-filter_complex", ";".join(graph), "-map", "[vout]", "-map", audio_map]
+    cmd += ["-c:v", "libx264", "-crf", str(settings.crf), "-preset", settings.preset]
+    cmd += ["-c:a", "aac", "-b:a", settings.audio_bitrate, "-movflags", "+faststart", str(output_path)]
+    return cmd
+
+
+def render_preview(
+    video_path: Path | str,
+    audio_path: Path | str | None,
+    output_path: Path | str,
+    settings: PreviewSettings,
+    subtitle_path: Path | str | None = None,
+    sub_style: Optional[SubtitleStyle] = None,
+    mobile_optimized: bool = False,
+    dubbing_strategy: str = "default",
+    orig_duck: float = 0.2,
+) -> Path:
+    """Low-resolution, low-bitrate proxy of the final render, for review before the full encode."""
+    video_path = Path(video_path)
+    output_path = Path(output_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video not found: {video_path}")
+    if audio_path and not Path(audio_path).exists():
+        raise FileNotFoundError(f"Audio not found: {audio_path}")
+
+    sub_filter = None
+    if settings.kind != "audio" and sub_style is not None and subtitle_path is not None:
+        sub_filter = build_subtitle_filter(video_path, subtitle_path, sub_style, mobile_optimized)
+    print(f"👀 Rendering {settings.kind} preview {output_path.name}...")
+    _run_ffmpeg(build_preview_command(video_path, audio_path, output_path, settings, sub_filter, dubbing_strategy, orig_duck))
+    return output_path
+
 
 def final(
     video_path: Path | str,
@@ -100,8 +385,24 @@ def final(
 ) -> None:
     """
     Replace video's audio stream with dubbed audio or add voice-over, then burn subtitles.
+    With subtitles both happen in one pass straight into ``output_path`` and
+    ``dubbed_path`` is not written; without them only ``dubbed_path`` is written.
     """
-    if dubbed_path != video_path:
+    replace_audio = str(dubbed_path) != str(video_path)
+    if sub_style is not None and subtitle_path is not None:
+        render_final(
+            video_path=video_path,
+            audio_path=audio_path if replace_audio else None,
+            output_path=output_path,
+            subtitle_path=subtitle_path,
+            sub_style=sub_style,
+            mobile_optimized=mobile_optimized,
+            dubbing_strategy=dubbing_strategy,
+            orig_duck=orig_duck,
+        )
+        return
+
+    if replace_audio:
         apply_audio_to_video(
             video_path=video_path,
             audio_path=audio_path,
@@ -109,12 +410,3 @@ def final(
             dubbing_strategy=dubbing_strategy,
             orig_duck=orig_duck,
         )
-
-    if sub_style is not None and subtitle_path is not None:
-        burn_subtitles_to_video(
-        video_path=dubbed_path,  # dubbed video
-        subtitle_path=subtitle_path,  # SRT/ASS file
-        output_path=output_path,  # Final output path
-        style=sub_style,
-        mobile=mobile_optimized
-    )
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Cached media probing.
+
+Every consumer that needs a duration, stream layout, sample rate, channel
+count or video resolution goes through ``MEDIA_INFO``. A file is probed once
+(``soundfile`` for PCM/FLAC/OGG, a single ``ffprobe -show_streams -show_format``
+JSON call for everything else) and the result is cached by resolved path,
+keyed on size and mtime so rewritten files are probed again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+FFPROBE_TIMEOUT_SECONDS = 30
+
+
+class MediaProbeError(RuntimeError):
+    """Raised when a file cannot be probed."""
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    index: int
+    codec_type: str
+    codec_name: str = ""
+    sample_rate: int = 0
+    channels: int = 0
+    width: int = 0
+    height: int = 0
+    duration: float = 0.0
+    attached_pic: bool = False
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    path: str
+    duration: float
+    format_name: str = ""
+    streams: Tuple[StreamInfo, ...] = field(default_factory=tuple)
+
+    @property
+    def audio_streams(self) -> Tuple[StreamInfo, ...]:
+        return tuple(s for s in self.streams if s.codec_type == "audio")
+
+    @property
+    def video_streams(self) -> Tuple[StreamInfo, ...]:
+        # Cover art in audio containers is reported as a video stream; it is not a video
+        return tuple(s for s in self.streams if s.codec_type == "video" and not s.attached_pic)
+
+    @property
+    def has_audio(self) -> bool:
+        return bool(self.audio_streams)
+
+    @property
+    def has_video(self) -> bool:
+        return bool(self.video_streams)
+
+    @property
+    def sample_rate(self) -> int:
+        audio = self.audio_streams
+        return audio[0].sample_rate if audio else 0
+
+    @property
+    def channels(self) -> int:
+        audio = self.audio_streams
+        return audio[0].channels if audio else 0
+
+    @property
+    def resolution(self) -> Optional[Tuple[int, int]]:
+        video = self.video_streams
+        if video and video[0].width > 0 and video[0].height > 0:
+            return video[0].width, video[0].height
+        return None
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _probe_soundfile(path: Path) -> MediaInfo:
+    info = sf.info(str(path))
+    stream = StreamInfo(
+        index=0,
+        codec_type="audio",
+        codec_name=info.subtype.lower(),
+        sample_rate=info.samplerate,
+        channels=info.channels,
+        duration=float(info.duration),
+    )
+    return MediaInfo(path=str(path), duration=float(info.duration), format_name=info.format.lower(), streams=(stream,))
+
+
+def _probe_ffprobe(path: Path) -> MediaInfo:
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_streams", "-show_format",
+        "-of", "json",
+        str(path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=FFPROBE_TIMEOUT_SECONDS)
+        payload = json.loads(result.stdout or "{}")
+    except (OSError, subprocess.SubprocessError, json.JSONDecodeError) as exc:
+        raise MediaProbeError(f"ffprobe failed for {path}: {exc}") from exc
+
+    streams = tuple(
+        StreamInfo(
+            index=_to_int(stream.get("index")),
+            codec_type=str(stream.get("codec_type") or ""),
+            codec_name=str(stream.get("codec_name") or ""),
+            sample_rate=_to_int(stream.get("sample_rate")),
+            channels=_to_int(stream.get("channels")),
+            width=_to_int(stream.get("width")),
+            height=_to_int(stream.get("height")),
+            duration=_to_float(stream.get("duration")),
+            attached_pic=bool((stream.get("disposition") or {}).get("attached_pic")),
+        )
+        for stream in payload.get("streams") or []
+    )
+    fmt = payload.get("format") or {}
+    duration = _to_float(fmt.get("duration")) or max((s.duration for s in streams), default=0.0)
+    return MediaInfo(path=str(path), duration=duration, format_name=str(fmt.get("format_name") or ""), streams=streams)
+
+
+class MediaInfoService:
+    """Probe-once cache of :class:`MediaInfo`, invalidated when a file's size or mtime changes."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], MediaInfo]]" = OrderedDict()
+        self.probes = 0
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[str, Tuple[int, int]]:
+        stat = os.stat(path)
+        return str(path.resolve()), (stat.st_size, stat.st_mtime_ns)
+
+    def probe(self, path: Union[str, Path]) -> MediaInfo:
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Media file not found: {path}")
+        key, signature = self._signature(path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        try:
+            info = _probe_soundfile(path)
+        except (RuntimeError, sf.LibsndfileError):
+            info = _probe_ffprobe(path)
+        with self._lock:
+            self.probes += 1
+        self._store(key, signature, info)
+        return info
+
+    def record(self, path: Union[str, Path], info: MediaInfo) -> None:
+        """Register properties of a file the caller just wrote, so it is never probed."""
+        path = Path(path)
+        key, signature = self._signature(path)
+        self._store(key, signature, info)
+
+    def record_audio(self, path: Union[str, Path], duration: float, sample_rate: int, channels: int) -> None:
+        stream = StreamInfo(index=0, codec_type="audio", sample_rate=sample_rate, channels=channels, duration=duration)
+        self.record(path, MediaInfo(path=str(path), duration=duration, format_name="wav", streams=(stream,)))
+
+    def forget(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            self._entries.pop(str(Path(path).resolve()), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, signature: Tuple[int, int], info: MediaInfo) -> None:
+        with self._lock:
+            self._entries[key] = (signature, info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+MEDIA_INFO = MediaInfoService()
+
+
+def probe_media(path: Union[str, Path]) -> MediaInfo:
+    return MEDIA_INFO.probe(path)
+
+
+def get_audio_duration(audio_path: Union[str, Path]) -> float:
+    """
+    Get duration of audio/video file in seconds.
+    Served from the media info cache; the file is only probed when new or modified.
+    """
+    return MEDIA_INFO.probe(audio_path).duration
@@ -0,0 +1,180 @@
+"""
+Subtitle burn-in spread over several ffmpeg processes.
+
+One libx264 encode of a long video does not scale much past a few threads, so
+the video stream is split with stream copy at keyframes into N chunks (ffmpeg's
+segment muxer cuts at the first keyframe after each requested time), each chunk
+is burned in its own ffmpeg process with an ASS file shifted to the chunk's
+start, and the burned chunks are joined again with the concat demuxer. The
+caller muxes the audio while concatenating, so no full-length intermediate
+video is written.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Mapping, Optional, Tuple, Union
+
+from .media_info import get_audio_duration
+from .subtitles_handling import SubtitleStyle, _ensure_ass, build_subtitle_filter
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class BurnSettings:
+    enabled: bool = False
+    chunks: int = 0  # 0 = one chunk per core
+    preset: str = "veryfast"
+    crf: int = 23
+    min_video_seconds: float = 120.0  # shorter videos are burned in one process
+    min_chunk_seconds: float = 20.0
+
+    def chunk_count(self, duration: float) -> int:
+        wanted = self.chunks or os.cpu_count() or 1
+        return max(1, min(wanted, int(duration // max(self.min_chunk_seconds, 1.0))))
+
+    def applies_to(self, duration: float) -> bool:
+        return self.enabled and duration >= self.min_video_seconds and self.chunk_count(duration) > 1
+
+
+SETTINGS = BurnSettings()
+
+
+def configure(cfg: Optional[Mapping] = None) -> BurnSettings:
+    """Read the ``subtitles.parallel_burn`` config section."""
+    global SETTINGS
+    cfg = cfg or {}
+    SETTINGS = BurnSettings(
+        enabled=bool(cfg.get("enabled", False)),
+        chunks=int(cfg.get("chunks", 0) or 0),
+        preset=str(cfg.get("preset", "veryfast")),
+        crf=int(cfg.get("crf", 23)),
+        min_video_seconds=float(cfg.get("min_video_seconds", 120.0)),
+        min_chunk_seconds=float(cfg.get("min_chunk_seconds", 20.0)),
+    )
+    return SETTINGS
+
+
+def _ass_time(value: str) -> float:
+    hours, minutes, seconds = value.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _format_ass_time(seconds: float) -> str:
+    centis = int(round(max(0.0, seconds) * 100))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def shift_ass(source: PathLike, destination: PathLike, start: float, end: float) -> Path:
+    """
+    Copy of an ASS file holding only the events visible in [start, end), with their
+    times moved so ``start`` becomes zero. Headers and styles are kept as they are.
+    """
+    lines: List[str] = []
+    for line in Path(source).read_text(encoding="utf-8-sig").splitlines():
+        if not line.startswith("Dialogue:"):
+            lines.append(line)
+            continue
+        # Dialogue: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+        fields = line[len("Dialogue:"):].split(",", 9)
+        event_start, event_end = _ass_time(fields[1]), _ass_time(fields[2])
+        if event_end <= start or event_start >= end:
+            continue
+        fields[1] = _format_ass_time(event_start - start)
+        fields[2] = _format_ass_time(event_end - start)
+        lines.append("Dialogue:" + ",".join(fields))
+    destination = Path(destination)
+    destination.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return destination
+
+
+def _run(cmd: List[str], what: str) -> None:
+    try:
+        subprocess.run(cmd, check=True, text=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to {what}:\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
+
+
+def split_at_keyframes(video_path: PathLike, work_dir: Path, chunks: int) -> List[Tuple[Path, float, float]]:
+    """Stream-copy the video track into about ``chunks`` pieces; returns (path, start, end) per piece."""
+    duration = get_audio_duration(video_path)
+    cut_times = ",".join(f"{duration * i / chunks:.3f}" for i in range(1, chunks))
+    segment_list = work_dir / "chunks.csv"
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-i", str(video_path),
+            "-map", "0:v:0", "-c", "copy",
+            "-f", "segment",
+            "-segment_times", cut_times,
+            "-reset_timestamps", "1",
+            "-segment_list", str(segment_list),
+            "-segment_list_type", "csv",
+            str(work_dir / "source_%03d.mkv"),
+        ],
+        "split video at keyframes",
+    )
+    with segment_list.open(newline="") as handle:
+        return [(work_dir / name, float(start), float(end)) for name, start, end in csv.reader(handle)]
+
+
+def burn_chunks(
+    video_path: PathLike,
+    subtitle_path: PathLike,
+    work_dir: PathLike,
+    style: Optional[SubtitleStyle] = None,
+    mobile: bool = False,
+    fonts_dir: Optional[str] = None,
+    settings: Optional[BurnSettings] = None,
+) -> Path:
+    """
+    Burn ``subtitle_path`` into the video track of ``video_path`` chunk by chunk, one
+    ffmpeg process per chunk. Returns a concat-demuxer list of the burned chunks
+    (video only) inside ``work_dir``.
+    """
+    settings = settings or SETTINGS
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    ass_path = _ensure_ass(Path(subtitle_path))
+    pieces = split_at_keyframes(video_path, work_dir, settings.chunk_count(get_audio_duration(video_path)))
+    threads = max(1, (os.cpu_count() or 1) // len(pieces))
+
+    def burn(index: int) -> Path:
+        source, start, end = pieces[index]
+        chunk_ass = shift_ass(ass_path, work_dir / f"subs_{index:03d}.ass", start, end)
+        # Sized against the full video so every chunk gets the same style scaling
+        sub_filter = build_subtitle_filter(video_path, chunk_ass, style, mobile, fonts_dir)
+        burned = work_dir / f"burned_{index:03d}.mp4"
+        _run(
+            [
+                "ffmpeg", "-y",
+                "-i", str(source),
+                "-vf", sub_filter,
+                "-c:v", "libx264", "-crf", str(settings.crf), "-preset", settings.preset,
+                "-threads", str(threads),
+                "-an",
+                str(burned),
+            ],
+            f"burn subtitles into chunk {index}",
+        )
+        return burned
+
+    print(f"🔥 Burning subtitles in {len(pieces)} parallel chunks...")
+    with ThreadPoolExecutor(max_workers=len(pieces)) as pool:
+        burned = list(pool.map(burn, range(len(pieces))))
+
+    concat_list = work_dir / "burned.txt"
+    concat_list.write_text("".join(f"file '{path.name}'\n" for path in burned), encoding="utf-8")
+    return concat_list
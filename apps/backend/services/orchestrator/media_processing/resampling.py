@@ -0,0 +1,206 @@
+"""
+Sample-rate conversion for the whole audio pipeline.
+
+TTS models render at their native rate (24 kHz, 22.05 kHz for the vocoder),
+the master track is 44.1 kHz and VAD/ASR work at 16 kHz. Every conversion goes
+through :data:`RESAMPLER`, which uses soxr when it is installed and otherwise a
+polyphase filter designed once per rate pair. Segment files converted to a
+run's working rate are written once into a cache area (``<root>/<xx>/<key>/``,
+evicted by the cache manager) and reused by every later pass (timeline render,
+background mix) instead of being resampled again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import Counter
+from functools import lru_cache
+from math import gcd
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from .media_info import MEDIA_INFO
+
+logger = logging.getLogger(__name__)
+
+ENTRY_FILE = "resampled.wav"
+DEFAULT_QUALITY = "HQ"
+POLYPHASE_HALF_LENGTH = 10  # taps per side per unit of max(up, down), as in scipy.signal.resample_poly
+POLYPHASE_KAISER_BETA = 5.0
+
+PathLike = Union[str, Path]
+
+
+def negotiate_working_rate(source_rates: Iterable[Optional[int]], output_rate: Optional[int] = None) -> int:
+    """
+    Canonical sample rate for one run's timeline.
+
+    The output target wins when it is known, so the long master/background track is
+    never converted and each segment is converted once on its way onto the timeline.
+    Without one, the most common segment rate (the TTS model's native rate) is kept
+    and nothing is converted at all.
+    """
+    if output_rate:
+        return int(output_rate)
+    counts = Counter(int(rate) for rate in source_rates if rate)
+    if not counts:
+        raise ValueError("No sample rate to negotiate from")
+    return counts.most_common(1)[0][0]
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    Anti-aliasing FIR for an up/down pair, designed once and reused. The taps are
+    unscaled: ``resample_poly`` applies the ``up`` gain itself.
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = POLYPHASE_HALF_LENGTH * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", POLYPHASE_KAISER_BETA))
+    return taps.astype(np.float64)
+
+
+def _rate_ratio(source_sr: int, target_sr: int) -> Tuple[int, int]:
+    divisor = gcd(int(source_sr), int(target_sr))
+    return int(target_sr) // divisor, int(source_sr) // divisor
+
+
+class PolyphaseStream:
+    """
+    Block-by-block polyphase converter used when soxr is missing. Same interface as
+    ``soxr.ResampleStream`` and the same output as one ``resample_poly`` call over
+    the whole signal: only the input still needed by the filter is kept between
+    blocks, and output is held back until the filter's right half has been seen.
+    """
+
+    def __init__(self, source_sr: int, target_sr: int, channels: int = 1) -> None:
+        self.up, self.down = _rate_ratio(source_sr, target_sr)
+        self.channels = channels
+        taps = _polyphase_filter(self.up, self.down) * self.up
+        self._taps = taps.astype(np.float32)
+        self._half_len = (len(taps) - 1) // 2
+        self._width = 2 * self._half_len // self.up + 2
+        self._buffer = np.zeros((0, channels), dtype=np.float32)
+        self._buffer_start = 0  # absolute input index of _buffer[0]
+        self._received = 0
+        self._emitted = 0
+
+    def _first_input(self, m: np.ndarray) -> np.ndarray:
+        return -((self._half_len - m * self.down) // self.up)  # ceil((m*down - half_len) / up)
+
+    def resample_chunk(self, x: np.ndarray, last: bool = False) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        mono = x.ndim == 1
+        self._buffer = np.concatenate([self._buffer, x.reshape(len(x), self.channels)])
+        self._received += len(x)
+
+        if last:
+            end = -(-self._received * self.up // self.down)
+        else:
+            # Outputs whose last contributing input has arrived
+            end = max(self._emitted, ((self._received - 1) * self.up - self._half_len) // self.down + 1)
+        m = np.arange(self._emitted, end, dtype=np.int64)
+        out = np.zeros((len(m), self.channels), dtype=np.float32)
+        if len(m):
+            n = self._first_input(m)[:, None] + np.arange(self._width)
+            k = self._half_len + m[:, None] * self.down - n * self.up
+            valid = (k >= 0) & (k < len(self._taps)) & (n >= 0) & (n < self._received)
+            weights = np.where(valid, self._taps[np.clip(k, 0, len(self._taps) - 1)], 0.0)
+            rows = np.clip(n - self._buffer_start, 0, max(len(self._buffer) - 1, 0))
+            if len(self._buffer):
+                out = np.einsum("mk,mkc->mc", weights, self._buffer[rows]).astype(np.float32)
+        self._emitted = end
+
+        keep_from = max(self._buffer_start, int(self._first_input(np.array([end]))[0]))
+        self._buffer = self._buffer[keep_from - self._buffer_start:]
+        self._buffer_start = keep_from
+        return out[:, 0] if mono and self.channels == 1 else out
+
+
+class Resampler:
+    def __init__(self, quality: str = DEFAULT_QUALITY) -> None:
+        self.quality = quality
+        self.cache_root: Optional[Path] = None
+        self._on_lookup: Optional[Callable[[bool, Path], None]] = None
+        self._lock = threading.Lock()
+        self.conversions = 0
+
+    def configure(
+        self,
+        quality: str = DEFAULT_QUALITY,
+        cache_root: Optional[Path] = None,
+        on_lookup: Optional[Callable[[bool, Path], None]] = None,
+    ) -> None:
+        """``cache_root`` holds converted files (a system temp dir when unset); ``on_lookup`` sees every file lookup."""
+        self.quality = quality
+        self.cache_root = Path(cache_root) if cache_root is not None else None
+        self._on_lookup = on_lookup
+
+    def resample(self, data: np.ndarray, source_sr: int, target_sr: int) -> np.ndarray:
+        """Convert (frames,) or (frames, channels) float audio; a no-op at equal rates."""
+        if source_sr == target_sr or len(data) == 0:
+            return data
+        try:
+            import soxr
+        except ImportError:
+            from scipy.signal import resample_poly
+
+            up, down = _rate_ratio(source_sr, target_sr)
+            out = resample_poly(data, up, down, axis=0, window=_polyphase_filter(up, down))
+        else:
+            out = soxr.resample(data, source_sr, target_sr, quality=self.quality)
+        with self._lock:
+            self.conversions += 1
+        return out.astype(data.dtype, copy=False)
+
+    def stream(self, source_sr: int, target_sr: int, channels: int = 1):
+        """Chunked converter with ``resample_chunk(x, last=False)``, for audio read block by block."""
+        try:
+            import soxr
+        except ImportError:
+            return PolyphaseStream(source_sr, target_sr, channels)
+        return soxr.ResampleStream(source_sr, target_sr, channels, dtype="float32", quality=self.quality)
+
+    def resample_file(self, path: PathLike, target_sr: int) -> str:
+        """
+        Path of ``path`` at ``target_sr``: the file itself when it already has that rate,
+        otherwise a converted copy in the cache area that is written once per source
+        file version, rate and quality and reused afterwards.
+        """
+        path = Path(path)
+        info = MEDIA_INFO.probe(path)
+        if info.sample_rate == target_sr:
+            return str(path)
+        stat = path.stat()
+        key = hashlib.sha1(
+            repr((str(path.resolve()), stat.st_size, stat.st_mtime_ns, int(target_sr), self.quality)).encode("utf-8")
+        ).hexdigest()
+        root = self.cache_root or Path(tempfile.gettempdir()) / "resampled_segments"
+        entry = root / key[:2] / key
+        target = entry / ENTRY_FILE
+        hit = target.exists()
+        if self._on_lookup is not None:
+            self._on_lookup(hit, entry)
+        if not hit:
+            data, source_sr = sf.read(str(path), dtype="float32", always_2d=True)
+            converted = self.resample(data, source_sr, target_sr)
+            entry.mkdir(parents=True, exist_ok=True)
+            # Write under a unique name and rename, so concurrent passes never read a partial file
+            partial = entry / f".{uuid.uuid4().hex}.tmp.wav"
+            sf.write(str(partial), converted, target_sr, subtype="FLOAT")
+            os.replace(partial, target)
+            MEDIA_INFO.record_audio(target, len(converted) / target_sr, target_sr, converted.shape[1])
+        return str(target)
+
+
+RESAMPLER = Resampler()
@@ -0,0 +1,125 @@
+"""
+Progressive output for the final mux/encode.
+
+By default the final MP4 is written with ``+faststart``, which moves the index
+to the front in a second pass over the finished file, so nothing is playable
+before the render ends. With streaming enabled the final ffmpeg call writes:
+
+* ``fmp4`` - a fragmented MP4 (``empty_moov`` plus one fragment per keyframe
+  interval) that is playable while it grows, with no second pass;
+* ``hls``  - the same fragmented MP4 plus an HLS event playlist with fMP4
+  segments in ``<stem>_hls/`` (via the tee muxer), which a player can start
+  on as soon as the first segment is listed.
+
+Outputs being written are tracked so ``/api/outputs`` can report them as partial.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Mapping, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+STREAM_DIR_SUFFIX = "_hls"
+PLAYLIST_FILE = "index.m3u8"
+FRAGMENTED_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+
+@dataclass(frozen=True)
+class StreamingSettings:
+    enabled: bool = False
+    format: str = "hls"  # hls | fmp4
+    segment_seconds: float = 4.0
+
+
+SETTINGS = StreamingSettings()
+
+_writing: Set[str] = set()
+_writing_lock = threading.Lock()
+
+
+def configure(cfg: Optional[Mapping] = None) -> StreamingSettings:
+    """Read the ``finalize_media.streaming`` config section."""
+    global SETTINGS
+    cfg = cfg or {}
+    fmt = str(cfg.get("format", "hls")).lower()
+    if fmt not in ("hls", "fmp4"):
+        raise ValueError(f"Unknown streaming format '{fmt}' (expected 'hls' or 'fmp4')")
+    SETTINGS = StreamingSettings(
+        enabled=bool(cfg.get("enabled", False)),
+        format=fmt,
+        segment_seconds=float(cfg.get("segment_seconds", 4.0)),
+    )
+    return SETTINGS
+
+
+def stream_dir(output_path: PathLike) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}{STREAM_DIR_SUFFIX}")
+
+
+def output_args(output_path: PathLike, settings: Optional[StreamingSettings] = None) -> List[str]:
+    """Muxer arguments that end an ffmpeg command writing the final MP4 at ``output_path``."""
+    settings = settings or SETTINGS
+    output_path = Path(output_path)
+    if not settings.enabled:
+        return ["-movflags", "+faststart", str(output_path)]
+    fragment_us = str(int(settings.segment_seconds * 1_000_000))
+    if settings.format == "fmp4":
+        return ["-movflags", FRAGMENTED_MOVFLAGS, "-frag_duration", fragment_us, str(output_path)]
+
+    segments = stream_dir(output_path)
+    segments.mkdir(parents=True, exist_ok=True)
+    hls = (
+        f"[f=hls:hls_time={settings.segment_seconds:g}:hls_playlist_type=event:hls_segment_type=fmp4"
+        f":hls_segment_filename={segments / 'segment_%05d.m4s'}]{segments / PLAYLIST_FILE}"
+    )
+    mp4 = f"[f=mp4:movflags={FRAGMENTED_MOVFLAGS}:frag_duration={fragment_us}]{output_path}"
+    return ["-f", "tee", f"{mp4}|{hls}"]
+
+
+@contextmanager
+def writing(output_path: PathLike) -> Iterator[None]:
+    """Mark ``output_path`` (and its playlist) as partial while the render runs."""
+    key = str(Path(output_path).resolve())
+    with _writing_lock:
+        _writing.add(key)
+    try:
+        yield
+    finally:
+        with _writing_lock:
+            _writing.discard(key)
+
+
+def is_writing(path: PathLike) -> bool:
+    """Whether ``path`` is an output, or a file of an output's HLS stream, that is still being rendered."""
+    path = Path(path).resolve()
+    candidates = {str(path)}
+    if path.parent.name.endswith(STREAM_DIR_SUFFIX):
+        stem = path.parent.name[: -len(STREAM_DIR_SUFFIX)]
+        candidates.add(str(path.parent.with_name(f"{stem}.mp4")))
+    with _writing_lock:
+        return bool(candidates & _writing)
+
+
+def playlist_ready(playlist: PathLike) -> bool:
+    """A playlist can be handed to a player once ffmpeg has listed its first segment."""
+    try:
+        return "#EXTINF" in Path(playlist).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return False
+
+
+def playlist_complete(playlist: PathLike) -> bool:
+    """An event playlist is final once ffmpeg has appended ``#EXT-X-ENDLIST``."""
+    try:
+        return "#EXT-X-ENDLIST" in Path(playlist).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return False
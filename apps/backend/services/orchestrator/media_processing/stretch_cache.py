@@ -0,0 +1,114 @@
+"""
+Content-addressed cache of stretched segments.
+
+A stretch is identified by the digest of the input file, the exact target
+length in samples, the sample rate and the stretch policy, so re-renders and
+review regenerations that send an unchanged segment through the same timing
+get the stored result instead of running the engine again. Entries live at
+``<root>/<xx>/<key>/stretched.wav``; eviction is left to the cache manager,
+which is told about every lookup through ``on_lookup``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+import soundfile as sf
+
+from .media_info import MEDIA_INFO
+
+if TYPE_CHECKING:
+    from .batch_stretch import StretchJob
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+ENTRY_FILE = "stretched.wav"
+
+
+def file_digest(path: Path) -> str:
+    hasher = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class StretchCache:
+    """Disabled until :meth:`configure` gives it a root directory."""
+
+    def __init__(self) -> None:
+        self.root: Optional[Path] = None
+        self._on_lookup: Optional[Callable[[bool, Path], None]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, root: Optional[Path], on_lookup: Optional[Callable[[bool, Path], None]] = None) -> None:
+        self.root = Path(root) if root is not None else None
+        self._on_lookup = on_lookup
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def key(self, job: "StretchJob") -> str:
+        payload = json.dumps(
+            {
+                "input": file_digest(Path(job.input_path)),
+                "target_samples": job.target_samples,
+                "sample_rate": MEDIA_INFO.probe(job.input_path).sample_rate,
+                "policy": dataclasses.asdict(job.policy),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def fetch(self, key: str, output_path: str) -> Optional[Tuple[int, int, int]]:
+        """Copy a cached stretch to ``output_path``; returns (frames, sample_rate, channels), None on a miss."""
+        entry = self._entry(key)
+        cached = entry / ENTRY_FILE
+        hit = cached.exists()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self._on_lookup is not None:
+            self._on_lookup(hit, entry)
+        if not hit:
+            return None
+        try:
+            info = sf.info(str(cached))
+            shutil.copyfile(cached, output_path)
+        except (OSError, RuntimeError) as exc:
+            logger.warning("Discarding unreadable stretch cache entry %s: %s", entry, exc)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        return info.frames, info.samplerate, info.channels
+
+    def store(self, key: str, output_path: str) -> None:
+        entry = self._entry(key)
+        try:
+            entry.mkdir(parents=True, exist_ok=True)
+            # Write under a unique name and rename, so readers never see a partial file
+            partial = entry / f".{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(output_path, partial)
+            os.replace(partial, entry / ENTRY_FILE)
+        except OSError as exc:
+            logger.warning("Could not store stretch cache entry %s: %s", entry, exc)
+
+
+STRETCH_CACHE = StretchCache()
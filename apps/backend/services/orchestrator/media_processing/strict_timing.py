@@ -1,21 +1,14 @@
 from __future__ import annotations
-import contextlib
-import json
 import logging
-import os
 import shutil
-import subprocess
-import sys
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple
 
-import librosa
-import numpy as np
-import soundfile as sf
-import torch
-import torchaudio
-import pyrubberband as prb
+from .batch_stretch import StretchJob, run_stretch_jobs
+from .media_info import get_audio_duration
+from .time_stretch import policy_for, stretch_file
+from .timeline_renderer import Placement, render_timeline
 
 logger = logging.getLogger(__name__)
 
@@ -50,115 +43,25 @@ def validate_speed_ratio(ratio: float) -> float:
 # HELPER FUNCTIONS (needed by strict timing)
 # ============================================================
 
-def get_audio_duration(audio_path: Union[str, Path]) -> float:
+def rubberband_to_duration(in_wav, target_ms, out_wav, stretch_tier: Optional[str] = None):
     """
-    Get duration of audio/video file in seconds.
-    Uses soundfile for audio, falls back to ffprobe for video formats.
-    """
-    audio_path = Path(audio_path)
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
-    
-    try:
-        # Try soundfile first (faster for audio files)
-        info = sf.info(str(audio_path))
-        return float(info.duration)
-    except Exception as sf_error:
-        # Fallback to ffprobe for video files or unsupported formats
-        try:
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    str(audio_path)
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10
-            )
-            return float(result.stdout.strip())
-        except Exception as ffprobe_error:
-            logger.error(f"Failed to get duration for {audio_path}")
-            logger.error(f"  soundfile error: {sf_error}")
-            logger.error(f"  ffprobe error: {ffprobe_error}")
-            raise
-
-
-def rubberband_to_duration(in_wav, target_ms, out_wav):
-    """
-    Adjust audio duration using Rubberband with high-quality settings.
+    Adjust audio duration with the time-stretch engine selected for ``stretch_tier``.
     Includes validation and error handling.
     """
-    in_wav_path = str(in_wav) if isinstance(in_wav, Path) else in_wav
-    
-    try:
-        y, sr = sf.read(in_wav_path, always_2d=False, dtype="float32")
-    except Exception as e:
-        logger.error(f"Failed to read audio file {in_wav_path}: {e}")
-        # Copy original as fallback
-        shutil.copy(in_wav, out_wav)
-        return out_wav
-
     # Validate target duration
     if target_ms < MIN_SEGMENT_DURATION_MS:
         logger.error(f"Invalid target duration {target_ms}ms < {MIN_SEGMENT_DURATION_MS}ms, copying original")
         shutil.copy(in_wav, out_wav)
         return out_wav
 
-    # Compute target and current samples
-    target_samples = int(round(target_ms * sr / 1000))
-    current_samples = y.shape[0]
-    
-    # Validate target_samples to prevent division by zero
-    if target_samples <= 0:
-        logger.error(f"Invalid target_samples {target_samples} for {target_ms}ms, copying original")
-        shutil.copy(in_wav, out_wav)
-        return out_wav
-    
-    rate = current_samples / target_samples
-
-    logger.debug(f"Rubberband: {current_samples/sr:.3f}s → {target_ms/1000:.3f}s (rate={rate:.3f}x)")
-
-    # Time-stretch using pyrubberband with error handling
     try:
-        y2 = prb.time_stretch(
-            y,
-            sr,
-            rate,
-            rbargs={
-                "--formant": "",    # Preserve formant (voice character) - verified flag
-                "--pitch-hq": ""    # High quality pitch preservation - verified flag
-                # Removed --precise and --tempo for compatibility
-            }
-        )
+        samples, sr, _ = stretch_file(in_wav, None, out_wav, policy_for(stretch_tier), target_ms=target_ms)
     except Exception as e:
-        logger.error(f"Rubberband time_stretch failed: {e}, copying original audio")
+        logger.error(f"Time stretch failed for {in_wav}: {e}, copying original audio")
         shutil.copy(in_wav, out_wav)
         return out_wav
 
-    # Pad or trim to exact length
-    current_length = y2.shape[0] if y2.ndim > 1 else len(y2)
-    if current_length < target_samples:
-        pad = target_samples - current_length
-        if y2.ndim == 1:
-            y2 = np.concatenate([y2, np.zeros(pad, dtype=y2.dtype)])
-        else:
-            y2 = np.vstack([y2, np.zeros((pad, y2.shape[1]), dtype=y2.dtype)])
-    elif current_length > target_samples:
-        if y2.ndim == 1:
-            y2 = y2[:target_samples]
-        else:
-            y2 = y2[:target_samples, :]
-
-    try:
-        sf.write(out_wav, y2, sr)
-    except Exception as e:
-        logger.error(f"Failed to write output file {out_wav}: {e}")
-        raise
-    
+    logger.debug(f"Stretched {in_wav} → {samples / sr:.3f}s")
     return out_wav
 
 
@@ -167,19 +70,44 @@ def rubberband_to_duration(in_wav, target_ms, out_wav):
 # ============================================================
 
 
+def plan_segment_adjustment(
+    actual_duration: float,
+    expected_duration: float,
+    max_speed_ratio: float = 1.35,
+) -> Tuple[Optional[float], bool, float]:
+    """
+    Decide how a segment must be retimed to fit its slot.
+
+    Returns:
+        Tuple of (target_duration, quality_warning, speed_ratio). target_duration is
+        None when the segment already matches (within 1%) and can be used as is; when
+        the required compression exceeds max_speed_ratio it is limited to that ratio
+        and quality_warning is set.
+    """
+    speed_ratio = actual_duration / expected_duration
+    if abs(speed_ratio - 1.0) < 0.01:
+        return None, False, speed_ratio
+    if speed_ratio <= max_speed_ratio:
+        return expected_duration, False, speed_ratio
+    return actual_duration / max_speed_ratio, True, speed_ratio
+
+
 def adjust_segment_to_exact_timing(
     segment_audio_path: str,
     expected_start: float,
     expected_end: float,
     output_path: str,
     max_speed_ratio: float = 1.35,  # Don't exceed 35% speed change
-    logger: Optional[logging.Logger] = None
+    logger: Optional[logging.Logger] = None,
+    stretch_tier: Optional[str] = None,
 ) -> Tuple[str, bool, float]:
     """
     Force a segment to EXACTLY match its expected timing using speed adjustment.
     
     This is the core function for strict segment-by-segment synchronization.
     It ensures dubbed audio starts/ends at the exact same timestamps as the original.
+    Whole timelines should go through concatenate_audio_strict_timing, which
+    stretches all segments in one parallel batch.
     
     Args:
         segment_audio_path: Path to TTS-generated segment
@@ -188,6 +116,7 @@ def adjust_segment_to_exact_timing(
         output_path: Where to save adjusted segment
         max_speed_ratio: Maximum speed adjustment (1.35 = 35% faster/slower)
         logger: Optional logger instance
+        stretch_tier: Time-stretch quality tier (control_center.yaml time_stretch.tiers)
     
     Returns:
         Tuple of (adjusted_path, quality_warning, actual_speed_ratio)
@@ -205,69 +134,43 @@ def adjust_segment_to_exact_timing(
     
     expected_duration = expected_end - expected_start
     actual_duration = get_audio_duration(Path(segment_audio_path))
-    
-    speed_ratio = actual_duration / expected_duration
-    quality_warning = False
+    target_duration, quality_warning, speed_ratio = plan_segment_adjustment(
+        actual_duration, expected_duration, max_speed_ratio
+    )
     
     logger.debug(
         f"Segment timing: expected={expected_duration:.2f}s, "
         f"actual={actual_duration:.2f}s, ratio={speed_ratio:.2f}x"
     )
     
-    if abs(speed_ratio - 1.0) < 0.01:
+    if target_duration is None:
         # Already matches (within 1%), just copy
         shutil.copy(segment_audio_path, output_path)
         return output_path, False, speed_ratio
     
-    if speed_ratio <= max_speed_ratio:
-        # Acceptable - adjust speed to fit exactly
-        try:
-            rubberband_to_duration(
-                segment_audio_path, 
-                expected_duration * 1000,  # Convert to ms
-                output_path
-            )
-            
-            if speed_ratio > 1.2:
-                logger.info(
-                    f"   Compressed {speed_ratio:.2f}x to fit "
-                    f"{expected_duration:.2f}s (good quality)"
-                )
-            elif speed_ratio < 0.9:
-                logger.info(
-                    f"   Stretched {1/speed_ratio:.2f}x to fit "
-                    f"{expected_duration:.2f}s (good quality)"
-                )
-        except Exception as e:
-            logger.error(f"Failed to adjust segment timing: {e}")
-            shutil.copy(segment_audio_path, output_path)
-            quality_warning = True
-    else:
-        # Too much compression needed - warn and limit
+    if quality_warning:
+        _warn_speed_limited(speed_ratio, expected_duration, max_speed_ratio)
+    
+    job = StretchJob.for_duration(segment_audio_path, output_path, target_duration, policy=policy_for(stretch_tier))
+    result = run_stretch_jobs([job])[0]
+    if not result.ok:
+        logger.error(f"Failed to adjust segment timing: {result.error}")
+        shutil.copy(segment_audio_path, output_path)
         quality_warning = True
-        limited_duration = actual_duration / max_speed_ratio
-        
-        logger.warning(
-            f"⚠️  Segment needs {speed_ratio:.2f}x compression to fit "
-            f"{expected_duration:.2f}s, limiting to {max_speed_ratio:.2f}x"
-        )
-        logger.warning(
-            f"   This may cause slight timing drift. Consider using shorter TTS text."
-        )
-        
-        try:
-            rubberband_to_duration(
-                segment_audio_path,
-                limited_duration * 1000,
-                output_path
-            )
-        except Exception as e:
-            logger.error(f"Failed to adjust segment timing: {e}")
-            shutil.copy(segment_audio_path, output_path)
     
     return output_path, quality_warning, speed_ratio
 
 
+def _warn_speed_limited(speed_ratio: float, expected_duration: float, max_speed_ratio: float) -> None:
+    logger.warning(
+        f"⚠️  Segment needs {speed_ratio:.2f}x compression to fit "
+        f"{expected_duration:.2f}s, limiting to {max_speed_ratio:.2f}x"
+    )
+    logger.warning(
+        f"   This may cause slight timing drift. Consider using shorter TTS text."
+    )
+
+
 def calculate_segment_timing_stats(
     segments: List[Dict],
     tts_audio_paths: List[str]
@@ -329,7 +232,9 @@ def concatenate_audio_strict_timing(
     output_file: str,
     target_duration: float,
     max_speed_ratio: float = 1.35,
-    translation_segments: Optional[List[Dict]] = None
+    translation_segments: Optional[List[Dict]] = None,
+    stretch_tier: Optional[str] = None,
+    sample_rate: Optional[int] = None,
 ) -> Tuple[str, Optional[List[Dict]], int]:
     """
     Concatenate audio with STRICT segment-by-segment timing enforcement.
@@ -343,6 +248,8 @@ def concatenate_audio_strict_timing(
         target_duration: Total video duration
         max_speed_ratio: Maximum allowed speed adjustment (default 1.35 = 35%)
         translation_segments: Optional list to update with final timings
+        stretch_tier: Time-stretch quality tier (control_center.yaml time_stretch.tiers)
+        sample_rate: Working rate of the rendered track (default: first segment's rate)
     
     Returns:
         Tuple of (output_path, updated_translation_segments, quality_warnings_count)
@@ -390,105 +297,87 @@ def concatenate_audio_strict_timing(
             f"   This may affect audio quality. Consider using more concise translations."
         )
     
-    # Step 2: Adjust each segment to exact timing
+    # Step 2: Plan every segment's target length, then stretch them in one parallel batch
     adjusted_segments = []
     quality_warnings = 0
     temp_dir = Path(tempfile.mkdtemp())
     
     logger.info(f"\n🔧 Adjusting segments to exact timing:")
     
-    for i, seg in enumerate(segments):
-        expected_start = seg["start"]
-        expected_end = seg["end"]
-        expected_duration = expected_end - expected_start
-        
-        adjusted_path = temp_dir / f"strict_timing_seg_{i:03d}.wav"
-        
-        # Force segment to exact timing
-        _, quality_warning, speed_ratio = adjust_segment_to_exact_timing(
-            seg["audio_url"],
-            expected_start,
-            expected_end,
-            str(adjusted_path),
-            max_speed_ratio=max_speed_ratio,
-            logger=logger
+    policy = policy_for(stretch_tier)
+    jobs: List[StretchJob] = []
+    job_index: Dict[int, int] = {}
+    for i, (seg, adjustment) in enumerate(zip(segments, stats["timing_adjustments"])):
+        expected_duration = seg["end"] - seg["start"]
+        target_duration, quality_warning, speed_ratio = plan_segment_adjustment(
+            adjustment["actual_duration"], expected_duration, max_speed_ratio
         )
-        
         if quality_warning:
-            quality_warnings += 1
+            _warn_speed_limited(speed_ratio, expected_duration, max_speed_ratio)
+        adjusted_segments.append({
+            "audio_path": seg["audio_url"],
+            "start": seg["start"],
+            "end": seg["end"],
+            "duration": expected_duration,
+            "original_duration": adjustment["actual_duration"],
+            "adjusted_duration": adjustment["actual_duration"],
+            "speed_ratio": speed_ratio,
+            "quality_warning": quality_warning,
+        })
+        if target_duration is not None:
+            job_index[i] = len(jobs)
+            jobs.append(StretchJob.for_duration(
+                seg["audio_url"], temp_dir / f"strict_timing_seg_{i:03d}.wav", target_duration, policy=policy
+            ))
+    
+    results = run_stretch_jobs(jobs)
+    
+    for i, adj_seg in enumerate(adjusted_segments):
+        if i in job_index:
+            result = results[job_index[i]]
+            if result.ok:
+                adj_seg["audio_path"] = result.output_path
+                adj_seg["adjusted_duration"] = result.duration
+            else:
+                # Keep the unstretched take rather than dropping the line
+                adj_seg["quality_warning"] = True
         
-        # Verify adjusted duration
-        actual_adjusted_duration = get_audio_duration(adjusted_path)
-        duration_error = abs(actual_adjusted_duration - expected_duration)
+        if adj_seg["quality_warning"]:
+            quality_warnings += 1
         
+        duration_error = abs(adj_seg["adjusted_duration"] - adj_seg["duration"])
         if duration_error > 0.05:  # More than 50ms error
             logger.warning(
                 f"   Segment {i}: Duration error {duration_error:.3f}s after adjustment"
             )
         
-        adjusted_segments.append({
-            "audio_path": str(adjusted_path),
-            "start": expected_start,
-            "end": expected_end,
-            "duration": expected_duration,
-            "original_duration": get_audio_duration(Path(seg["audio_url"])),
-            "speed_ratio": speed_ratio
-        })
-        
         logger.info(
-            f"   Segment {i}: [{expected_start:.2f}-{expected_end:.2f}s] "
-            f"adjusted {speed_ratio:.2f}x"
+            f"   Segment {i}: [{adj_seg['start']:.2f}-{adj_seg['end']:.2f}s] "
+            f"adjusted {adj_seg['speed_ratio']:.2f}x"
         )
     
-    # Step 3: Build timeline with EXACT placements
+    # Step 3: Place each adjusted segment at its exact sample offset and render once
     logger.info(f"\n🎵 Building synchronized timeline:")
     
-    timeline = []
-    current_time = 0.0
-    
-    for i, adj_seg in enumerate(adjusted_segments):
-        # Add silence before segment if there's a gap
-        gap_duration = adj_seg["start"] - current_time
-        
+    placements = []
+    previous_end = 0.0
+    for adj_seg in adjusted_segments:
+        gap_duration = adj_seg["start"] - previous_end
         if gap_duration > 0.01:  # More than 10ms gap
-            timeline.append({
-                "type": "silence",
-                "duration": gap_duration,
-                "start": current_time,
-                "end": adj_seg["start"]
-            })
-            logger.info(f"   Silence: [{current_time:.2f}-{adj_seg['start']:.2f}s] ({gap_duration:.2f}s)")
-            current_time = adj_seg["start"]
-        
-        # Add segment at exact position
-        timeline.append({
-            "type": "audio",
-            "path": adj_seg["audio_path"],
-            "start": adj_seg["start"],
-            "end": adj_seg["end"],
-            "duration": adj_seg["duration"]
-        })
+            logger.info(f"   Silence: [{previous_end:.2f}-{adj_seg['start']:.2f}s] ({gap_duration:.2f}s)")
+        placements.append(Placement(adj_seg["audio_path"], adj_seg["start"]))
         logger.info(
             f"   Audio: [{adj_seg['start']:.2f}-{adj_seg['end']:.2f}s] "
             f"(ratio: {adj_seg['speed_ratio']:.2f}x)"
         )
-        
-        current_time = adj_seg["end"]
-    
-    # Add final silence if needed
-    if current_time < target_duration:
-        final_gap = target_duration - current_time
-        timeline.append({
-            "type": "silence",
-            "duration": final_gap,
-            "start": current_time,
-            "end": target_duration
-        })
-        logger.info(f"   Final silence: [{current_time:.2f}-{target_duration:.2f}s] ({final_gap:.2f}s)")
+        previous_end = adj_seg["end"]
     
-    # Step 4: Concatenate timeline using ffmpeg
-    logger.info(f"\n🔨 Concatenating {len(timeline)} elements...")
-    _concatenate_timeline_ffmpeg(timeline, output_file)
+    if previous_end < target_duration:
+        logger.info(f"   Final silence: [{previous_end:.2f}-{target_duration:.2f}s] ({target_duration - previous_end:.2f}s)")
+    
+    # Step 4: Render the timeline into a single buffer
+    logger.info(f"\n🔨 Rendering {len(placements)} segments...")
+    render_timeline(placements, output_file, total_duration=target_duration, sample_rate=sample_rate)
     
     # Step 5: Update translation segments if provided
     if translation_segments and len(translation_segments) == len(segments):
@@ -518,92 +407,3 @@ def concatenate_audio_strict_timing(
     
     return output_file, translation_segments, quality_warnings
 
-
-def _concatenate_timeline_ffmpeg(timeline: List[Dict], output_file: str):
-    """
-    Helper function to concatenate timeline elements using ffmpeg.
-    
-    Args:
-        timeline: List of {"type": "audio"|"silence", ...} dicts
-        output_file: Output file path
-    """
-    import tempfile
-    
-    silence_temp_dir = Path(tempfile.mkdtemp())
-    
-    try:
-        # Get audio properties from first audio segment
-        first_audio = next((t["path"] for t in timeline if t["type"] == "audio"), None)
-        
-        if not first_audio:
-            # No audio segments, just create silence
-            logger.warning("No audio segments in timeline, creating silence file")
-            total_duration = sum(t.get("duration", 0) for t in timeline if t["type"] == "silence")
-            cmd = [
-                'ffmpeg', '-y', '-v', 'error',
-                '-f', 'lavfi',
-                '-i', f'anullsrc=channel_layout=stereo:sample_rate=24000',
-                '-t', str(total_duration),
-                str(output_file)
-            ]
-            subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=FFMPEG_TIMEOUT_SECONDS)
-            return
-        
-        # Probe first audio file for properties
-        probe_cmd = [
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'a:0',
-            '-show_entries', 'stream=sample_rate,channels',
-            '-of', 'json',
-            first_audio
-        ]
-        probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        audio_info = json.loads(probe_result.stdout)
-        sample_rate = audio_info['streams'][0]['sample_rate']
-        channels = audio_info['streams'][0]['channels']
-        
-        # Create silence files and build file list
-        filelist_path = silence_temp_dir / "filelist.txt"
-        silence_counter = 0
-        
-        with open(filelist_path, 'w') as f:
-            for element in timeline:
-                if element['type'] == 'silence':
-                    if element['duration'] > 0.001:  # Only create if > 1ms
-                        silence_file = silence_temp_dir / f"silence_{silence_counter}.wav"
-                        silence_cmd = [
-                            'ffmpeg', '-y', '-v', 'error',
-                            '-f', 'lavfi',
-                            '-i', f'anullsrc=channel_layout={"stereo" if channels == 2 else "mono"}:sample_rate={sample_rate}',
-                            '-t', str(element['duration']),
-                            str(silence_file)
-                        ]
-                        subprocess.run(silence_cmd, capture_output=True, text=True, check=True)
-                        f.write(f"file '{silence_file.absolute()}'\n")
-                        silence_counter += 1
-                else:
-                    # Audio segment
-                    f.write(f"file '{Path(element['path']).absolute()}'\n")
-        
-        # Final concatenation
-        cmd = [
-            'ffmpeg', '-y', '-v', 'error',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(filelist_path),
-            '-c', 'copy',
-            str(output_file)
-        ]
-        
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
-        logger.debug(f"Concatenated {len(timeline)} timeline elements to {output_file}")
-        
-    except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg failed: {e.stderr if e.stderr else str(e)}")
-        raise
-    except Exception as e:
-        logger.error(f"Timeline concatenation failed: {e}")
-        raise
-    finally:
-        # Clean up temp dir
-        shutil.rmtree(silence_temp_dir, ignore_errors=True)
@@ -6,6 +6,8 @@ import shlex
 import subprocess
 from common_schemas.models import Word, SubtitleSegment
 
+from .media_info import MEDIA_INFO, MediaProbeError
+
 
 @dataclass
 class ChunkSpec:
@@ -20,7 +22,7 @@ _DEFAULT_MOBILE_RES = (1280, 720)
 
 def probe_video_resolution(video_path: Path | str) -> Tuple[int, int]:
     """
-    Probe the video resolution using ffprobe.
+    Video resolution from the cached media probe.
     Returns (width, height) with safe fallbacks.
     """
     path = Path(video_path)
@@ -28,33 +30,11 @@ def probe_video_resolution(video_path: Path | str) -> Tuple[int, int]:
         base = _DEFAULT_DESKTOP_RES
         return base
 
-    cmd = [
-        "ffprobe",
-        "-v",
-        "error",
-        "-select_streams",
-        "v:0",
-        "-show_entries",
-        "stream=width,height",
-        "-of",
-        "json",
-        str(path),
-    ]
-
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        payload = json.loads(result.stdout or "{}")
-        streams = payload.get("streams") or []
-        if streams:
-            stream = streams[0]
-            width = int(stream.get("width") or 0)
-            height = int(stream.get("height") or 0)
-            if width > 0 and height > 0:
-                return width, height
-    except (subprocess.CalledProcessError, ValueError, json.JSONDecodeError):
-        pass
-
-    return _DEFAULT_DESKTOP_RES
+        resolution = MEDIA_INFO.probe(path).resolution
+    except MediaProbeError:
+        resolution = None
+    return resolution or _DEFAULT_DESKTOP_RES
 
 
 def _compute_style_scale(video_width: int, video_height: int, mobile: bool) -> Tuple[float, float]:
@@ -751,24 +731,19 @@ def _ensure_ass(sub_path: Path) -> Path:
     return out_path
 
 
-def burn_subtitles_to_video(
+def build_subtitle_filter(
     video_path: Path | str,
     subtitle_path: Path | str,
-    output_path: Path | str,
     style: SubtitleStyle | None = None,
     mobile: bool = False,
     fonts_dir: str | None = None,
-) -> Path:
+) -> str:
     """
-    Burn subtitles into video using libass.
-    - Converts SRT/VTT to ASS for styling.
-    - Applies force_style derived from SubtitleStyle.
+    libass ``subtitles`` filter for burning ``subtitle_path`` into ``video_path``,
+    sized to the video's resolution; usable in ``-vf`` or inside a ``-filter_complex`` graph.
     """
-    video = Path(video_path)
-    subs = Path(subtitle_path)
-    out = Path(output_path)
-    video_width, video_height = probe_video_resolution(video)
-    ass_path = _ensure_ass(subs)
+    video_width, video_height = probe_video_resolution(Path(video_path))
+    ass_path = _ensure_ass(Path(subtitle_path))
 
     force_style = _style_to_force_style(style, mobile, video_width, video_height) if style else ""
 
@@ -777,6 +752,25 @@ def burn_subtitles_to_video(
         sub_filter += f":force_style='{force_style}'"
     if fonts_dir:
         sub_filter += f":fontsdir={shlex.quote(fonts_dir)}"
+    return sub_filter
+
+
+def burn_subtitles_to_video(
+    video_path: Path | str,
+    subtitle_path: Path | str,
+    output_path: Path | str,
+    style: SubtitleStyle | None = None,
+    mobile: bool = False,
+    fonts_dir: str | None = None,
+) -> Path:
+    """
+    Burn subtitles into video using libass.
+    - Converts SRT/VTT to ASS for styling.
+    - Applies force_style derived from SubtitleStyle.
+    """
+    video = Path(video_path)
+    out = Path(output_path)
+    sub_filter = build_subtitle_filter(video, subtitle_path, style, mobile, fonts_dir)
 
     cmd = [
         "ffmpeg", "-y",
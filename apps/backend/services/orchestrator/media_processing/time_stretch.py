@@ -0,0 +1,227 @@
+"""
+In-memory time-stretch engines.
+
+Every stretch goes through a :class:`TimeStretcher` that maps a buffer to an
+exact number of output frames. Which backend runs is decided per call by a
+:class:`StretchPolicy` (one per quality tier in ``control_center.yaml``):
+
+* ``passthrough`` - ratios within the tier's tolerance are only padded/trimmed;
+* ``vocoder``     - a vectorized NumPy phase vocoder for small ratio changes;
+* ``rubberband``  - the ``rubberband`` CLI via ``pyrubberband``.
+"""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIER = "final"
+VOCODER_WINDOW_SECONDS = 0.04
+VOCODER_OVERLAP = 4
+
+
+def fit_length(y: np.ndarray, target_samples: int) -> np.ndarray:
+    """Pad with silence or trim so ``y`` has exactly ``target_samples`` frames."""
+    if len(y) >= target_samples:
+        return y[:target_samples]
+    pad = [(0, target_samples - len(y))] + [(0, 0)] * (y.ndim - 1)
+    return np.pad(y, pad)
+
+
+class TimeStretcher(ABC):
+    """Stretches a (frames,) or (frames, channels) float buffer to an exact length."""
+
+    name = ""
+
+    def stretch(self, y: np.ndarray, sr: int, target_samples: int) -> np.ndarray:
+        if target_samples <= 0 or len(y) == 0:
+            raise ValueError(f"invalid stretch target {target_samples} for {len(y)} samples")
+        return fit_length(self._stretch(y, sr, target_samples), target_samples).astype(np.float32, copy=False)
+
+    @abstractmethod
+    def _stretch(self, y: np.ndarray, sr: int, target_samples: int) -> np.ndarray:
+        ...
+
+
+class PassthroughStretcher(TimeStretcher):
+    name = "passthrough"
+
+    def _stretch(self, y: np.ndarray, sr: int, target_samples: int) -> np.ndarray:
+        return y
+
+
+class PhaseVocoderStretcher(TimeStretcher):
+    """
+    Phase vocoder with every frame computed at once: magnitudes are interpolated
+    between analysis frames, output phases are a cumulative sum of the measured
+    phase advances and bins are phase-locked to their spectral peak, so there is
+    no per-frame Python loop.
+    """
+
+    name = "vocoder"
+
+    def _stretch(self, y: np.ndarray, sr: int, target_samples: int) -> np.ndarray:
+        mono = y.ndim == 1
+        data = y[:, None] if mono else y
+        rate = len(data) / target_samples
+        n_fft = 1 << int(np.ceil(np.log2(max(256, sr * VOCODER_WINDOW_SECONDS))))
+        hop = n_fft // VOCODER_OVERLAP
+        window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+
+        padded = np.pad(data, [(n_fft, n_fft + hop), (0, 0)])
+        frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=0)[::hop]  # (F, C, n_fft)
+        spectrum = np.fft.rfft(frames * window, axis=-1)
+        magnitude, phase = np.abs(spectrum), np.angle(spectrum)
+
+        steps = np.arange(0.0, len(spectrum) - 1, rate)
+        index = steps.astype(np.int64)
+        frac = (steps - index)[:, None, None]
+        out_mag = (1.0 - frac) * magnitude[index] + frac * magnitude[index + 1]
+
+        expected = 2.0 * np.pi * hop * np.arange(spectrum.shape[-1]) / n_fft
+        advance = phase[index + 1] - phase[index] - expected
+        advance = expected + (advance + np.pi) % (2.0 * np.pi) - np.pi
+        out_phase = phase[:1] + np.concatenate([np.zeros_like(advance[:1]), np.cumsum(advance[:-1], axis=0)])
+        out_phase = _lock_phases(out_phase, phase[index], out_mag)
+
+        out_frames = np.fft.irfft(out_mag * np.exp(1j * out_phase), n=n_fft, axis=-1) * window
+        out_frames = out_frames.transpose(0, 2, 1)  # (T, n_fft, C)
+        count = len(out_frames)
+        blocks = np.zeros((count + VOCODER_OVERLAP - 1, hop, data.shape[1]))
+        for k in range(VOCODER_OVERLAP):
+            blocks[k:k + count] += out_frames[:, k * hop:(k + 1) * hop]
+        # Hann^2 at 75% overlap sums to 1.5
+        out = blocks.reshape(-1, data.shape[1]) / 1.5
+        start = int(round(n_fft / rate))
+        out = out[start:start + target_samples]
+        return out[:, 0] if mono else out
+
+
+def _lock_phases(out_phase: np.ndarray, in_phase: np.ndarray, magnitude: np.ndarray) -> np.ndarray:
+    """Identity phase locking: bins keep their input phase offset to the nearest spectral peak."""
+    bins = magnitude.shape[-1]
+    peaks = np.zeros(magnitude.shape, dtype=bool)
+    peaks[..., 1:-1] = (magnitude[..., 1:-1] > magnitude[..., :-2]) & (magnitude[..., 1:-1] >= magnitude[..., 2:])
+    peaks[..., 0] = peaks[..., -1] = True
+    positions = np.arange(bins)
+    left = np.maximum.accumulate(np.where(peaks, positions, 0), axis=-1)
+    right = np.flip(np.minimum.accumulate(np.flip(np.where(peaks, positions, bins - 1), axis=-1), axis=-1), axis=-1)
+    nearest = np.where(positions - left <= right - positions, left, right)
+    peak_out = np.take_along_axis(out_phase, nearest, axis=-1)
+    peak_in = np.take_along_axis(in_phase, nearest, axis=-1)
+    return peak_out + in_phase - peak_in
+
+
+class RubberbandStretcher(TimeStretcher):
+    """Rubber Band through its command-line tool (``pyrubberband``)."""
+
+    name = "rubberband"
+
+    def __init__(self, preserve_formants: bool = True) -> None:
+        self.preserve_formants = preserve_formants
+
+    def _stretch(self, y: np.ndarray, sr: int, target_samples: int) -> np.ndarray:
+        import pyrubberband as prb
+
+        # Engine selection flags differ between CLI versions; keep to the widely supported ones
+        rbargs = {"--pitch-hq": ""}
+        if self.preserve_formants:
+            rbargs["--formant"] = ""
+        return prb.time_stretch(y, sr, len(y) / target_samples, rbargs=rbargs)
+
+
+@dataclass(frozen=True)
+class StretchPolicy:
+    """Backend selection for one quality tier; hashable so it can key caches and cross process pools."""
+
+    engine: str = "rubberband"
+    preserve_formants: bool = True
+    small_ratio_engine: str = "vocoder"
+    small_ratio: float = 0.05  # |rate - 1| up to this uses small_ratio_engine
+    passthrough_tolerance: float = 0.002  # |rate - 1| up to this is only padded/trimmed
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Mapping]) -> "StretchPolicy":
+        cfg = cfg or {}
+        values = {f.name: cfg[f.name] for f in fields(cls) if f.name in cfg}
+        for name in ("small_ratio", "passthrough_tolerance"):
+            if name in values:
+                values[name] = float(values[name])
+        return cls(**values)
+
+    def engine_for(self, rate: float) -> str:
+        deviation = abs(rate - 1.0)
+        if deviation <= self.passthrough_tolerance:
+            return PassthroughStretcher.name
+        if deviation <= self.small_ratio:
+            return self.small_ratio_engine
+        return self.engine
+
+    def stretcher_for(self, rate: float) -> TimeStretcher:
+        name = self.engine_for(rate)
+        if name == PassthroughStretcher.name:
+            return PassthroughStretcher()
+        if name == PhaseVocoderStretcher.name:
+            return PhaseVocoderStretcher()
+        if name == RubberbandStretcher.name:
+            return RubberbandStretcher(self.preserve_formants)
+        raise ValueError(f"Unknown time-stretch engine '{name}'")
+
+
+_TIERS: Dict[str, StretchPolicy] = {DEFAULT_TIER: StretchPolicy()}
+_DEFAULT_TIER = DEFAULT_TIER
+
+
+def configure_tiers(tiers_cfg: Optional[Mapping[str, Mapping]], default_tier: str = DEFAULT_TIER) -> None:
+    """Load the per-tier policies from the ``time_stretch.tiers`` config section."""
+    global _DEFAULT_TIER
+    tiers = {name: StretchPolicy.from_config(cfg) for name, cfg in (tiers_cfg or {}).items()}
+    tiers.setdefault(DEFAULT_TIER, StretchPolicy())
+    _TIERS.clear()
+    _TIERS.update(tiers)
+    _DEFAULT_TIER = default_tier if default_tier in tiers else DEFAULT_TIER
+
+
+def policy_for(tier: Optional[str] = None) -> StretchPolicy:
+    tier = tier or _DEFAULT_TIER
+    policy = _TIERS.get(tier)
+    if policy is None:
+        logger.warning("Unknown time-stretch tier '%s', using '%s'", tier, _DEFAULT_TIER)
+        policy = _TIERS[_DEFAULT_TIER]
+    return policy
+
+
+def stretch_buffer(
+    y: np.ndarray, sr: int, target_samples: int, policy: Optional[StretchPolicy] = None,
+) -> np.ndarray:
+    """Stretch ``y`` to exactly ``target_samples`` frames with the backend ``policy`` selects."""
+    policy = policy or policy_for()
+    rate = len(y) / target_samples if target_samples > 0 else 0.0
+    return policy.stretcher_for(rate).stretch(y, sr, target_samples)
+
+
+def stretch_file(
+    in_wav: Union[str, Path],
+    target_samples: Optional[int],
+    out_wav: Union[str, Path],
+    policy: Optional[StretchPolicy] = None,
+    target_ms: Optional[float] = None,
+) -> Tuple[int, int, int]:
+    """
+    Stretch a file to ``target_samples`` frames (or ``target_ms`` at its own rate) and
+    write the result. Returns (frames, sample_rate, channels) of the written buffer.
+    """
+    y, sr = sf.read(str(in_wav), always_2d=False, dtype="float32")
+    if target_samples is None:
+        target_samples = int(round((target_ms or 0.0) * sr / 1000))
+    y2 = stretch_buffer(y, sr, target_samples, policy)
+    sf.write(str(out_wav), y2, sr)
+    return len(y2), sr, 1 if y2.ndim == 1 else y2.shape[1]
@@ -0,0 +1,297 @@
+"""
+Sample-accurate timeline rendering.
+
+Segments are mixed into one preallocated output buffer at their exact sample
+offsets and the result is written once, so the cost does not depend on the
+number of silence gaps and no ffmpeg processes are spawned. Long timelines use
+a disk-backed buffer so memory stays bounded.
+
+``mix_onto_background`` streams a background track block by block instead,
+adding only the segments that overlap each block, so its memory use does not
+depend on the length of the video.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import soundfile as sf
+
+from .media_info import MEDIA_INFO
+from .resampling import RESAMPLER
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 24000
+DEFAULT_CHANNELS = 2
+DEFAULT_FADE_MS = 5.0
+WRITE_BLOCK_FRAMES = 1 << 18
+# Above this many bytes the mix buffer is memory-mapped from a temp file
+IN_MEMORY_LIMIT_BYTES = 512 * 1024 * 1024
+STREAM_BLOCK_FRAMES = 1 << 16
+LIMITER_CEILING = 0.99
+LIMITER_LOOKAHEAD_SECONDS = 0.005
+LIMITER_RELEASE_SECONDS = 0.05
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class Placement:
+    path: str
+    start: float  # seconds on the output timeline
+
+
+def _conform(data: np.ndarray, source_sr: int, sample_rate: int, channels: int) -> np.ndarray:
+    if source_sr != sample_rate:
+        data = RESAMPLER.resample(data, source_sr, sample_rate)
+        if data.ndim == 1:
+            data = data[:, None]
+    if data.shape[1] == channels:
+        return data
+    if data.shape[1] == 1:
+        return np.repeat(data, channels, axis=1)
+    if channels == 1:
+        return data.mean(axis=1, keepdims=True)
+    return data[:, :channels]
+
+
+def _apply_edge_fades(data: np.ndarray, fade_frames: int) -> None:
+    fade = min(fade_frames, len(data) // 4)
+    if fade <= 0:
+        return
+    ramp = np.linspace(0.0, 1.0, fade, endpoint=False, dtype=np.float32)[:, None]
+    data[:fade] *= ramp
+    data[-fade:] *= ramp[::-1]
+
+
+def _allocate(frames: int, channels: int, scratch_dir: Path) -> np.ndarray:
+    if frames * channels * 4 <= IN_MEMORY_LIMIT_BYTES:
+        return np.zeros((frames, channels), dtype=np.float32)
+    return np.memmap(scratch_dir / "mix.f32", dtype=np.float32, mode="w+", shape=(frames, channels))
+
+
+def _write(buffer: np.ndarray, output_file: PathLike, sample_rate: int, subtype: str) -> None:
+    with sf.SoundFile(
+        str(output_file), "w", samplerate=sample_rate, channels=buffer.shape[1], format="WAV", subtype=subtype,
+    ) as sink:
+        for offset in range(0, len(buffer), WRITE_BLOCK_FRAMES):
+            sink.write(np.clip(buffer[offset:offset + WRITE_BLOCK_FRAMES], -1.0, 1.0))
+
+
+def render_timeline(
+    placements: Sequence[Placement],
+    output_file: PathLike,
+    total_duration: Optional[float] = None,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+    fade_ms: float = DEFAULT_FADE_MS,
+    subtype: str = "PCM_16",
+) -> str:
+    """
+    Mix ``placements`` into ``output_file``.
+
+    The output lasts ``total_duration`` seconds, extended if a segment runs past it.
+    Sample rate and channel count default to those of the first segment; segments in
+    another format are converted. Overlapping segments are summed, and each segment
+    gets ``fade_ms`` fades so adjoining segments crossfade instead of clicking.
+    """
+    if placements:
+        first = MEDIA_INFO.probe(placements[0].path)
+        sample_rate = sample_rate or first.sample_rate
+        channels = channels or first.channels
+    sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
+    channels = channels or DEFAULT_CHANNELS
+
+    # Estimate the extent from cached probes; the exact end is tracked while mixing
+    estimated_end = 0
+    for placement in placements:
+        info = MEDIA_INFO.probe(placement.path)
+        offset = int(round(max(0.0, placement.start) * sample_rate))
+        estimated_end = max(estimated_end, offset + int(np.ceil(info.duration * sample_rate)) + 1)
+    requested = int(round(total_duration * sample_rate)) if total_duration is not None else 0
+    frames = max(requested, estimated_end)
+
+    fade_frames = int(sample_rate * fade_ms / 1000.0)
+    with tempfile.TemporaryDirectory(prefix="timeline_") as scratch:
+        buffer = _allocate(frames, channels, Path(scratch))
+        rendered_end = 0
+        for placement in placements:
+            # Off-rate segments are converted once per artifact and reused by later passes
+            path = RESAMPLER.resample_file(placement.path, sample_rate)
+            data, source_sr = sf.read(path, dtype="float32", always_2d=True)
+            data = _conform(data, source_sr, sample_rate, channels)
+            _apply_edge_fades(data, fade_frames)
+            offset = int(round(max(0.0, placement.start) * sample_rate))
+            stop = min(offset + len(data), frames)
+            buffer[offset:stop] += data[: stop - offset]
+            rendered_end = max(rendered_end, stop)
+        # Never drop audio: a segment running past ``total_duration`` extends the output
+        buffer = buffer[: max(requested, rendered_end)]
+        _write(buffer, output_file, sample_rate, subtype)
+        written = len(buffer)
+        del buffer
+
+    MEDIA_INFO.record_audio(output_file, written / sample_rate, sample_rate, channels)
+    logger.debug("Rendered %d segments into %s (%.3fs)", len(placements), output_file, written / sample_rate)
+    return str(output_file)
+
+
+def concatenate_files(audio_files: Iterable[PathLike], output_file: PathLike, subtype: str = "PCM_16") -> str:
+    """Join files back to back, streaming them into ``output_file`` in the first file's format."""
+    files: List[str] = [str(path) for path in audio_files]
+    if not files:
+        raise ValueError("At least 1 audio file is required for concatenation")
+    first = MEDIA_INFO.probe(files[0])
+    sample_rate, channels = first.sample_rate, first.channels
+    written = 0
+    with sf.SoundFile(
+        str(output_file), "w", samplerate=sample_rate, channels=channels, format="WAV", subtype=subtype,
+    ) as sink:
+        for path in files:
+            data, source_sr = sf.read(path, dtype="float32", always_2d=True)
+            data = _conform(data, source_sr, sample_rate, channels)
+            sink.write(data)
+            written += len(data)
+    MEDIA_INFO.record_audio(output_file, written / sample_rate, sample_rate, channels)
+    return str(output_file)
+
+
+class _SegmentReader:
+    """Reads the part of one placed segment that overlaps a block, conformed to the mix format."""
+
+    def __init__(self, placement: Placement, sample_rate: int, channels: int) -> None:
+        info = sf.info(placement.path)
+        self.path = placement.path
+        self.offset = int(round(max(0.0, placement.start) * sample_rate))
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = int(round(info.frames * sample_rate / info.samplerate))
+        self.end = self.offset + self.frames
+        self._handle: Optional[sf.SoundFile] = None
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Frames ``start:stop`` of the output timeline that this segment covers."""
+        first, last = max(start, self.offset) - self.offset, min(stop, self.end) - self.offset
+        if self._handle is None:
+            # Off-rate segments are read from their converted copy at the mix rate
+            self._handle = sf.SoundFile(RESAMPLER.resample_file(self.path, self.sample_rate))
+        self._handle.seek(min(first, self._handle.frames))
+        data = self._handle.read(last - first, dtype="float32", always_2d=True)
+        if len(data) < last - first:
+            data = np.pad(data, [(0, last - first - len(data)), (0, 0)])
+        return _conform(data, self.sample_rate, self.sample_rate, self.channels)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class _Limiter:
+    """
+    Look-ahead peak limiter for audio processed block by block.
+
+    Output is delayed by the look-ahead, so the gain reaches the level a peak needs
+    by the time the peak is written: it falls linearly over at most the look-ahead
+    and recovers linearly over the release time. Both envelopes are cumulative
+    maxima of the per-frame gain reduction, and the held-back frames and current
+    reduction carry over between blocks, so no frame ever exceeds the ceiling.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, ceiling: float = LIMITER_CEILING) -> None:
+        self.ceiling = ceiling
+        self.lookahead = max(1, int(sample_rate * LIMITER_LOOKAHEAD_SECONDS))
+        self.release = max(1, int(sample_rate * LIMITER_RELEASE_SECONDS))
+        self._held = np.zeros((0, channels), dtype=np.float32)
+        self._reduction = 0.0
+
+    def process(self, block: np.ndarray, last: bool = False) -> np.ndarray:
+        """Limit ``block``; returns the frames that are ready, all of them once ``last`` is set."""
+        frames = np.concatenate([self._held, block]) if len(self._held) else block
+        ready = len(frames) if last else max(0, len(frames) - self.lookahead)
+        if ready == 0:
+            self._held = frames
+            return frames[:0]
+
+        peak = np.max(np.abs(frames), axis=1) if frames.shape[1] else np.zeros(len(frames), dtype=np.float32)
+        needed = np.maximum(0.0, 1.0 - self.ceiling / np.maximum(peak.astype(np.float64), self.ceiling))
+        if self._reduction == 0.0 and not needed.any():
+            self._held = frames[ready:].copy()
+            return frames[:ready]
+
+        index = np.arange(len(frames), dtype=np.float64)
+        # Attack: start lowering the gain up to one look-ahead before each peak
+        attack = np.maximum.accumulate((needed - index / self.lookahead)[::-1])[::-1] + index / self.lookahead
+        attack = attack[:ready]
+        # Release: recover linearly from the deepest recent reduction, this block's or the previous one's
+        index = index[:ready]
+        reduction = np.maximum.accumulate(attack + index / self.release) - index / self.release
+        reduction = np.maximum(reduction, self._reduction - (index + 1) / self.release)
+        reduction = np.clip(reduction, 0.0, 1.0)
+
+        self._reduction = float(reduction[-1])
+        self._held = frames[ready:].copy()
+        return frames[:ready] * (1.0 - reduction).astype(np.float32)[:, None]
+
+
+def mix_onto_background(
+    background_path: PathLike,
+    placements: Sequence[Placement],
+    output_file: PathLike,
+    background_gain: float = 1.0,
+    block_frames: int = STREAM_BLOCK_FRAMES,
+    subtype: str = "PCM_16",
+) -> str:
+    """
+    Stream ``background_path`` block by block, add the segments overlapping each block and
+    write the result incrementally in the background's format.
+
+    The output runs to the end of the background, extended if a segment runs past it. The
+    mix goes through a look-ahead limiter, so nothing clips and the whole mix never has to
+    be held in memory.
+    """
+    with sf.SoundFile(str(background_path)) as background:
+        sample_rate, channels = background.samplerate, background.channels
+        readers = sorted((_SegmentReader(p, sample_rate, channels) for p in placements), key=lambda r: r.offset)
+        starts = [reader.offset for reader in readers]
+        total = max([background.frames] + [reader.end for reader in readers])
+        limiter = _Limiter(sample_rate, channels)
+
+        active: Dict[int, _SegmentReader] = {}
+        next_reader = 0
+        with sf.SoundFile(
+            str(output_file), "w", samplerate=sample_rate, channels=channels, format="WAV", subtype=subtype,
+        ) as sink:
+            for start in range(0, total, block_frames):
+                stop = min(start + block_frames, total)
+                block = np.zeros((stop - start, channels), dtype=np.float32)
+                bed = background.read(stop - start, dtype="float32", always_2d=True)
+                block[:len(bed)] = bed
+                if background_gain != 1.0:
+                    block *= background_gain
+
+                # Segments are sorted by start, so the ones beginning in this block are the next ones
+                upto = bisect.bisect_left(starts, stop, lo=next_reader)
+                for index in range(next_reader, upto):
+                    active[index] = readers[index]
+                next_reader = upto
+                for index, reader in list(active.items()):
+                    data = reader.read(start, stop)
+                    first = max(start, reader.offset) - start
+                    block[first:first + len(data)] += data
+                    if reader.end <= stop:
+                        reader.close()
+                        del active[index]
+
+                sink.write(limiter.process(block, last=stop == total))
+
+    MEDIA_INFO.record_audio(output_file, total / sample_rate, sample_rate, channels)
+    logger.debug("Mixed %d segments onto %s (%.3fs)", len(placements), background_path, total / sample_rate)
+    return str(output_file)
@@ -0,0 +1,321 @@
+"""
+Voice activity detection backends.
+
+Every VAD call site (TTS trimming, ``check_audio_structure`` and the pipeline's
+VAD stage) asks :func:`get_vad_backend` for the configured backend:
+
+* ``onnx``      - Silero VAD run through ONNX Runtime from a local model file,
+  streamed window by window with a bounded thread count; no torch, no network;
+* ``torch_hub`` - the Silero JIT model from ``torch.hub`` (fetches the repo on a
+  cold cache), kept for comparison and as an explicit opt-in.
+
+Timestamps are returned in samples as ``{"start", "end"}`` dicts, like Silero's
+own ``get_speech_timestamps``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import urllib.request
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from .resampling import RESAMPLER
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "silero_vad.onnx"
+MODEL_URL = "https://github.com/snakers4/silero-vad/raw/v6.2/src/silero_vad/data/silero_vad.onnx"
+DEFAULT_MODEL_DIR = Path(__file__).resolve().parents[3] / "cache" / "models"
+SUPPORTED_RATES = (8000, 16000)
+STATE_SHAPE = (2, 1, 128)
+
+
+def read_audio(path: Union[str, Path], sampling_rate: int = 16000) -> np.ndarray:
+    """Decode ``path`` to a mono float32 track at ``sampling_rate``."""
+    audio, sr = sf.read(str(path), dtype="float32", always_2d=True)
+    mono = RESAMPLER.resample(audio.mean(axis=1), sr, sampling_rate)
+    return mono.astype(np.float32, copy=False)
+
+
+def window_size(sampling_rate: int) -> int:
+    return 512 if sampling_rate == 16000 else 256
+
+
+def timestamps_from_probs(
+    probs: np.ndarray,
+    audio_length_samples: int,
+    sampling_rate: int = 16000,
+    threshold: float = 0.5,
+    min_speech_duration_ms: int = 250,
+    min_silence_duration_ms: int = 100,
+    speech_pad_ms: int = 30,
+) -> List[Dict[str, int]]:
+    """
+    Turn per-window speech probabilities into padded speech regions (samples),
+    with the hysteresis and padding rules of Silero's ``get_speech_timestamps``.
+    """
+    window = window_size(sampling_rate)
+    neg_threshold = max(threshold - 0.15, 0.01)
+    min_speech = sampling_rate * min_speech_duration_ms / 1000
+    min_silence = sampling_rate * min_silence_duration_ms / 1000
+    pad = int(sampling_rate * speech_pad_ms / 1000)
+
+    speeches: List[Dict[str, int]] = []
+    start: Optional[int] = None
+    temp_end = 0
+    for i, prob in enumerate(np.asarray(probs, dtype=np.float32).tolist()):
+        cur_sample = window * i
+        if prob >= threshold:
+            temp_end = 0
+            if start is None:
+                start = cur_sample
+            continue
+        if prob < neg_threshold and start is not None:
+            if not temp_end:
+                temp_end = cur_sample
+            if cur_sample - temp_end < min_silence:
+                continue
+            if temp_end - start > min_speech:
+                speeches.append({"start": start, "end": temp_end})
+            start, temp_end = None, 0
+    if start is not None and audio_length_samples - start > min_speech:
+        speeches.append({"start": start, "end": audio_length_samples})
+
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech["start"] = max(0, speech["start"] - pad)
+        if i == len(speeches) - 1:
+            speech["end"] = min(audio_length_samples, speech["end"] + pad)
+            continue
+        following = speeches[i + 1]
+        silence = following["start"] - speech["end"]
+        # Neighbours closer than two pads share the gap instead of overlapping
+        share = silence // 2 if silence < 2 * pad else pad
+        speech["end"] = min(audio_length_samples, speech["end"] + share)
+        following["start"] = max(0, following["start"] - share)
+    return speeches
+
+
+class VadBackend(ABC):
+    """Finds speech regions in a mono float32 track."""
+
+    name = ""
+
+    def speech_timestamps(self, wav: np.ndarray, sampling_rate: int = 16000, **params) -> List[Dict[str, int]]:
+        """Speech regions of ``wav`` in samples; ``params`` are Silero's thresholds and durations."""
+        if len(wav) == 0:
+            return []
+        return self._speech_timestamps(np.asarray(wav, dtype=np.float32), sampling_rate, **params)
+
+    @abstractmethod
+    def _speech_timestamps(self, wav: np.ndarray, sampling_rate: int, **params) -> List[Dict[str, int]]:
+        ...
+
+    @abstractmethod
+    def load(self):
+        """Load the model now instead of on the first call."""
+
+    def unload(self) -> None:
+        """Release the model; the next call loads it again."""
+
+
+class VadStream:
+    """
+    Incremental Silero inference: audio is fed in arbitrary chunks and one speech
+    probability is returned per complete window, carrying the recurrent state and
+    the context samples between calls.
+    """
+
+    def __init__(self, session, sampling_rate: int) -> None:
+        self._session = session
+        self._window = window_size(sampling_rate)
+        self._sr = np.array(sampling_rate, dtype=np.int64)
+        self._state = np.zeros(STATE_SHAPE, dtype=np.float32)
+        self._context = np.zeros(64 if sampling_rate == 16000 else 32, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def feed(self, chunk: np.ndarray) -> np.ndarray:
+        audio = np.concatenate([self._pending, np.asarray(chunk, dtype=np.float32)])
+        count = len(audio) // self._window
+        self._pending = audio[count * self._window:]
+        probs = np.empty(count, dtype=np.float32)
+        for i, window in enumerate(audio[: count * self._window].reshape(count, self._window)):
+            model_input = np.concatenate([self._context, window])[None, :]
+            out, self._state = self._session.run(None, {"input": model_input, "state": self._state, "sr": self._sr})
+            probs[i] = out.reshape(-1)[0]
+            self._context = window[-len(self._context):]
+        return probs
+
+    def flush(self) -> np.ndarray:
+        """Zero-pad and score the trailing partial window, if any."""
+        if not len(self._pending):
+            return np.zeros(0, dtype=np.float32)
+        return self.feed(np.zeros(self._window - len(self._pending), dtype=np.float32))
+
+
+class SileroOnnxVad(VadBackend):
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_path: Optional[Union[str, Path]] = None,
+        threads: int = 1,
+        model_url: Optional[str] = MODEL_URL,
+        chunk_seconds: float = 30.0,
+    ) -> None:
+        self.model_path = Path(model_path) if model_path else None
+        self.threads = max(1, int(threads or 1))
+        self.model_url = model_url
+        self.chunk_seconds = chunk_seconds
+        self._session = None
+        self._lock = threading.Lock()
+
+    def resolve_model(self) -> Path:
+        """Configured path, then the ``silero_vad`` package's bundled copy, then the local model cache."""
+        if self.model_path is not None:
+            if not self.model_path.exists():
+                raise FileNotFoundError(f"Silero VAD model not found at {self.model_path}")
+            return self.model_path
+        try:
+            from importlib.resources import files
+
+            bundled = Path(str(files("silero_vad") / "data" / MODEL_FILE))
+            if bundled.exists():
+                return bundled
+        except (ImportError, ModuleNotFoundError, TypeError):
+            pass
+        cached = DEFAULT_MODEL_DIR / MODEL_FILE
+        if not cached.exists():
+            if not self.model_url:
+                raise FileNotFoundError(f"Silero VAD model not found at {cached} and no download URL is configured")
+            _download(self.model_url, cached)
+        return cached
+
+    def load(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import onnxruntime as ort
+
+                    model_file = self.resolve_model()
+                    options = ort.SessionOptions()
+                    options.intra_op_num_threads = self.threads
+                    options.inter_op_num_threads = 1
+                    self._session = ort.InferenceSession(
+                        str(model_file), sess_options=options, providers=["CPUExecutionProvider"]
+                    )
+                    logger.info("👂 Loaded Silero VAD (ONNX, %d thread(s)) from %s", self.threads, model_file)
+        return self._session
+
+    def stream(self, sampling_rate: int = 16000) -> VadStream:
+        if sampling_rate not in SUPPORTED_RATES:
+            raise ValueError(f"Silero VAD supports {SUPPORTED_RATES} Hz, got {sampling_rate}")
+        return VadStream(self.load(), sampling_rate)
+
+    def speech_probabilities(self, wav: np.ndarray, sampling_rate: int = 16000) -> np.ndarray:
+        stream = self.stream(sampling_rate)
+        step = max(window_size(sampling_rate), int(self.chunk_seconds * sampling_rate))
+        parts = [stream.feed(wav[offset:offset + step]) for offset in range(0, len(wav), step)]
+        parts.append(stream.flush())
+        return np.concatenate(parts)
+
+    def _speech_timestamps(self, wav: np.ndarray, sampling_rate: int, **params) -> List[Dict[str, int]]:
+        if sampling_rate in SUPPORTED_RATES:
+            probs = self.speech_probabilities(wav, sampling_rate)
+            return timestamps_from_probs(probs, len(wav), sampling_rate, **params)
+        # Other rates are scored at 16 kHz and mapped back
+        resampled = RESAMPLER.resample(wav, sampling_rate, 16000)
+        scale = sampling_rate / 16000
+        return [
+            {"start": int(ts["start"] * scale), "end": min(len(wav), int(round(ts["end"] * scale)))}
+            for ts in self._speech_timestamps(resampled, 16000, **params)
+        ]
+
+    def unload(self) -> None:
+        with self._lock:
+            self._session = None
+
+
+class TorchHubVad(VadBackend):
+    name = "torch_hub"
+
+    def __init__(self) -> None:
+        self._bundle = None
+        self._lock = threading.Lock()
+        self._infer_lock = threading.Lock()
+
+    def load(self):
+        if self._bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    import torch
+
+                    self._bundle = torch.hub.load(
+                        repo_or_dir="snakers4/silero-vad", model="silero_vad", force_reload=False, onnx=False
+                    )
+        return self._bundle
+
+    def _speech_timestamps(self, wav: np.ndarray, sampling_rate: int, **params) -> List[Dict[str, int]]:
+        import torch
+
+        model, (get_speech_timestamps, *_) = self.load()
+        with self._infer_lock:  # the JIT model keeps recurrent state between calls
+            return get_speech_timestamps(torch.from_numpy(wav), model, sampling_rate=sampling_rate, **params)
+
+    def unload(self) -> None:
+        with self._lock:
+            self._bundle = None
+
+
+def _download(url: str, destination: Path) -> None:
+    logger.info("⬇️ Caching Silero VAD model at %s", destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{uuid.uuid4().hex}.tmp")
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response, partial.open("wb") as handle:
+            shutil.copyfileobj(response, handle)
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+_BACKENDS = {SileroOnnxVad.name: SileroOnnxVad, TorchHubVad.name: TorchHubVad}
+_backend: Optional[VadBackend] = None
+_backend_lock = threading.Lock()
+
+
+def configure(cfg: Optional[Mapping] = None) -> VadBackend:
+    """Select the backend from the ``vad`` config section (``backend``, ``model_path``, ``threads``, ``model_url``)."""
+    global _backend
+    cfg = cfg or {}
+    name = str(cfg.get("backend", SileroOnnxVad.name))
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown VAD backend '{name}' (expected one of {sorted(_BACKENDS)})")
+    if name == SileroOnnxVad.name:
+        backend: VadBackend = SileroOnnxVad(
+            model_path=cfg.get("model_path") or None,
+            threads=int(cfg.get("threads", 1) or 1),
+            model_url=cfg.get("model_url", MODEL_URL),
+        )
+    else:
+        backend = TorchHubVad()
+    with _backend_lock:
+        _backend = backend
+    return backend
+
+
+def get_vad_backend() -> VadBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = SileroOnnxVad()
+        return _backend
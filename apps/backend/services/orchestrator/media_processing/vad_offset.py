@@ -23,12 +23,83 @@ License: MIT
 from __future__ import annotations
 import logging
 import numpy as np
-import librosa
+import soundfile as sf
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
+
+from .resampling import RESAMPLER
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_SR = 16000  # WhisperX standard
+RMS_FRAME_LENGTH = 2048
+RMS_HOP_LENGTH = 512  # ~32ms resolution at 16kHz
+# Only a leading window is decoded; it doubles until an onset is found or the file ends
+LEADING_WINDOW_SECONDS = 10.0
+
+
+def _decode_leading(audio_path: Path | str, first_seconds: float) -> Iterator[Tuple[np.ndarray, bool]]:
+    """
+    Yield (mono 16 kHz prefix, reached_end) with the prefix doubling each time.
+    Decoding and resampling are incremental, so nothing is decoded twice; a file
+    that is already mono 16 kHz (the analysis track) is read as is.
+    """
+    try:
+        source = sf.SoundFile(str(audio_path))
+    except RuntimeError:
+        # Containers libsndfile cannot open: decode the growing prefix through librosa
+        import librosa
+
+        seconds = first_seconds
+        while True:
+            audio, _ = librosa.load(str(audio_path), sr=ANALYSIS_SR, duration=seconds)
+            done = len(audio) < int(seconds * ANALYSIS_SR)
+            yield audio, done
+            if done:
+                return
+            seconds *= 2
+
+    with source:
+        resampler = None
+        if source.samplerate != ANALYSIS_SR:
+            resampler = RESAMPLER.stream(source.samplerate, ANALYSIS_SR)
+        parts = []
+        seconds, decoded = first_seconds, 0.0
+        while True:
+            block = source.read(int((seconds - decoded) * source.samplerate), dtype="float32", always_2d=True)
+            done = source.tell() >= source.frames or len(block) == 0
+            mono = block.mean(axis=1)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono, last=done)
+            parts.append(mono)
+            yield np.concatenate(parts), done
+            if done:
+                return
+            decoded, seconds = seconds, seconds * 2
+
+
+def _rms(audio: np.ndarray) -> np.ndarray:
+    """Centered, zero-padded frame RMS (librosa.feature.rms defaults) from a cumulative sum of squares."""
+    half = RMS_FRAME_LENGTH // 2
+    squares = np.pad(audio.astype(np.float64) ** 2, (half, half))
+    cumulative = np.concatenate([[0.0], np.cumsum(squares)])
+    starts = np.arange(1 + len(audio) // RMS_HOP_LENGTH) * RMS_HOP_LENGTH
+    energy = (cumulative[starts + RMS_FRAME_LENGTH] - cumulative[starts]) / RMS_FRAME_LENGTH
+    return np.sqrt(np.maximum(energy, 0.0))
+
+
+def _first_sustained_frame(
+    energy: np.ndarray, window_frames: int, speech_threshold: float, min_level: float, candidates: int
+) -> Optional[int]:
+    """First of the leading ``candidates`` frames whose window has mean > threshold and min > min_level."""
+    if candidates <= 0:
+        return None
+    cumulative = np.concatenate([[0.0], np.cumsum(energy, dtype=np.float64)])
+    means = (cumulative[window_frames:window_frames + candidates] - cumulative[:candidates]) / window_frames
+    minima = np.lib.stride_tricks.sliding_window_view(energy, window_frames)[:candidates].min(axis=1)
+    hits = np.flatnonzero((means > speech_threshold) & (minima > min_level))
+    return int(hits[0]) if len(hits) else None
+
 
 def detect_speech_start_time(
     audio_path: Path | str,
@@ -40,7 +111,9 @@ def detect_speech_start_time(
     Detect when real speech starts by analyzing audio energy.
     
     Uses RMS energy analysis to distinguish sustained speech from transient
-    sounds like breaths, clicks, or background noise.
+    sounds like breaths, clicks, or background noise. Only a leading window of
+    the file is decoded; it doubles until speech is found, and the noise floor
+    is taken over the decoded part.
     
     Args:
         audio_path: Path to audio file (vocals track recommended)
@@ -57,46 +130,43 @@ def detect_speech_start_time(
         Real speech starts at 0.79s
     """
     try:
-        # Load audio at 16kHz (WhisperX standard)
-        audio, sr = librosa.load(str(audio_path), sr=16000)
-        
-        if len(audio) == 0:
-            logger.warning("Empty audio file, cannot detect speech start")
-            return 0.0
-        
-        # Compute RMS energy with small hop for temporal precision
-        hop_length = 512  # ~32ms resolution at 16kHz
-        energy = librosa.feature.rms(
-            y=audio,
-            frame_length=2048,
-            hop_length=hop_length
-        )[0]
-        
-        # Calculate adaptive noise floor (10th percentile of energy)
-        noise_floor = np.percentile(energy, silence_threshold_percentile)
-        speech_threshold = noise_floor * energy_multiplier
-        
-        logger.debug(
-            f"Silence detection: noise_floor={noise_floor:.4f}, "
-            f"speech_threshold={speech_threshold:.4f}, "
-            f"audio_duration={len(audio)/sr:.2f}s"
-        )
-        
         # Calculate window size for sustained energy check
-        window_frames = int((min_sustained_duration * sr) / hop_length)
-        
-        if window_frames >= len(energy):
-            logger.warning("Audio too short for sustained speech detection")
-            return 0.0
+        window_frames = int((min_sustained_duration * ANALYSIS_SR) / RMS_HOP_LENGTH)
         
-        # Find first sustained energy period
-        for i in range(len(energy) - window_frames):
-            window = energy[i:i + window_frames]
+        for audio, reached_end in _decode_leading(audio_path, LEADING_WINDOW_SECONDS):
+            if len(audio) == 0:
+                logger.warning("Empty audio file, cannot detect speech start")
+                return 0.0
+            
+            energy = _rms(audio)
             
-            # Check if sustained above threshold
+            # Calculate adaptive noise floor (10th percentile of energy)
+            noise_floor = np.percentile(energy, silence_threshold_percentile)
+            speech_threshold = noise_floor * energy_multiplier
+            
+            if reached_end:
+                if window_frames >= len(energy):
+                    logger.warning("Audio too short for sustained speech detection")
+                    return 0.0
+                candidates = len(energy) - window_frames
+            else:
+                # Frames whose RMS support runs past the decoded prefix are not final yet
+                complete = (len(audio) - RMS_FRAME_LENGTH // 2) // RMS_HOP_LENGTH + 1
+                candidates = complete - window_frames + 1
+            
+            logger.debug(
+                f"Silence detection: noise_floor={noise_floor:.4f}, "
+                f"speech_threshold={speech_threshold:.4f}, "
+                f"decoded={len(audio)/ANALYSIS_SR:.2f}s"
+            )
+            
+            # Find first sustained energy period
             # Mean must be above speech threshold AND minimum above 1.5x noise
-            if np.mean(window) > speech_threshold and np.min(window) > noise_floor * 1.5:
-                speech_start = (i * hop_length) / sr
+            start_frame = _first_sustained_frame(
+                energy, window_frames, speech_threshold, noise_floor * 1.5, candidates
+            )
+            if start_frame is not None:
+                speech_start = (start_frame * RMS_HOP_LENGTH) / ANALYSIS_SR
                 logger.info(f"🎯 Detected real speech start at {speech_start:.2f}s")
                 return speech_start
         
@@ -0,0 +1,233 @@
+"""
+Chunked source separation with overlap-add reconstruction.
+
+Long sources are split into overlapping windows that are separated
+independently and stitched back together with a linear crossfade over each
+overlap, so memory stays bounded by the chunk length instead of the source
+duration. On GPU hosts the chunks go through the shared separator pool on
+threads; on CPU-only hosts they are spread over a pool of worker processes,
+each keeping its own warm separator.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+BLOCK_FRAMES = 1 << 16
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_SIZE = 0
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    chunk_seconds: float = 180.0
+    overlap_seconds: float = 4.0
+    cpu_workers: int = 0
+    threads_per_worker: int = 4
+
+
+def plan_chunks(total_frames: int, chunk_frames: int, overlap_frames: int) -> List[Tuple[int, int]]:
+    """Split ``[0, total_frames)`` into windows of ``chunk_frames`` overlapping by ``overlap_frames``."""
+    if chunk_frames <= overlap_frames:
+        raise ValueError("chunk length must be longer than the overlap")
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    while True:
+        end = min(start + chunk_frames, total_frames)
+        # Fold a short remainder into the current window instead of separating a sliver
+        if total_frames - end < chunk_frames // 4:
+            end = total_frames
+        chunks.append((start, end))
+        if end >= total_frames:
+            return chunks
+        start = end - overlap_frames
+
+
+class OverlapAddWriter:
+    """Streams chunk outputs into ``sink``, crossfading each chunk with the previous one's tail."""
+
+    def __init__(self, sink) -> None:
+        self.sink = sink
+        self._pending: Optional[np.ndarray] = None
+
+    def add(self, data: np.ndarray, start: int, next_start: Optional[int]) -> None:
+        consumed = 0
+        if self._pending is not None:
+            overlap = len(self._pending)
+            ramp = ((np.arange(overlap, dtype=np.float32) + 0.5) / overlap)[:, None]
+            self.sink.write(self._pending * (1.0 - ramp) + data[:overlap] * ramp)
+            consumed = overlap
+        if next_start is None:
+            self.sink.write(data[consumed:])
+            self._pending = None
+            return
+        split = next_start - start
+        self.sink.write(data[consumed:split])
+        self._pending = data[split:].copy()
+
+
+def _fit_length(data: np.ndarray, frames: int, channels: int) -> np.ndarray:
+    if data.ndim == 1:
+        data = data[:, None]
+    if data.shape[1] != channels:
+        data = np.repeat(data[:, :1], channels, axis=1) if data.shape[1] == 1 else data[:, :channels]
+    if len(data) >= frames:
+        return data[:frames]
+    return np.pad(data, ((0, frames - len(data)), (0, 0)))
+
+
+def _init_worker(threads: int) -> None:
+    import torch
+
+    torch.set_num_threads(max(1, threads))
+
+
+def _separate_chunk(job: Tuple[str, str, str, str, Dict[str, str]]) -> Dict[str, str]:
+    """Separate one chunk file; runs on a thread or inside a worker process."""
+    from preprocessing.media_separation import separation
+
+    input_file, output_dir, model_filename, model_file_dir, output_names = job
+    separation(
+        input_file=input_file,
+        output_dir=output_dir,
+        model_filename=model_filename,
+        output_format="WAV",
+        custom_output_names=output_names,
+        model_file_dir=model_file_dir,
+    )
+    stems = {}
+    for name in output_names.values():
+        stem_path = Path(output_dir) / f"{name}.wav"
+        if stem_path.exists():
+            stems[name] = str(stem_path)
+    return stems
+
+
+def _cpu_executor(config: ChunkingConfig) -> ProcessPoolExecutor:
+    global _PROCESS_POOL, _PROCESS_POOL_SIZE
+    workers = config.cpu_workers or max(1, (os.cpu_count() or 1) // max(1, config.threads_per_worker))
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None or _PROCESS_POOL_SIZE != workers:
+            if _PROCESS_POOL is not None:
+                _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+            # spawn: torch and CUDA state must not be inherited through fork
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config.threads_per_worker,),
+            )
+            _PROCESS_POOL_SIZE = workers
+            logger.info("🧩 Started %d separation worker processes", workers)
+        return _PROCESS_POOL
+
+
+def shutdown_worker_pool() -> None:
+    global _PROCESS_POOL, _PROCESS_POOL_SIZE
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is not None:
+            _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+        _PROCESS_POOL = None
+        _PROCESS_POOL_SIZE = 0
+
+
+def separate_in_chunks(
+    input_file: str,
+    output_dir: str,
+    model_filename: str,
+    model_file_dir: str,
+    custom_output_names: Dict[str, str],
+    config: ChunkingConfig,
+    use_processes: bool,
+    max_threads: int = 2,
+) -> Optional[Dict[str, Path]]:
+    """
+    Separate ``input_file`` window by window and write one WAV per output name into ``output_dir``.
+    Returns the merged stem paths, or ``None`` when any chunk produced no stems.
+    """
+    info = sf.info(input_file)
+    sr_in = info.samplerate
+    chunks = plan_chunks(
+        info.frames,
+        int(config.chunk_seconds * sr_in),
+        int(config.overlap_seconds * sr_in),
+    )
+    work_dir = Path(output_dir) / "_separation_chunks"
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    logger.info(
+        "🧩 Separating %s in %d chunks of %.0fs (overlap %.1fs) on %s",
+        Path(input_file).name, len(chunks), config.chunk_seconds, config.overlap_seconds,
+        "worker processes" if use_processes else "threads",
+    )
+
+    jobs = []
+    with sf.SoundFile(input_file) as source:
+        for index, (start, end) in enumerate(chunks):
+            chunk_dir = work_dir / f"{index:04d}"
+            chunk_dir.mkdir()
+            chunk_input = chunk_dir / "input.wav"
+            source.seek(start)
+            with sf.SoundFile(
+                str(chunk_input), "w", samplerate=sr_in, channels=info.channels, format="WAV", subtype=info.subtype,
+            ) as chunk_file:
+                remaining = end - start
+                while remaining > 0:
+                    block = source.read(min(BLOCK_FRAMES, remaining), dtype="float32", always_2d=True)
+                    if not len(block):
+                        break
+                    chunk_file.write(block)
+                    remaining -= len(block)
+            jobs.append((str(chunk_input), str(chunk_dir), model_filename, model_file_dir, custom_output_names))
+
+    owned_executor: Optional[Executor] = None
+    if use_processes:
+        executor: Executor = _cpu_executor(config)
+    else:
+        executor = owned_executor = ThreadPoolExecutor(max_workers=max(1, max_threads))
+    try:
+        futures = [executor.submit(_separate_chunk, job) for job in jobs]
+        results = [future.result() for future in futures]
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=True)
+
+    names = list(custom_output_names.values())
+    if any(set(result) != set(names) for result in results):
+        logger.warning("Chunked separation produced incomplete stems; discarding chunk outputs")
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return None
+
+    outputs: Dict[str, Path] = {}
+    for name in names:
+        first = sf.info(results[0][name])
+        ratio = first.samplerate / sr_in
+        bounds = [(round(start * ratio), round(end * ratio)) for start, end in chunks]
+        target = Path(output_dir) / f"{name}.wav"
+        with sf.SoundFile(
+            str(target), "w", samplerate=first.samplerate, channels=first.channels, format="WAV", subtype=first.subtype,
+        ) as sink:
+            writer = OverlapAddWriter(sink)
+            for index, (start, end) in enumerate(bounds):
+                data, _ = sf.read(results[index][name], dtype="float32", always_2d=True)
+                next_start = bounds[index + 1][0] if index + 1 < len(bounds) else None
+                writer.add(_fit_length(data, end - start, first.channels), start, next_start)
+        outputs[name] = target
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return outputs
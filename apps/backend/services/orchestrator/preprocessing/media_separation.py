@@ -1,5 +1,6 @@
 from audio_separator.separator import Separator
 from pathlib import Path
+from preprocessing.separator_pool import SEPARATOR_POOL, ModelLoadError as _ModelLoadError
 import os
 import subprocess
 import logging
@@ -30,24 +31,26 @@ def separation(input_file: str, output_dir: str, model_filename: str, output_for
     
     # audio-separator v0.39.0+ automatically uses CUDA when available
     # No need for use_cuda parameter - it auto-detects
-    separator = Separator(
-        output_format=output_format, 
-        output_dir=output_dir, 
-        model_file_dir=model_file_dir,
-        log_level=logging.INFO
-    )
-    
     # Log GPU status
     if torch.cuda.is_available():
         logger.info(f"✅ Audio separator will use CUDA (auto-detected)")
     else:
         logger.info(f"ℹ️  Audio separator using CPU")
     
+    # Loaded models are kept warm in the pool; only the first use of a model downloads/loads it
     try:
-        separator.load_model(model_filename=model_filename)
-    except TypeError as e:
-        # Handle audio_separator library bug where missing YAML config returns None
-        if "'NoneType' object does not support item assignment" in str(e):
+        return SEPARATOR_POOL.separate(
+            input_file=input_file,
+            output_dir=output_dir,
+            model_filename=model_filename,
+            output_format=output_format,
+            custom_output_names=custom_output_names,
+            model_file_dir=model_file_dir,
+        )
+    except _ModelLoadError as exc:
+        error = exc.__cause__
+        if isinstance(error, TypeError) and "'NoneType' object does not support item assignment" in str(error):
+            # Handle audio_separator library bug where missing YAML config returns None
             logger.error("=" * 70)
             logger.error("⚠️  AUDIO SEPARATOR MODEL CONFIG ERROR")
             logger.error(f"   Model: {model_filename}")
@@ -57,16 +60,12 @@ def separation(input_file: str, output_dir: str, model_filename: str, output_for
             logger.warning("Falling back to no audio separation - using full audio for dubbing")
             # Return None to indicate separation failed - caller should handle
             return None, None
-        else:
+        if isinstance(error, TypeError):
             # Different TypeError - re-raise
-            raise
-    except Exception as e:
-        logger.error(f"Failed to load audio separation model: {e}")
+            raise error
+        logger.error(f"Failed to load audio separation model: {error}")
         logger.warning("Falling back to no audio separation")
         return None, None
-    
-    output_files = separator.separate(input_file, custom_output_names=custom_output_names)
-    return output_files
 
 
 def filter_supported_models_grouped(stems_count: int = 2, contains: str = "vocals") -> Dict:
@@ -0,0 +1,141 @@
+"""
+Decide whether source separation is worth running on an input.
+
+The raw audio is streamed in blocks, downmixed and downsampled, and a few
+frame-level features are computed with vectorized NumPy: frame energy,
+spectral flatness and a harmonic/percussive split (median filtering over time
+and frequency). An energy VAD splits frames into speech and gaps. Clean speech
+(podcasts, voice-overs) has near-silent, noise-like gaps; a music bed or
+ambience keeps the gaps loud and/or tonal, which is what separation removes.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from math import gcd
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import soundfile as sf
+from scipy.ndimage import median_filter
+from scipy.signal import resample_poly
+
+logger = logging.getLogger(__name__)
+
+EPS = 1e-10
+
+
+@dataclass(frozen=True)
+class AnalysisThresholds:
+    sample_rate: int = 8000
+    block_seconds: float = 60.0
+    max_background_db: float = -35.0      # gap level relative to speech level
+    tonal_flatness: float = 0.2           # gaps flatter than this look like noise, below like music
+    min_harmonic_ratio_db: float = 3.0    # harmonic over percussive energy in the gaps
+    min_speech_coverage: float = 0.25     # fraction of frames with speech
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "AnalysisThresholds":
+        known = {key: cfg[key] for key in cls.__dataclass_fields__ if key in cfg}
+        return cls(**known)
+
+
+@dataclass(frozen=True)
+class SeparationAnalysis:
+    label: str
+    needs_separation: bool
+    reason: str
+    speech_coverage: float
+    background_db: float
+    gap_flatness: float
+    gap_harmonic_ratio_db: float
+    analyzed_seconds: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _frame_features(block: np.ndarray, n_fft: int, hop: int) -> Dict[str, np.ndarray]:
+    if len(block) < n_fft:
+        block = np.pad(block, (0, n_fft - len(block)))
+    frames = np.lib.stride_tricks.sliding_window_view(block, n_fft)[::hop]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1)).astype(np.float32)
+    power = spectrum ** 2 + EPS
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    # HPSS on 64 pooled bands keeps the median filters cheap; the split only needs to be coarse
+    bands = spectrum[:, : n_fft // 2].reshape(len(frames), 64, -1).sum(axis=2)
+    harmonic = median_filter(bands, size=(9, 1), mode="nearest")
+    percussive = median_filter(bands, size=(1, 9), mode="nearest")
+    harmonic_mask = harmonic >= percussive
+    band_power = bands ** 2
+    return {
+        "energy_db": 10.0 * np.log10(np.mean(frames ** 2, axis=1) + EPS),
+        "flatness": flatness,
+        "harmonic": np.sum(band_power * harmonic_mask, axis=1),
+        "percussive": np.sum(band_power * ~harmonic_mask, axis=1),
+    }
+
+
+def analyze_separation_need(audio_path: Path | str, thresholds: Optional[AnalysisThresholds] = None) -> SeparationAnalysis:
+    """Classify ``audio_path`` as clean speech or speech with background."""
+    thresholds = thresholds or AnalysisThresholds()
+    target_sr = thresholds.sample_rate
+    n_fft, hop = 512, 256
+    parts: Dict[str, list] = {"energy_db": [], "flatness": [], "harmonic": [], "percussive": []}
+    analyzed = 0.0
+
+    with sf.SoundFile(str(audio_path)) as source:
+        divisor = gcd(target_sr, source.samplerate)
+        up, down = target_sr // divisor, source.samplerate // divisor
+        block_frames = int(thresholds.block_seconds * source.samplerate)
+        for block in source.blocks(blocksize=block_frames, dtype="float32", always_2d=True):
+            mono = block.mean(axis=1)
+            analyzed += len(mono) / source.samplerate
+            if up != down:
+                mono = resample_poly(mono, up, down).astype(np.float32)
+            for key, values in _frame_features(mono, n_fft, hop).items():
+                parts[key].append(values)
+
+    features = {key: np.concatenate(values) for key, values in parts.items()}
+    energy_db = features["energy_db"]
+
+    # Energy VAD: frames in the upper half of the (noise floor, speech level) range are speech
+    floor, peak = np.percentile(energy_db, [10, 95])
+    has_gaps = peak - floor > 10.0
+    speech = (energy_db > floor + 0.5 * (peak - floor)) & has_gaps
+    gaps = ~speech
+    coverage = float(np.mean(speech))
+
+    if speech.any() and gaps.any():
+        background_db = float(np.median(energy_db[gaps]) - np.median(energy_db[speech]))
+        gap_flatness = float(np.median(features["flatness"][gaps]))
+        gap_hr_db = float(10.0 * np.log10(
+            (np.sum(features["harmonic"][gaps]) + EPS) / (np.sum(features["percussive"][gaps]) + EPS)
+        ))
+    else:
+        background_db, gap_flatness, gap_hr_db = 0.0, 0.0, 0.0
+
+    tonal_gaps = gap_flatness < thresholds.tonal_flatness and gap_hr_db > thresholds.min_harmonic_ratio_db
+    if not has_gaps:
+        needs, reason = True, "no quiet gaps (continuous background)"
+    elif coverage < thresholds.min_speech_coverage:
+        needs, reason = True, "little speech detected"
+    elif background_db > thresholds.max_background_db:
+        needs, reason = True, "audible background between speech"
+    elif tonal_gaps and background_db > thresholds.max_background_db - 10.0:
+        needs, reason = True, "quiet tonal background (music bed)"
+    else:
+        needs, reason = False, "near-silent, noise-like gaps"
+
+    return SeparationAnalysis(
+        label="speech_with_background" if needs else "clean_speech",
+        needs_separation=needs,
+        reason=reason,
+        speech_coverage=round(coverage, 3),
+        background_db=round(background_db, 1),
+        gap_flatness=round(gap_flatness, 3),
+        gap_harmonic_ratio_db=round(gap_hr_db, 1),
+        analyzed_seconds=round(analyzed, 1),
+    )
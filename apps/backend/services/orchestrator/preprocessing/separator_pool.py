@@ -0,0 +1,129 @@
+"""
+Pool of warm audio-separator instances.
+
+Loading a Roformer checkpoint costs seconds to minutes, so separators are kept
+loaded per (model filename, model dir, output format) and checked out for one
+separation at a time. Concurrency is bounded by ``max_concurrent``; the model
+download/load is guarded by a per-model file lock so concurrent jobs (and
+worker processes) never read a checkpoint that is still being downloaded.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts rely on the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]
+
+
+class ModelLoadError(RuntimeError):
+    """Raised when a separator model cannot be downloaded or loaded."""
+
+
+@contextmanager
+def model_file_lock(model_file_dir: str, model_filename: str) -> Iterator[None]:
+    """Exclusive lock on a model's files, shared by every worker process."""
+    Path(model_file_dir).mkdir(parents=True, exist_ok=True)
+    lock_path = Path(model_file_dir) / f".{Path(model_filename).name}.lock"
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class SeparatorPool:
+    """Keeps loaded ``Separator`` instances per model and bounds concurrent runs."""
+
+    def __init__(self, max_concurrent: int = 2, max_idle_per_model: int = 2) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_idle_per_model = max(1, int(max_idle_per_model))
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, List[object]] = defaultdict(list)
+        self._model_locks: Dict[PoolKey, threading.Lock] = defaultdict(threading.Lock)
+
+    def configure(self, *, max_concurrent: int, max_idle_per_model: int) -> None:
+        with self._lock:
+            self.max_concurrent = max(1, int(max_concurrent))
+            self.max_idle_per_model = max(1, int(max_idle_per_model))
+            self._slots = threading.BoundedSemaphore(self.max_concurrent)
+
+    def _load(self, key: PoolKey):
+        from audio_separator.separator import Separator
+
+        model_filename, model_file_dir, output_format = key
+        separator = Separator(
+            output_format=output_format,
+            model_file_dir=model_file_dir,
+            log_level=logging.INFO,
+        )
+        # Only one loader per model at a time, in this process and across workers,
+        # so a half-downloaded checkpoint is never read.
+        with self._model_locks[key], model_file_lock(model_file_dir, model_filename):
+            try:
+                separator.load_model(model_filename=model_filename)
+            except Exception as exc:
+                raise ModelLoadError(f"Could not load separation model {model_filename}") from exc
+        logger.info("🔥 Loaded separator model %s into the pool", model_filename)
+        return separator
+
+    @contextmanager
+    def checkout(self, model_filename: str, model_file_dir: str, output_format: str) -> Iterator[object]:
+        """Borrow a loaded separator; blocks while ``max_concurrent`` runs are active."""
+        key: PoolKey = (model_filename, str(model_file_dir), output_format)
+        slots = self._slots
+        slots.acquire()
+        try:
+            with self._lock:
+                idle = self._idle[key]
+                separator = idle.pop() if idle else None
+            if separator is None:
+                separator = self._load(key)
+            try:
+                yield separator
+            finally:
+                with self._lock:
+                    if len(self._idle[key]) < self.max_idle_per_model:
+                        self._idle[key].append(separator)
+        finally:
+            slots.release()
+
+    def separate(
+        self,
+        input_file: str,
+        output_dir: str,
+        model_filename: str,
+        output_format: str,
+        custom_output_names: dict,
+        model_file_dir: str,
+    ) -> List[str]:
+        with self.checkout(model_filename, model_file_dir, output_format) as separator:
+            separator.output_dir = output_dir
+            if getattr(separator, "model_instance", None) is not None:
+                separator.model_instance.output_dir = output_dir
+            return separator.separate(input_file, custom_output_names=custom_output_names)
+
+    def clear(self) -> None:
+        """Drop every idle separator (frees model memory)."""
+        with self._lock:
+            self._idle.clear()
+
+
+SEPARATOR_POOL = SeparatorPool()
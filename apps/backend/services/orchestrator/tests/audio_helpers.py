@@ -0,0 +1,35 @@
+"""Synthetic audio for tests that need real sound files."""
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+def sine(seconds: float, sr: int, freq: float = 440.0, amplitude: float = 0.3) -> np.ndarray:
+    """Mono float32 sine of ``seconds`` at ``sr``."""
+    t = np.arange(int(round(seconds * sr))) / sr
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def write_audio(path: Path, audio: np.ndarray, sr: int, channels: int = 1, subtype: Optional[str] = None) -> Path:
+    """Write ``audio`` to ``path``; mono input is repeated onto ``channels`` channels."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim == 1 and channels > 1:
+        audio = np.repeat(audio[:, None], channels, axis=1)
+    sf.write(str(path), audio, sr, subtype=subtype)
+    return path
+
+
+def write_tone(
+    path: Path,
+    seconds: float,
+    sr: int,
+    freq: float = 440.0,
+    amplitude: float = 0.3,
+    channels: int = 1,
+    subtype: Optional[str] = None,
+) -> Path:
+    """Write a sine test tone to ``path``."""
+    return write_audio(path, sine(seconds, sr, freq, amplitude), sr, channels, subtype)
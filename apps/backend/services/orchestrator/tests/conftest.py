@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Let test modules import the orchestrator packages (app, media_processing, ...) directly
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from media_processing.resampling import RESAMPLER  # noqa: E402
+from media_processing.stretch_cache import STRETCH_CACHE  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep module-level caches, which app.main points at apps/backend/cache, inside the test's tmp_path."""
+    monkeypatch.setattr(RESAMPLER, "cache_root", tmp_path / "resampled_segments")
+    monkeypatch.setattr(RESAMPLER, "_on_lookup", None)
+    # Off unless a test turns it on, so results never depend on whether app.main was imported
+    monkeypatch.setattr(STRETCH_CACHE, "root", None)
+    monkeypatch.setattr(STRETCH_CACHE, "_on_lookup", None)
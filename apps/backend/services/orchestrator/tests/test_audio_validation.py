@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from media_processing import audio_validation
+from media_processing.audio_validation import (
+    check_audio_file,
+    validate_audio_quality,
+    validate_segment_audio,
+    validate_segments_batch,
+)
+from tests.audio_helpers import write_audio
+
+SR = 24000
+
+
+def _speech(seconds=1.0):
+    return 0.3 * np.sin(np.arange(int(SR * seconds)) * 0.05)
+
+
+def test_each_check_reports_its_failure(tmp_path):
+    corrupted = _speech(2.0)
+    corrupted[-10] = np.nan
+    clipped = _speech(1.0) * 8
+    cases = {
+        "good": (_speech(), ""),
+        "short": (_speech(0.01), "duration"),
+        "silent": (np.zeros(SR), "silence"),
+        "nan": (corrupted, "nan"),
+        "clipped": (clipped, "clipping"),
+    }
+    for name, (audio, check) in cases.items():
+        result = check_audio_file(write_audio(tmp_path / f"{name}.wav", audio, SR, subtype="FLOAT"), min_duration=0.05)
+        assert result.check == check, name
+        assert result.valid == (check == "")
+    assert check_audio_file(tmp_path / "missing.wav").check == "read"
+
+
+def test_nan_fails_on_first_bad_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_validation, "VALIDATION_BLOCK_FRAMES", 1000)
+    audio = _speech(10.0)
+    audio[10] = np.inf
+    audio[-10] = np.nan
+    result = check_audio_file(write_audio(tmp_path / "inf.wav", audio, SR, subtype="FLOAT"))
+    assert result.check == "inf"
+
+
+def test_wrappers_keep_their_contract(tmp_path):
+    path = write_audio(tmp_path / "seg.wav", _speech(1.0), SR, subtype="PCM_16")
+    assert validate_audio_quality(path) == (True, "")
+    assert validate_segment_audio(path, expected_duration=1.2) == (True, "")
+    ok, error = validate_segment_audio(path, expected_duration=2.0)
+    assert not ok and error.startswith("Duration mismatch")
+
+
+def test_batch_report_lists_failures_in_order(tmp_path):
+    paths = [
+        write_audio(tmp_path / "a.wav", _speech(), SR, subtype="FLOAT"),
+        write_audio(tmp_path / "b.wav", np.zeros(SR), SR, subtype="FLOAT"),
+        write_audio(tmp_path / "c.wav", _speech(), SR, subtype="FLOAT"),
+        tmp_path / "missing.wav",
+    ]
+    report = validate_segments_batch(paths, expected_durations=[1.0, None, 3.0, None], max_workers=3)
+    assert [r.audio_path for r in report.results] == [str(p) for p in paths]
+    assert report.failed_indices == [1, 2, 3]
+    assert not report.valid
+    summary = report.to_dict()
+    assert summary["checked"] == 4 and [f["index"] for f in summary["failures"]] == [1, 2, 3]
+    assert [f["check"] for f in summary["failures"]] == ["silence", "duration", "read"]
+    assert report.results[0].duration == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_only_invalid_tts_segments_are_resynthesized(tmp_path, monkeypatch):
+    from app import main as orchestrator_main
+    from common_schemas.models import SegmentAudioIn, SegmentAudioOut, TTSResponse
+
+    good = write_audio(tmp_path / "good.wav", _speech(), SR, subtype="FLOAT")
+    silent = write_audio(tmp_path / "silent.wav", np.zeros(SR), SR, subtype="FLOAT")
+    fixed = write_audio(tmp_path / "fixed.wav", _speech(), SR, subtype="FLOAT")
+    requested = []
+
+    async def fake_request_tts(client, tts_model, segments, target_lang, workspace_path):  # noqa: ANN001
+        requested.extend(seg.segment_id for seg in segments)
+        return TTSResponse(segments=[SegmentAudioOut(audio_url=str(fixed), text="b", segment_id="s2")])
+
+    monkeypatch.setattr(orchestrator_main, "request_tts", fake_request_tts)
+    monkeypatch.setitem(orchestrator_main.SINGLE_FLIGHT_CFG, "tts_segment_cache", False)
+    tts_result = TTSResponse(segments=[
+        SegmentAudioOut(audio_url=str(good), text="a", segment_id="s1"),
+        SegmentAudioOut(audio_url=str(silent), text="b", segment_id="s2"),
+    ])
+    inputs = [
+        SegmentAudioIn(start=0.0, end=1.0, text="a", lang="fr", segment_id="s1"),
+        SegmentAudioIn(start=1.0, end=2.0, text="b", lang="fr", segment_id="s2"),
+    ]
+    tts_result, report = await orchestrator_main.resynthesize_invalid_segments(
+        None, "model", tts_result, inputs, [None, None], "fr", tmp_path
+    )
+    assert requested == ["s2"]
+    assert report.valid
+    assert [seg.audio_url for seg in tts_result.segments] == [str(good), str(fixed)]
+
+
+@pytest.mark.asyncio
+async def test_resynthesis_reuses_the_original_cache_keys(tmp_path, monkeypatch):
+    from app import main as orchestrator_main
+    from common_schemas.models import SegmentAudioIn, SegmentAudioOut, TTSResponse
+
+    silent = write_audio(tmp_path / "silent.wav", np.zeros(SR), SR, subtype="FLOAT")
+    fixed = write_audio(tmp_path / "fixed.wav", _speech(), SR, subtype="FLOAT")
+    stored = []
+
+    async def fake_request_tts(client, tts_model, segments, target_lang, workspace_path):  # noqa: ANN001
+        # The TTS service may echo a normalized text; the cache key must still come from the request
+        return TTSResponse(segments=[SegmentAudioOut(audio_url=str(fixed), text="B.", segment_id="s1")])
+
+    def unexpected_key(*args):  # noqa: ANN001
+        raise AssertionError("cache key recomputed")
+
+    monkeypatch.setattr(orchestrator_main, "request_tts", fake_request_tts)
+    monkeypatch.setattr(orchestrator_main, "tts_segment_cache_key", unexpected_key)
+    monkeypatch.setattr(orchestrator_main, "store_cached_tts_segment", lambda key, out: stored.append((key, out.audio_url)))
+    monkeypatch.setitem(orchestrator_main.SINGLE_FLIGHT_CFG, "tts_segment_cache", True)
+    tts_result = TTSResponse(segments=[SegmentAudioOut(audio_url=str(silent), text="b", segment_id="s1")])
+    inputs = [SegmentAudioIn(start=0.0, end=1.0, text="b", lang="fr", segment_id="s1")]
+
+    _, report = await orchestrator_main.resynthesize_invalid_segments(
+        None, "model", tts_result, inputs, ["key-s1"], "fr", tmp_path
+    )
+    assert report.valid
+    assert stored == [("key-s1", str(fixed))]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from media_processing import batch_stretch
+from media_processing.batch_stretch import StretchJob, run_stretch_jobs
+from media_processing.media_info import MEDIA_INFO
+from media_processing.strict_timing import plan_segment_adjustment
+from media_processing.time_stretch import StretchPolicy, fit_length
+from tests.audio_helpers import write_tone
+
+SR = 24000
+
+
+def test_fit_length_pads_and_trims():
+    assert fit_length(np.ones(10), 4).shape == (4,)
+    padded = fit_length(np.ones((3, 2)), 5)
+    assert padded.shape == (5, 2) and not padded[3:].any()
+
+
+def test_plan_segment_adjustment():
+    assert plan_segment_adjustment(2.005, 2.0) == (None, False, pytest.approx(1.0025))
+    assert plan_segment_adjustment(2.4, 2.0)[:2] == (2.0, False)
+    target, warning, ratio = plan_segment_adjustment(3.0, 2.0, max_speed_ratio=1.2)
+    assert warning and ratio == pytest.approx(1.5) and target == pytest.approx(2.5)
+
+
+def test_failures_are_reported_per_job_in_order(tmp_path):
+    jobs = [StretchJob(str(tmp_path / f"missing_{i}.wav"), str(tmp_path / f"out_{i}.wav"), 1000) for i in range(4)]
+    try:
+        results = run_stretch_jobs(jobs)
+    finally:
+        batch_stretch.shutdown()
+    assert [r.output_path for r in results] == [job.output_path for job in jobs]
+    assert all(not r.ok for r in results)
+
+
+def test_durations_come_from_written_buffers(tmp_path):
+    src = write_tone(tmp_path / "in.wav", 1.0, SR, freq=220.0)
+    policy = StretchPolicy(engine="vocoder")
+    jobs = [StretchJob.for_duration(src, tmp_path / f"out_{i}.wav", 0.8 + 0.1 * i, policy=policy) for i in range(3)]
+    try:
+        results = run_stretch_jobs(jobs)
+    finally:
+        batch_stretch.shutdown()
+    probes = MEDIA_INFO.probes
+    for i, result in enumerate(results):
+        assert result.ok
+        assert result.duration == pytest.approx(0.8 + 0.1 * i, abs=1 / SR)
+        assert MEDIA_INFO.probe(result.output_path).duration == result.duration
+    assert MEDIA_INFO.probes == probes
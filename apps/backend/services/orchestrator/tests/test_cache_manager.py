@@ -0,0 +1,74 @@
+import os
+import time
+from pathlib import Path
+
+from caching.cache_manager import CacheArea, CacheManager
+
+
+def _make_entry(root: Path, name: str, size: int, age_seconds: float) -> Path:
+    entry = root / name
+    entry.mkdir(parents=True, exist_ok=True)
+    (entry / "data.bin").write_bytes(b"x" * size)
+    stamp = time.time() - age_seconds
+    os.utime(entry, (stamp, stamp))
+    return entry
+
+
+def test_sweep_evicts_least_recently_used_over_budget(tmp_path):
+    root = tmp_path / "separation"
+    manager = CacheManager(
+        [CacheArea("separation", root, depth=1, max_bytes=250)],
+        tmp_path / "index.json",
+        min_age_seconds=0,
+    )
+    oldest = _make_entry(root, "a", 100, age_seconds=300)
+    middle = _make_entry(root, "b", 100, age_seconds=200)
+    newest = _make_entry(root, "c", 100, age_seconds=100)
+
+    # Reading "a" makes it the most recently used entry.
+    manager.record_lookup("separation", True, oldest / "data.bin")
+    evicted = manager.sweep()
+
+    assert evicted == {"separation": 1}
+    assert oldest.exists() and newest.exists()
+    assert not middle.exists()
+    stats = manager.stats()["areas"]["separation"]
+    assert stats["bytes_used"] == 200
+    assert stats["hit_rate"] == 1.0
+    assert stats["evictions"] == 1
+
+
+def test_leased_and_recent_entries_survive_ttl(tmp_path):
+    root = tmp_path / "outs"
+    manager = CacheManager(
+        [CacheArea("outputs", root, depth=1, ttl_seconds=60)],
+        tmp_path / "index.json",
+        min_age_seconds=30,
+    )
+    leased = _make_entry(root, "running-job", 10, age_seconds=3600)
+    expired = _make_entry(root, "old-job", 10, age_seconds=3600)
+    recent = _make_entry(root, "new-job", 10, age_seconds=5)
+
+    manager.acquire("running-job", leased)
+    os.utime(leased, (time.time() - 3600, time.time() - 3600))
+    manager.sweep()
+
+    assert leased.exists() and recent.exists()
+    assert not expired.exists()
+
+    manager.release("running-job")
+    assert manager.stats()["active_leases"] == 0
+
+
+def test_access_times_persist_across_instances(tmp_path):
+    root = tmp_path / "raw"
+    entry = _make_entry(root / "ab", "abcdef", 10, age_seconds=1000)
+    index = tmp_path / "index.json"
+
+    first = CacheManager([CacheArea("raw_audio", root, depth=2, ttl_seconds=500)], index, min_age_seconds=0)
+    first.touch(entry / "data.bin")
+    first.flush_index()
+
+    second = CacheManager([CacheArea("raw_audio", root, depth=2, ttl_seconds=500)], index, min_age_seconds=0)
+    second.sweep()
+    assert entry.exists()
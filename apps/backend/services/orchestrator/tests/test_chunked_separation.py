@@ -0,0 +1,52 @@
+import numpy as np
+
+from preprocessing.chunked_separation import OverlapAddWriter, plan_chunks
+
+
+class _Sink:
+    def __init__(self):
+        self.blocks = []
+
+    def write(self, block):
+        self.blocks.append(np.asarray(block))
+
+    def data(self):
+        return np.concatenate(self.blocks)
+
+
+def test_plan_chunks_covers_source_with_overlap():
+    chunks = plan_chunks(1000, 300, 50)
+    assert chunks[0] == (0, 300)
+    assert chunks[-1][1] == 1000
+    for (_, prev_end), (start, _) in zip(chunks, chunks[1:]):
+        assert prev_end - start == 50
+    # A remainder shorter than a quarter chunk is folded into the last window
+    assert plan_chunks(620, 300, 50)[-1] == (250, 620)
+    assert plan_chunks(200, 300, 50) == [(0, 200)]
+
+
+def test_overlap_add_reconstructs_identical_chunks():
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal((5000, 2)).astype(np.float32)
+    chunks = plan_chunks(len(signal), 1200, 200)
+
+    sink = _Sink()
+    writer = OverlapAddWriter(sink)
+    for index, (start, end) in enumerate(chunks):
+        next_start = chunks[index + 1][0] if index + 1 < len(chunks) else None
+        writer.add(signal[start:end], start, next_start)
+
+    np.testing.assert_allclose(sink.data(), signal, atol=1e-6)
+
+
+def test_overlap_add_crossfades_between_chunks():
+    chunks = [(0, 100), (60, 200)]
+    sink = _Sink()
+    writer = OverlapAddWriter(sink)
+    writer.add(np.zeros((100, 1), dtype=np.float32), 0, 60)
+    writer.add(np.ones((140, 1), dtype=np.float32), 60, None)
+
+    merged = sink.data()[:, 0]
+    assert len(merged) == chunks[-1][1]
+    assert np.all(merged[:60] == 0) and np.all(merged[100:] == 1)
+    assert np.all(np.diff(merged[60:100]) > 0)
@@ -0,0 +1,191 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from fastapi import HTTPException
+
+from app import main as orchestrator_main
+from caching.cache_manager import CacheArea, CacheManager
+
+
+def _lease_count():
+    return orchestrator_main.CACHE_MANAGER.stats()["active_leases"]
+
+
+async def _defer_french_render(workspace):
+    temp_audio = workspace.make_temp_dir("audio_processing_fr") / "final_dubbed_audio_fr.wav"
+    temp_audio.write_bytes(b"RIFF")
+    subtitles = workspace.make_temp_dir("subtitles") / "dubbed_fr.vtt"
+    subtitles.write_text("WEBVTT\n")
+    output = workspace.file_path("dubbed_video_fr_with_default_subs.mp4")
+    await orchestrator_main.defer_final_render(
+        workspace,
+        "fr",
+        workspace.workspace / "source.mp4",
+        temp_audio,
+        workspace.file_path("dubbed_video_fr.mp4"),
+        output,
+        subtitles,
+        "default_mobile",
+        "default",
+    )
+    return output
+
+
+@pytest.fixture
+def outputs_area(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator_main, "OUTS", tmp_path)
+    manager = CacheManager([CacheArea("outputs", tmp_path, depth=1)], tmp_path / ".index.json", min_age_seconds=0)
+    monkeypatch.setattr(orchestrator_main, "CACHE_MANAGER", manager)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_deferred_render_runs_once_on_approval(monkeypatch, outputs_area):
+    workspace = orchestrator_main.WorkspaceManager.create(outputs_area, persist_intermediate=False)
+    output = await _defer_french_render(workspace)
+    # The workspace outlives the run's own lease until the render is approved
+    assert _lease_count() == 1
+    # The run's temp dirs are gone by the time the reviewer approves
+    for path in workspace.temp_dirs:
+        for item in path.iterdir():
+            item.unlink()
+    assert orchestrator_main.pending_render_outputs(workspace.workspace) == {"fr": str(output)}
+
+    calls = []
+
+    async def fake_finalize_media(video_path, audio_path, dubbed_path, output_path, subtitle_path, style, mobile, strategy):  # noqa: ANN001
+        assert audio_path.exists() and subtitle_path.exists()
+        assert _lease_count() == 2
+        calls.append((audio_path.parent.name, style, mobile, strategy))
+        await asyncio.sleep(0)
+        Path(output_path).write_bytes(b"mp4")
+
+    async def fake_copy_to_persistent_storage(*args):  # noqa: ANN001
+        return True
+
+    monkeypatch.setattr(orchestrator_main, "finalize_media", fake_finalize_media)
+    monkeypatch.setattr(orchestrator_main, "copy_to_persistent_storage", fake_copy_to_persistent_storage)
+
+    first, second = await asyncio.gather(
+        orchestrator_main.render_pending_outputs(workspace.workspace_id),
+        orchestrator_main.render_pending_outputs(workspace.workspace_id),
+    )
+
+    assert first == {"fr": str(output)} and second == {}
+    assert calls == [("fr", orchestrator_main.STYLE_PRESETS["default"], True, "default")]
+    assert output.exists()
+    assert orchestrator_main.pending_render_outputs(workspace.workspace) == {}
+    assert not (workspace.workspace / orchestrator_main.RENDER_PLAN_FILE).exists()
+    assert not (workspace.workspace / "render" / "fr").exists()
+    assert _lease_count() == 0
+    assert workspace.workspace_id not in orchestrator_main.RENDER_LOCKS
+
+
+@pytest.mark.asyncio
+async def test_download_of_a_render_whose_inputs_are_gone_is_410(monkeypatch, outputs_area):
+    workspace = orchestrator_main.WorkspaceManager.create(outputs_area, persist_intermediate=False)
+    output = await _defer_french_render(workspace)
+
+    async def missing_source(video_path, *args):  # noqa: ANN001
+        raise FileNotFoundError(video_path)
+
+    monkeypatch.setattr(orchestrator_main, "finalize_media", missing_source)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await orchestrator_main.download_video(workspace.workspace_id, output.name)
+
+    assert excinfo.value.status_code == 410
+    assert orchestrator_main.pending_render_outputs(workspace.workspace) == {"fr": str(output)}
+    assert _lease_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_unapproved_render_expires_and_releases_its_workspace(monkeypatch, outputs_area):
+    workspace = orchestrator_main.WorkspaceManager.create(outputs_area, persist_intermediate=False)
+    output = await _defer_french_render(workspace)
+    plan = orchestrator_main.load_render_plan(workspace.workspace)
+    plan["fr"]["deferred_at"] -= 2 * 3600
+    orchestrator_main.save_render_plan(workspace.workspace, plan)
+    monkeypatch.setattr(orchestrator_main, "PREVIEW_PENDING_TTL", 3600.0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await orchestrator_main.download_video(workspace.workspace_id, output.name)
+
+    assert excinfo.value.status_code == 410
+    assert not (workspace.workspace / orchestrator_main.RENDER_PLAN_FILE).exists()
+    assert not (workspace.workspace / "render" / "fr").exists()
+    assert _lease_count() == 0
+    assert workspace.workspace_id not in orchestrator_main.RENDER_LOCKS
+
+
+@pytest.mark.asyncio
+async def test_approved_render_rebuilds_draft_audio_at_the_default_tier(monkeypatch, outputs_area):
+    workspace = orchestrator_main.WorkspaceManager.create(outputs_area, persist_intermediate=False)
+    tts_dir = workspace.make_temp_dir("tts_fr")
+    segments = []
+    for index in range(2):
+        (tts_dir / f"seg{index}.wav").write_bytes(b"RIFF")
+        segments.append({"audio_url": str(tts_dir / f"seg{index}.wav"), "start": index, "end": index + 1})
+    background = tts_dir / "background.wav"
+    background.write_bytes(b"RIFF")
+    draft_audio = workspace.make_temp_dir("audio_processing_fr") / "final_dubbed_audio_fr.wav"
+    draft_audio.write_bytes(b"RIFF")
+    output = workspace.file_path("dubbed_video_fr.mp4")
+
+    await orchestrator_main.defer_final_render(
+        workspace, "fr", workspace.workspace / "source.mp4", draft_audio, output, None, None, None, "full_replacement",
+        speech={
+            "segments": segments,
+            "translation_segments": [],
+            "target_duration": 2.0,
+            "sample_rate": 44100,
+            "strict_timing": True,
+            "background_path": str(background),
+            "sophisticated": True,
+        },
+    )
+    for path in workspace.temp_dirs:
+        for item in path.iterdir():
+            item.unlink()
+
+    concatenated, overlaid, finalized = [], [], []
+
+    async def fake_concatenate_segments(**kwargs):  # noqa: ANN003
+        assert all(Path(seg["audio_url"]).exists() for seg in kwargs["tts_segments"])
+        concatenated.append(kwargs)
+        return str(kwargs["output_file"]), []
+
+    async def fake_overlay(segments, background_path, output_path, sophisticated, speech_track):  # noqa: ANN001
+        assert background_path.exists()
+        overlaid.append(output_path)
+
+    async def fake_finalize_media(video_path, audio_path, *args):  # noqa: ANN001
+        finalized.append(audio_path)
+
+    monkeypatch.setattr(orchestrator_main, "concatenate_segments", fake_concatenate_segments)
+    monkeypatch.setattr(orchestrator_main, "overlay_segments_on_background", fake_overlay)
+    monkeypatch.setattr(orchestrator_main, "finalize_media", fake_finalize_media)
+    monkeypatch.setattr(orchestrator_main, "copy_to_persistent_storage", lambda *args: asyncio.sleep(0))
+
+    await orchestrator_main.render_pending_outputs(workspace.workspace_id)
+
+    assert len(concatenated) == 1 and "stretch_tier" not in concatenated[0]
+    assert concatenated[0]["sample_rate"] == 44100
+    assert finalized == overlaid
+
+
+@pytest.mark.asyncio
+async def test_concatenate_segments_forwards_the_stretch_tier(monkeypatch, tmp_path):
+    received = {}
+
+    def fake_concatenate_audio(**kwargs):  # noqa: ANN003
+        received.update(kwargs)
+        return kwargs["output_file"], kwargs["translation_segments"]
+
+    monkeypatch.setattr(orchestrator_main, "concatenate_audio", fake_concatenate_audio)
+
+    await orchestrator_main.concatenate_segments([], tmp_path / "speech.wav", 10.0, [], stretch_tier="draft")
+
+    assert received["stretch_tier"] == "draft"
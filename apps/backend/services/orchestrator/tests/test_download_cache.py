@@ -0,0 +1,59 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from caching.download_cache import RemoteMediaCache
+
+
+def _make_downloader(payload: bytes, calls: list):
+    async def _download(staging_dir: Path) -> Path:
+        calls.append(staging_dir)
+        await asyncio.sleep(0.05)
+        target = staging_dir / "clip.mp4"
+        target.write_bytes(payload)
+        return target
+
+    return _download
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_download(tmp_path):
+    cache = RemoteMediaCache(tmp_path, ttl_seconds=3600, max_bytes=10**6)
+    calls: list = []
+    download = _make_downloader(b"video-bytes", calls)
+
+    paths = await asyncio.gather(*[cache.fetch("https://example.com/watch?v=1", download) for _ in range(4)])
+
+    assert len(calls) == 1
+    assert len({str(p) for p in paths}) == 1
+    assert paths[0].read_bytes() == b"video-bytes"
+    assert cache.digest_for_path(paths[0]) == paths[0].stem
+
+    # A later request is served from the index without downloading again.
+    again = await cache.fetch("HTTPS://EXAMPLE.com/watch?v=1#t=10", download)
+    assert again == paths[0]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_downloaded_again(tmp_path):
+    cache = RemoteMediaCache(tmp_path, ttl_seconds=0, max_bytes=10**6)
+    calls: list = []
+    download = _make_downloader(b"abc", calls)
+
+    await cache.fetch("https://example.com/a", download)
+    await cache.fetch("https://example.com/a", download)
+
+    assert len(calls) == 2
+
+
+def test_size_budget_evicts_least_recently_used(tmp_path):
+    cache = RemoteMediaCache(tmp_path, ttl_seconds=3600, max_bytes=10)
+    for name, payload in (("a", b"123456"), ("b", b"abcdef")):
+        source = tmp_path / f"{name}.mp4"
+        source.write_bytes(payload)
+        cache.store(f"https://example.com/{name}", source)
+
+    assert cache.lookup("https://example.com/a") is None
+    assert cache.lookup("https://example.com/b") is not None
@@ -0,0 +1,124 @@
+from pathlib import Path
+
+from media_processing import final_pass
+from media_processing.subtitles_handling import SubtitleStyle
+
+
+def _graph(cmd):
+    return cmd[cmd.index("-filter_complex") + 1]
+
+
+def _stub_ffmpeg(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"mp4")
+
+    monkeypatch.setattr(final_pass.subprocess, "run", fake_run)
+    monkeypatch.setattr(final_pass, "get_audio_duration", lambda path: 12.5)
+    monkeypatch.setattr(final_pass, "build_subtitle_filter", lambda *args, **kwargs: "subtitles=subs.ass:original_size=1280x720")
+    return calls
+
+
+def _inputs(tmp_path):
+    video, audio = tmp_path / "source.mp4", tmp_path / "dub.wav"
+    video.write_bytes(b"v")
+    audio.write_bytes(b"a")
+    return video, audio
+
+
+def test_dub_with_subtitles_renders_in_one_pass(tmp_path, monkeypatch):
+    calls = _stub_ffmpeg(monkeypatch)
+    video, audio = _inputs(tmp_path)
+    dubbed, output = tmp_path / "dubbed_video_fr.mp4", tmp_path / "dubbed_video_fr_with_default_subs.mp4"
+
+    final_pass.final(video, audio, dubbed, output, tmp_path / "fr.vtt", SubtitleStyle(), dubbing_strategy="translation_over")
+
+    assert len(calls) == 1
+    cmd = calls[0]
+    graph = _graph(cmd)
+    assert "volume=0.2[orig]" in graph and "amix=inputs=2" in graph
+    assert "[0:v]subtitles=subs.ass:original_size=1280x720[vout]" in graph
+    assert cmd[cmd.index("-c:v") + 1] == "libx264"
+    assert ["-map", "[vout]"] == cmd[cmd.index("[vout]") - 1: cmd.index("[vout]") + 1]
+    assert cmd[-1] == str(output)
+    assert output.exists() and not dubbed.exists()
+
+
+def test_dub_without_subtitles_copies_the_video_stream(tmp_path, monkeypatch):
+    calls = _stub_ffmpeg(monkeypatch)
+    video, audio = _inputs(tmp_path)
+    dubbed = tmp_path / "dubbed_video_fr.mp4"
+
+    final_pass.final(video, audio, dubbed, "", None, None)
+
+    assert len(calls) == 1
+    cmd = calls[0]
+    assert _graph(cmd) == "[1:a]apad,atrim=0:12.500,asetpts=PTS-STARTPTS[aout]"
+    assert cmd[cmd.index("-c:v") + 1] == "copy"
+    assert "0:v:0" in cmd and cmd[-1] == str(dubbed)
+
+
+def test_subtitle_only_run_copies_the_original_audio(tmp_path):
+    cmd = final_pass.build_final_command("in.mp4", None, "out.mp4", "subtitles=s.ass")
+
+    assert cmd.count("-i") == 1
+    assert _graph(cmd) == "[0:v]subtitles=s.ass[vout]"
+    assert cmd[cmd.index("-c:a") + 1] == "copy"
+
+
+def test_multi_track_package_copies_the_video_once(tmp_path, monkeypatch):
+    calls = _stub_ffmpeg(monkeypatch)
+    video, _ = _inputs(tmp_path)
+    tracks = []
+    for lang in ("fr", "de", "pt-BR"):
+        audio = tmp_path / f"final_dubbed_audio_{lang}.wav"
+        audio.write_bytes(b"a")
+        subs = tmp_path / f"dubbed_{lang}.srt" if lang != "de" else None
+        tracks.append(final_pass.LanguageTrack(lang, str(audio), str(subs) if subs else None))
+
+    output = final_pass.package_languages(video, tracks, tmp_path / "dubbed_video_multi.mp4", "translation_over")
+
+    assert len(calls) == 1 and output.exists()
+    cmd = calls[0]
+    assert cmd.count("-i") == 1 + 3 + 2
+    assert cmd[cmd.index("-c:v") + 1] == "copy"
+    assert cmd[cmd.index("-c:s") + 1] == "mov_text"
+    graph = _graph(cmd)
+    assert graph.startswith("[0:a]asplit=3[src0][src1][src2];")
+    assert "[src2]atrim" in graph and "[a2]" in graph
+    maps = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"]
+    assert maps == ["0:v:0", "[a0]", "[a1]", "[a2]", "4:0", "5:0"]
+    assert ["-metadata:s:a:2", "language=por"] == cmd[cmd.index("-metadata:s:a:2"): cmd.index("-metadata:s:a:2") + 2]
+    assert ["-metadata:s:s:1", "language=por"] == cmd[cmd.index("-metadata:s:s:1"): cmd.index("-metadata:s:s:1") + 2]
+    assert cmd[cmd.index("-disposition:a:0") + 1] == "default"
+
+
+def test_language_tags_are_iso639_2():
+    assert final_pass.language_tag("en") == "eng"
+    assert final_pass.language_tag("zh_CN") == "zho"
+    assert final_pass.language_tag("yue") == "yue"
+    assert final_pass.language_tag("xx") == "und"
+
+
+def test_video_preview_scales_before_burning_and_uses_cheap_settings(monkeypatch):
+    monkeypatch.setattr(final_pass, "get_audio_duration", lambda path: 12.5)
+    settings = final_pass.PreviewSettings(height=240, crf=34, preset="ultrafast", audio_bitrate="48k")
+
+    cmd = final_pass.build_preview_command("in.mp4", "dub.wav", "preview_fr.mp4", settings, "subtitles=s.ass")
+
+    assert "[0:v]scale=-2:240,subtitles=s.ass[vout]" in _graph(cmd)
+    assert cmd[cmd.index("-preset") + 1] == "ultrafast" and cmd[cmd.index("-crf") + 1] == "34"
+    assert cmd[cmd.index("-b:a") + 1] == "48k"
+
+
+def test_audio_preview_has_no_video(monkeypatch):
+    monkeypatch.setattr(final_pass, "get_audio_duration", lambda path: 12.5)
+    settings = final_pass.PreviewSettings.from_config({"kind": "audio"})
+
+    cmd = final_pass.build_preview_command("in.mp4", "dub.wav", "preview_fr.ogg", settings)
+
+    assert settings.extension == ".ogg"
+    assert "-vn" in cmd and cmd[cmd.index("-c:a") + 1] == "libopus"
+    assert "[vout]" not in cmd
@@ -0,0 +1,66 @@
+import json
+import subprocess
+
+import numpy as np
+import soundfile as sf
+
+from media_processing import media_info
+from media_processing.media_info import MediaInfoService
+
+
+def test_audio_is_probed_once_until_rewritten(tmp_path):
+    path = tmp_path / "segment.wav"
+    sf.write(str(path), np.zeros((24000, 1), dtype=np.float32), 24000)
+    service = MediaInfoService()
+
+    for _ in range(5):
+        info = service.probe(path)
+    assert service.probes == 1
+    assert (info.duration, info.sample_rate, info.channels) == (1.0, 24000, 1)
+    assert not info.has_video
+
+    sf.write(str(path), np.zeros((48000, 2), dtype=np.float32), 24000)
+    info = service.probe(path)
+    assert service.probes == 2
+    assert (info.duration, info.channels) == (2.0, 2)
+
+
+def test_containers_use_a_single_ffprobe_call(tmp_path, monkeypatch):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"not really a video")
+    cover_art = tmp_path / "song.m4a"
+    cover_art.write_bytes(b"not really audio")
+    payloads = {
+        str(video): {
+            "streams": [
+                {"index": 0, "codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720},
+                {"index": 1, "codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2},
+            ],
+            "format": {"duration": "12.5", "format_name": "mov,mp4"},
+        },
+        str(cover_art): {
+            "streams": [
+                {"index": 0, "codec_type": "audio", "sample_rate": "44100", "channels": 2},
+                {"index": 1, "codec_type": "video", "width": 600, "height": 600, "disposition": {"attached_pic": 1}},
+            ],
+            "format": {"duration": "3.0"},
+        },
+    }
+    calls = []
+
+    def fake_run(cmd, **kwargs):  # noqa: ANN001
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(payloads[cmd[-1]]), stderr="")
+
+    monkeypatch.setattr(media_info.subprocess, "run", fake_run)
+    service = MediaInfoService()
+
+    info = service.probe(video)
+    assert service.probe(video) is info
+    assert info.duration == 12.5 and info.has_video
+    assert info.resolution == (1280, 720)
+    assert (info.sample_rate, info.channels) == (48000, 2)
+
+    song = service.probe(cover_art)
+    assert not song.has_video and song.resolution is None
+    assert len(calls) == 2 and "-show_streams" in calls[0] and "-show_format" in calls[0]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from media_processing.audio_processing import (
+    _moving_average,
+    overlay_on_background_default,
+    overlay_on_background_sophisticated,
+)
+from media_processing.timeline_renderer import LIMITER_CEILING, Placement, _Limiter, mix_onto_background
+
+SR = 44100
+
+
+@pytest.mark.parametrize("window", [1, 4, 7, 100])
+def test_moving_average_matches_convolution(window):
+    values = np.random.default_rng(0).random(1000).astype(np.float32)
+    expected = np.convolve(values, np.ones(window) / window, mode="same")
+    np.testing.assert_allclose(_moving_average(values, window), expected, atol=1e-5)
+
+
+def test_sophisticated_overlay_ducks_background_under_speech(tmp_path):
+    n = SR * 4
+    background = np.full((n, 2), 0.2, dtype=np.float32)
+    t = np.arange(SR) / SR
+    speech = np.zeros(n, dtype=np.float32)
+    speech[SR:2 * SR] = 0.5 * np.sin(2 * np.pi * 200 * t)
+    sf.write(str(tmp_path / "bg.wav"), background, SR, subtype="FLOAT")
+    sf.write(str(tmp_path / "speech.wav"), speech[: 3 * SR], SR, subtype="FLOAT")
+
+    overlay_on_background_sophisticated(
+        None, tmp_path / "bg.wav", tmp_path / "mix.wav", ducking_db=-12.0, speech_track=tmp_path / "speech.wav"
+    )
+    mix, sr = sf.read(str(tmp_path / "mix.wav"), dtype="float32")
+    assert sr == SR and mix.shape == background.shape
+    np.testing.assert_allclose(mix[: SR // 2], 0.2, atol=1e-3)  # before speech
+    np.testing.assert_allclose(mix[int(3.5 * SR):], 0.2, atol=1e-3)  # past the end of the speech track
+    under_speech = mix[int(1.4 * SR):int(1.6 * SR)] - speech[int(1.4 * SR):int(1.6 * SR), None]
+    assert float(np.median(under_speech)) < 0.2 * 10 ** (-6 / 20)
+
+
+def test_streaming_mix_matches_in_memory_sum(tmp_path):
+    rng = np.random.default_rng(1)
+    background = (0.05 * rng.standard_normal((SR, 2))).astype(np.float32)
+    sf.write(str(tmp_path / "bg.wav"), background, SR, subtype="FLOAT")
+    segments = []
+    expected = np.concatenate([background * 0.5, np.zeros((SR // 4, 2), dtype=np.float32)])
+    for i, start in enumerate([0.05, 0.3, 0.9]):  # the last one runs past the background
+        seg = (0.05 * rng.standard_normal(SR // 3)).astype(np.float32)
+        sf.write(str(tmp_path / f"seg{i}.wav"), seg, SR, subtype="FLOAT")
+        segments.append(Placement(str(tmp_path / f"seg{i}.wav"), start))
+        offset = int(round(start * SR))
+        expected[offset:offset + len(seg)] += seg[:, None]
+    expected = expected[: int(round(0.9 * SR)) + SR // 3]
+
+    mix_onto_background(
+        tmp_path / "bg.wav", segments, tmp_path / "mix.wav", background_gain=0.5, block_frames=1000, subtype="FLOAT"
+    )
+    mix, _ = sf.read(str(tmp_path / "mix.wav"), dtype="float32")
+    assert mix.shape == expected.shape
+    np.testing.assert_allclose(mix, expected, atol=1e-6)
+
+
+def test_default_overlay_limits_peaks(tmp_path):
+    sf.write(str(tmp_path / "bg.wav"), np.full((4 * SR, 1), 0.8, dtype=np.float32), SR)
+    sf.write(str(tmp_path / "seg.wav"), np.full(SR // 2, 0.8, dtype=np.float32), SR)
+    overlay_on_background_default(
+        [{"start": 3.0, "end": 3.5, "audio_url": str(tmp_path / "seg.wav")}], tmp_path / "bg.wav", tmp_path / "mix.wav"
+    )
+    mix, _ = sf.read(str(tmp_path / "mix.wav"), dtype="float32")
+    assert len(mix) == 4 * SR
+    assert np.abs(mix).max() <= 1.0
+    assert mix[int(3.25 * SR)] == pytest.approx(0.99, abs=1e-3)
+    # Blocks without overs are left untouched
+    assert mix[SR // 2] == pytest.approx(0.8, abs=1e-3)
+
+
+def test_limiter_never_exceeds_the_ceiling_across_block_edges():
+    signal = np.full((SR, 2), 0.5, dtype=np.float32)
+    for spike in (999, 1000, 1001, 5000, 30000):  # at, just before and just after block edges
+        signal[spike] = 1.8
+    signal[20000:20400] = 1.2  # sustained over spanning a block edge
+
+    limiter = _Limiter(SR, 2)
+    blocks = [limiter.process(signal[i:i + 1000].copy(), last=i + 1000 >= len(signal)) for i in range(0, len(signal), 1000)]
+    limited = np.concatenate(blocks)
+
+    assert limited.shape == signal.shape
+    assert np.abs(limited).max() <= LIMITER_CEILING + 1e-6
+    gain = limited[:, 0] / signal[:, 0]
+    # The gain moves by at most one look-ahead step per frame, and recovers fully after the release
+    assert np.abs(np.diff(gain)).max() <= 1.0 / limiter.lookahead + 1e-6
+    np.testing.assert_allclose(limited[:900], signal[:900])
+    np.testing.assert_allclose(limited[40000:], signal[40000:])
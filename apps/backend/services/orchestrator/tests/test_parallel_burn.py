@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from media_processing import final_pass, parallel_burn
+from media_processing.parallel_burn import BurnSettings, shift_ass
+from media_processing.subtitles_handling import SubtitleStyle
+
+ASS = """[Script Info]
+ScriptType: v4.00+
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+Dialogue: 0,0:00:01.00,0:00:03.00,Default,,0,0,0,,first
+Dialogue: 0,0:00:09.50,0:00:11.25,Default,,0,0,0,,across, the cut
+Dialogue: 0,0:01:05.00,0:01:06.00,Default,,0,0,0,,late
+"""
+
+
+def test_shift_ass_keeps_only_visible_events(tmp_path):
+    source = tmp_path / "subs.ass"
+    source.write_text(ASS)
+
+    shifted = shift_ass(source, tmp_path / "chunk.ass", 10.0, 60.0).read_text()
+
+    assert "[Script Info]" in shifted and "Format: Layer" in shifted
+    dialogues = [line for line in shifted.splitlines() if line.startswith("Dialogue:")]
+    assert dialogues == ["Dialogue: 0,0:00:00.00,0:00:01.25,Default,,0,0,0,,across, the cut"]
+
+
+def test_chunk_count_respects_minimum_chunk_length():
+    settings = BurnSettings(enabled=True, chunks=8, min_video_seconds=60, min_chunk_seconds=30)
+    assert settings.chunk_count(600) == 8
+    assert settings.chunk_count(90) == 3
+    assert settings.applies_to(600)
+    assert not settings.applies_to(45)
+    assert not BurnSettings(enabled=False, chunks=8).applies_to(600)
+
+
+def test_long_video_is_burned_in_chunks_and_joined_with_stream_copy(tmp_path, monkeypatch):
+    video, audio, subs = tmp_path / "source.mp4", tmp_path / "dub.wav", tmp_path / "dubbed_fr.ass"
+    video.write_bytes(b"v")
+    audio.write_bytes(b"a")
+    subs.write_text(ASS)
+    calls, events = [], {}
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if "segment" in cmd:
+            work_dir = Path(cmd[-1]).parent
+            (work_dir / "chunks.csv").write_text(
+                "source_000.mkv,0.000000,100.100000\nsource_001.mkv,100.100000,200.000000\nsource_002.mkv,200.000000,300.000000\n"
+            )
+        elif "-vf" in cmd:
+            chunk_ass = Path(cmd[cmd.index("-vf") + 1].split("=", 1)[1].split(":")[0])
+            events[chunk_ass.name] = chunk_ass.read_text().count("Dialogue:")
+        elif "concat" in cmd:
+            assert (Path(cmd[cmd.index("-i") + 1])).read_text().splitlines() == [
+                "file 'burned_000.mp4'", "file 'burned_001.mp4'", "file 'burned_002.mp4'"
+            ]
+            Path(cmd[-1]).write_bytes(b"mp4")
+
+    monkeypatch.setattr(parallel_burn.subprocess, "run", fake_run)
+    monkeypatch.setattr(final_pass.subprocess, "run", fake_run)
+    for module in (final_pass, parallel_burn):
+        monkeypatch.setattr(module, "get_audio_duration", lambda path: 300.0)
+    monkeypatch.setattr(parallel_burn, "build_subtitle_filter", lambda video, ass, *args: f"subtitles={ass}:original_size=1280x720")
+    monkeypatch.setattr(parallel_burn, "SETTINGS", BurnSettings(enabled=True, chunks=3, preset="faster", min_video_seconds=60))
+
+    output = tmp_path / "dubbed_video_fr_with_default_subs.mp4"
+    final_pass.final(video, audio, tmp_path / "dubbed_video_fr.mp4", output, subs, SubtitleStyle())
+
+    split, *burns, join = calls
+    assert split[split.index("-segment_times") + 1] == "100.000,200.000"
+    assert len(burns) == 3
+    assert events == {"subs_000.ass": 3, "subs_001.ass": 0, "subs_002.ass": 0}
+    assert all(cmd[cmd.index("-preset") + 1] == "faster" and "-an" in cmd for cmd in burns)
+    assert join[join.index("-c:v") + 1] == "copy"
+    assert join[join.index("-filter_complex") + 1].startswith("[2:a]apad")
+    assert output.exists()
+    assert not list(tmp_path.glob(".burn_*"))
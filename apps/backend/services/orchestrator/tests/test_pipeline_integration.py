@@ -10,7 +10,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from app import main as orchestrator_main  # noqa: E402
-from common_schemas.models import ASRResponse, Segment, SegmentAudioOut, TTSResponse
+from common_schemas.models import ASRResponse, Segment, SegmentAudioIn, SegmentAudioOut, TTSResponse
 
 
 @pytest.mark.asyncio
@@ -54,7 +54,8 @@ async def test_dub_pipeline_minimal(monkeypatch, tmp_path):
             lang="fr",
             sample_rate=16000,
         )
-        return TTSResponse(segments=[segment_out])
+        segment_in = SegmentAudioIn(start=0.0, end=1.0, text="Bonjour", speaker_id="spk1", lang="fr")
+        return TTSResponse(segments=[segment_out]), [segment_in], [None]
 
     async def fake_trim_tts_segments(tts_result, vad_dir):  # noqa: ANN001
         return tts_result
@@ -169,7 +170,8 @@ async def test_dub_pipeline_multiple_languages(monkeypatch, tmp_path):
             lang=target_lang,
             sample_rate=16000,
         )
-        return TTSResponse(segments=[segment_out])
+        segment_in = SegmentAudioIn(start=0.0, end=1.0, text="Bonjour", speaker_id="spk1", lang=target_lang)
+        return TTSResponse(segments=[segment_out]), [segment_in], [None]
 
     async def fake_trim_tts_segments(tts_result, vad_dir):  # noqa: ANN001
         return tts_result
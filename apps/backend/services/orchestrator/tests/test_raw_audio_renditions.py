@@ -0,0 +1,36 @@
+import numpy as np
+import soundfile as sf
+
+from app.main import raw_audio_renditions_cmd, write_analysis_rendition
+
+
+def test_renditions_come_from_a_single_decode(tmp_path):
+    master, analysis = tmp_path / "raw_audio.wav", tmp_path / "analysis_16k.wav"
+    cmd = raw_audio_renditions_cmd("input.mp4", master, analysis)
+
+    assert cmd.count("-i") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "asplit=2" in graph
+    assert "aresample=44100" in graph and "channel_layouts=stereo" in graph
+    assert "aresample=16000" in graph and "channel_layouts=mono" in graph
+    assert cmd[-1] == str(analysis) and str(master) in cmd
+
+
+def test_master_only_keeps_plain_extraction(tmp_path):
+    cmd = raw_audio_renditions_cmd("input.mp4", tmp_path / "raw_audio.wav", None)
+    assert "-filter_complex" not in cmd
+    assert cmd[-1] == str(tmp_path / "raw_audio.wav")
+
+
+def test_wav_sources_get_analysis_track_in_process(tmp_path):
+    master = tmp_path / "raw_audio.wav"
+    t = np.arange(44100) / 44100
+    tone = 0.3 * np.sin(2 * np.pi * 440 * t)
+    sf.write(str(master), np.stack([tone, tone], axis=1), 44100, subtype="PCM_16")
+
+    analysis = tmp_path / "analysis_16k.wav"
+    write_analysis_rendition(master, analysis)
+
+    info = sf.info(str(analysis))
+    assert (info.samplerate, info.channels, info.subtype) == (16000, 1, "PCM_16")
+    assert abs(info.frames - 16000) <= 1
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from media_processing.media_info import MEDIA_INFO
+from media_processing.resampling import RESAMPLER, Resampler, negotiate_working_rate
+from media_processing.timeline_renderer import Placement, mix_onto_background, render_timeline
+from tests.audio_helpers import sine, write_tone
+
+
+def test_negotiation_prefers_the_output_rate():
+    assert negotiate_working_rate([24000, 24000], output_rate=44100) == 44100
+    assert negotiate_working_rate([24000, None, 24000, 22050]) == 24000
+    with pytest.raises(ValueError):
+        negotiate_working_rate([None])
+
+
+def test_polyphase_fallback_matches_length_and_pitch(monkeypatch):
+    monkeypatch.setitem(sys.modules, "soxr", None)
+    sr = 24000
+    tone = sine(1.0, sr)
+    out = Resampler().resample(tone, sr, 44100)
+    assert out.dtype == np.float32 and len(out) == 44100
+    spectrum = np.abs(np.fft.rfft(out))
+    assert np.argmax(spectrum) == pytest.approx(440, abs=1)
+    assert np.max(np.abs(out[1000:-1000])) == pytest.approx(0.3, rel=0.01)
+
+
+def test_polyphase_stream_matches_one_shot_conversion(monkeypatch):
+    monkeypatch.setitem(sys.modules, "soxr", None)
+    tone = sine(1.0, 44100)
+    stream = Resampler().stream(44100, 16000)
+    blocks = [stream.resample_chunk(tone[i:i + 4096]) for i in range(0, len(tone), 4096)]
+    blocks.append(stream.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+    streamed = np.concatenate(blocks)
+    assert streamed.dtype == np.float32
+    np.testing.assert_allclose(streamed, Resampler().resample(tone, 44100, 16000), atol=1e-5)
+
+
+def test_files_are_converted_once_per_artifact(tmp_path):
+    segment = write_tone(tmp_path / "seg.wav", 1.0, 24000)
+    assert RESAMPLER.resample_file(segment, 24000) == str(segment)
+    before = RESAMPLER.conversions
+    first = RESAMPLER.resample_file(segment, 44100)
+    assert RESAMPLER.resample_file(segment, 44100) == first
+    assert RESAMPLER.conversions == before + 1
+    assert MEDIA_INFO.probe(first).sample_rate == 44100
+    assert MEDIA_INFO.probe(first).duration == pytest.approx(1.0, abs=1e-3)
+
+
+def test_converted_files_live_in_the_cache_area(tmp_path, monkeypatch):
+    lookups = []
+    monkeypatch.setattr(RESAMPLER, "_on_lookup", lambda hit, entry: lookups.append((hit, entry)))
+    (tmp_path / "segments").mkdir()
+    segment = write_tone(tmp_path / "segments" / "seg.wav", 0.5, 24000)
+
+    converted = Path(RESAMPLER.resample_file(segment, 44100))
+    assert RESAMPLER.resample_file(segment, 44100) == str(converted)
+
+    assert converted.parent.parent.parent == RESAMPLER.cache_root
+    assert [hit for hit, _ in lookups] == [False, True]
+    assert all(entry == converted.parent for _, entry in lookups)
+    assert sorted(p.name for p in segment.parent.iterdir()) == ["seg.wav"]
+
+
+def test_render_and_mix_share_converted_segments(tmp_path):
+    segments = [write_tone(tmp_path / f"seg{i}.wav", 0.5, 24000) for i in range(2)]
+    placements = [Placement(str(path), 0.2 + i) for i, path in enumerate(segments)]
+    before = RESAMPLER.conversions
+    track = render_timeline(placements, tmp_path / "speech.wav", total_duration=2.0, sample_rate=44100)
+    assert sf.info(track).samplerate == 44100 and sf.info(track).frames == 2 * 44100
+
+    background = write_tone(tmp_path / "bg.wav", 2.0, 44100, freq=110.0, channels=2)
+    mixed = mix_onto_background(background, placements, tmp_path / "mix.wav", background_gain=0.5)
+    assert sf.info(mixed).samplerate == 44100
+    assert RESAMPLER.conversions == before + len(segments)
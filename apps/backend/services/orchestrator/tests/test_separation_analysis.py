@@ -0,0 +1,35 @@
+import numpy as np
+
+from preprocessing.separation_analysis import analyze_separation_need
+from tests.audio_helpers import write_audio
+
+SR = 44100
+
+
+def _speech_like(seconds: float = 30.0) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    voice = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 15))
+    # 1.5 s utterances separated by 0.7 s pauses, with syllable-rate modulation
+    envelope = ((t % 2.2) < 1.5) * (0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 4 * t)))
+    noise_floor = 0.0005 * np.random.default_rng(0).standard_normal(len(t))
+    return 0.2 * voice * envelope + noise_floor
+
+
+def _music_bed(seconds: float = 30.0, level: float = 0.05) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    return level * sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6))
+
+
+def test_clean_speech_skips_separation(tmp_path):
+    analysis = analyze_separation_need(write_audio(tmp_path / "podcast.wav", _speech_like(), SR, channels=2))
+    assert analysis.label == "clean_speech"
+    assert not analysis.needs_separation
+    assert 0.5 < analysis.speech_coverage < 0.9
+
+
+def test_music_bed_requires_separation(tmp_path):
+    loud = analyze_separation_need(write_audio(tmp_path / "loud.wav", _speech_like() + _music_bed(), SR, channels=2))
+    quiet = analyze_separation_need(write_audio(tmp_path / "quiet.wav", _speech_like() + _music_bed(level=0.0015), SR, channels=2))
+    assert loud.needs_separation
+    assert quiet.needs_separation and quiet.reason == "quiet tonal background (music bed)"
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from preprocessing.separator_pool import SeparatorPool
+
+
+class _FakeSeparator:
+    active = 0
+    peak = 0
+    guard = threading.Lock()
+
+    def __init__(self):
+        self.output_dir = None
+        self.model_instance = None
+
+    def separate(self, input_file, custom_output_names=None):
+        with _FakeSeparator.guard:
+            _FakeSeparator.active += 1
+            _FakeSeparator.peak = max(_FakeSeparator.peak, _FakeSeparator.active)
+        time.sleep(0.05)
+        with _FakeSeparator.guard:
+            _FakeSeparator.active -= 1
+        return [f"{self.output_dir}/vocals.wav"]
+
+
+class _CountingPool(SeparatorPool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loads = 0
+
+    def _load(self, key):
+        self.loads += 1
+        return _FakeSeparator()
+
+
+def test_loaded_separator_is_reused_between_jobs(tmp_path):
+    pool = _CountingPool(max_concurrent=1, max_idle_per_model=1)
+    for job in ("a", "b", "c"):
+        outputs = pool.separate("in.wav", str(tmp_path / job), "model.ckpt", "WAV", {}, str(tmp_path))
+        assert outputs == [f"{tmp_path / job}/vocals.wav"]
+    assert pool.loads == 1
+
+
+def test_concurrent_runs_are_bounded(tmp_path):
+    _FakeSeparator.peak = 0
+    pool = _CountingPool(max_concurrent=2, max_idle_per_model=4)
+    threads = [
+        threading.Thread(target=pool.separate, args=("in.wav", str(tmp_path), "model.ckpt", "WAV", {}, str(tmp_path)))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _FakeSeparator.peak == 2
+    assert pool.loads <= 2
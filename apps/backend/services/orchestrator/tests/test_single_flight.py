@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from caching.single_flight import SingleFlight
+
+
+async def _produce_once(flight: SingleFlight, key: str, cache: dict, computed: list) -> str:
+    if key in cache:
+        return cache[key]
+    async with flight.hold(key):
+        if key in cache:
+            return cache[key]
+        computed.append(key)
+        await asyncio.sleep(0.05)
+        cache[key] = f"artifact-{key}"
+        return cache[key]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_holders_compute_once(tmp_path):
+    flight = SingleFlight(tmp_path / "locks")
+    cache: dict = {}
+    computed: list = []
+
+    results = await asyncio.gather(*[_produce_once(flight, "stems:abc", cache, computed) for _ in range(5)])
+
+    assert computed == ["stems:abc"]
+    assert set(results) == {"artifact-stems:abc"}
+    assert flight.in_flight() == []
+
+
+@pytest.mark.asyncio
+async def test_file_lock_serializes_separate_registries(tmp_path):
+    # Two registries sharing a lock directory behave like two worker processes.
+    first = SingleFlight(tmp_path / "locks", poll_interval=0.01)
+    second = SingleFlight(tmp_path / "locks", poll_interval=0.01)
+    cache: dict = {}
+    computed: list = []
+
+    await asyncio.gather(
+        _produce_once(first, "asr:xyz", cache, computed),
+        _produce_once(second, "asr:xyz", cache, computed),
+    )
+
+    assert computed == ["asr:xyz"]
+    assert list((tmp_path / "locks").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_hold_many_acquires_in_stable_order(tmp_path):
+    flight = SingleFlight(tmp_path / "locks")
+    order: list = []
+
+    async def worker(name: str, keys: list) -> None:
+        async with flight.hold_many(keys):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(
+        asyncio.gather(worker("a", ["tts:1", "tts:2"]), worker("b", ["tts:2", "tts:1"])),
+        timeout=5,
+    )
+    assert sorted(order) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_removed_lock_files_never_admit_two_holders(tmp_path):
+    registries = [SingleFlight(tmp_path / "locks", poll_interval=0.001, max_poll_interval=0.005) for _ in range(3)]
+    active: list = []
+    overlaps: list = []
+
+    async def worker(flight: SingleFlight) -> None:
+        for _ in range(10):
+            async with flight.hold("stems:shared"):
+                active.append(flight)
+                overlaps.append(len(active))
+                await asyncio.sleep(0.002)
+                active.remove(flight)
+
+    await asyncio.wait_for(asyncio.gather(*(worker(flight) for flight in registries)), timeout=10)
+
+    assert len(overlaps) == 30 and max(overlaps) == 1
+    assert list((tmp_path / "locks").iterdir()) == []
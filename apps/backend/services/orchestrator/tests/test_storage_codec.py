@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from caching.storage_codec import StorageCodec
+
+
+def _write_pcm(path: Path, subtype: str = "PCM_16") -> np.ndarray:
+    rng = np.random.default_rng(0)
+    data = (rng.standard_normal((44100, 2)) * 0.1).astype(np.float32)
+    sf.write(str(path), data, 44100, subtype=subtype)
+    return sf.read(str(path), dtype="int32")[0]
+
+
+def test_flac_round_trip_is_lossless(tmp_path):
+    source = tmp_path / "vocals.wav"
+    original = _write_pcm(source)
+    codec = StorageCodec("flac")
+
+    stored = codec.encode(source, tmp_path / "cache", "vocals")
+    assert stored.suffix == ".flac"
+    assert stored.stat().st_size < source.stat().st_size
+    assert codec.find(tmp_path / "cache", "vocals") == stored
+
+    restored = tmp_path / "restored.wav"
+    codec.decode(stored, restored)
+    info = sf.info(str(restored))
+    assert info.format == "WAV" and info.subtype == "PCM_16"
+    np.testing.assert_array_equal(sf.read(str(restored), dtype="int32")[0], original)
+
+
+def test_float_audio_stays_uncompressed(tmp_path):
+    source = tmp_path / "segment.wav"
+    _write_pcm(source, subtype="FLOAT")
+
+    stored = StorageCodec("flac").encode(source, tmp_path / "cache", "segment")
+    assert stored.suffix == ".wav"
+
+
+def test_compact_tree_reports_renamed_files(tmp_path):
+    tts_dir = tmp_path / "tts" / "fr"
+    tts_dir.mkdir(parents=True)
+    _write_pcm(tts_dir / "seg_1.wav")
+
+    renamed = StorageCodec("flac").compact_tree([tmp_path / "tts"])
+    assert renamed == {str(tts_dir / "seg_1.wav"): str(tts_dir / "seg_1.flac")}
+    assert not (tts_dir / "seg_1.wav").exists()
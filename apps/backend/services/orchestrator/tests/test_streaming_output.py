@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app import main as orchestrator_main
+from media_processing import final_pass, streaming_output
+from media_processing.streaming_output import StreamingSettings
+
+
+def test_default_output_keeps_faststart(tmp_path):
+    assert streaming_output.output_args(tmp_path / "out.mp4", StreamingSettings()) == [
+        "-movflags", "+faststart", str(tmp_path / "out.mp4")
+    ]
+
+
+def test_fmp4_output_is_fragmented_without_a_second_pass(tmp_path):
+    args = streaming_output.output_args(tmp_path / "out.mp4", StreamingSettings(enabled=True, format="fmp4", segment_seconds=2))
+
+    assert "+faststart" not in args[1]
+    assert "empty_moov" in args[1] and args[-1] == str(tmp_path / "out.mp4")
+    assert args[args.index("-frag_duration") + 1] == "2000000"
+
+
+def test_hls_output_tees_the_mp4_and_an_event_playlist(tmp_path):
+    output = tmp_path / "dubbed_video_fr.mp4"
+    args = streaming_output.output_args(output, StreamingSettings(enabled=True, format="hls", segment_seconds=4))
+
+    assert args[:2] == ["-f", "tee"]
+    mp4, hls = args[2].split("|")
+    assert mp4.endswith(f"]{output}") and "empty_moov" in mp4
+    assert "hls_playlist_type=event" in hls and "hls_segment_type=fmp4" in hls
+    assert hls.endswith(str(tmp_path / "dubbed_video_fr_hls" / "index.m3u8"))
+    assert (tmp_path / "dubbed_video_fr_hls").is_dir()
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        streaming_output.configure({"format": "dash"})
+
+
+def test_outputs_are_partial_while_the_final_pass_runs(tmp_path, monkeypatch):
+    video, audio = tmp_path / "source.mp4", tmp_path / "dub.wav"
+    video.write_bytes(b"v")
+    audio.write_bytes(b"a")
+    output = tmp_path / "dubbed_video_fr.mp4"
+    playlist = tmp_path / "dubbed_video_fr_hls" / "index.m3u8"
+    seen = []
+
+    def fake_run(cmd, **kwargs):
+        playlist.write_text("#EXTM3U\n#EXT-X-PLAYLIST-TYPE:EVENT\nsegment_00000.m4s\n")
+        seen.append((streaming_output.is_writing(output), streaming_output.is_writing(playlist)))
+        assert not streaming_output.playlist_complete(playlist)
+        playlist.write_text(playlist.read_text() + "#EXT-X-ENDLIST\n")
+
+    monkeypatch.setattr(final_pass.subprocess, "run", fake_run)
+    monkeypatch.setattr(final_pass, "get_audio_duration", lambda path: 12.5)
+    monkeypatch.setattr(streaming_output, "SETTINGS", StreamingSettings(enabled=True, format="hls"))
+
+    final_pass.final(video, audio, output, "", None, None)
+
+    assert seen == [(True, True)]
+    assert not streaming_output.is_writing(output)
+    assert streaming_output.playlist_complete(playlist)
+
+
+def test_playlist_is_ready_once_it_lists_a_segment(tmp_path):
+    playlist = tmp_path / streaming_output.PLAYLIST_FILE
+
+    assert not streaming_output.playlist_ready(playlist)
+    playlist.write_text("#EXTM3U\n#EXT-X-PLAYLIST-TYPE:EVENT\n")
+    assert not streaming_output.playlist_ready(playlist)
+    playlist.write_text(playlist.read_text() + "#EXTINF:4.000000,\nsegment_00000.m4s\n")
+    assert streaming_output.playlist_ready(playlist)
+
+
+@pytest.mark.asyncio
+async def test_stream_event_waits_for_the_first_segment(tmp_path):
+    stream = tmp_path / f"dubbed_video_fr{streaming_output.STREAM_DIR_SUFFIX}"
+    stream.mkdir()
+    events = []
+    token = orchestrator_main.PROGRESS_REPORTER.set(events.append)
+    try:
+        announcer = asyncio.create_task(orchestrator_main.announce_stream_when_ready("vid", "fr", stream, poll_seconds=0.01))
+        (stream / streaming_output.PLAYLIST_FILE).write_text("#EXTM3U\n")
+        await asyncio.sleep(0.05)
+        assert events == []
+
+        (stream / streaming_output.PLAYLIST_FILE).write_text("#EXTM3U\n#EXTINF:4.000000,\nsegment_00000.m4s\n")
+        await asyncio.wait_for(announcer, timeout=1)
+    finally:
+        orchestrator_main.PROGRESS_REPORTER.reset(token)
+
+    assert events == [{
+        "type": "stream",
+        "language": "fr",
+        "playlist_url": f"/api/stream/vid/{stream.name}/{streaming_output.PLAYLIST_FILE}",
+    }]
@@ -0,0 +1,32 @@
+import numpy as np
+import soundfile as sf
+
+from media_processing import batch_stretch
+from media_processing.batch_stretch import StretchJob, run_stretch_jobs
+from media_processing.stretch_cache import STRETCH_CACHE
+from media_processing.time_stretch import StretchPolicy
+from tests.audio_helpers import write_tone
+
+SR = 24000
+POLICY = StretchPolicy(engine="vocoder")
+
+
+def test_repeated_stretch_is_served_from_cache(tmp_path, monkeypatch):
+    lookups = []
+    STRETCH_CACHE.configure(tmp_path / "cache", on_lookup=lambda hit, entry: lookups.append(hit))
+    calls = []
+    original = batch_stretch._stretch_one
+    monkeypatch.setattr(batch_stretch, "_stretch_one", lambda job: calls.append(job) or original(job))
+    src = write_tone(tmp_path / "seg.wav", 1.0, SR, 220.0)
+    first = run_stretch_jobs([StretchJob(str(src), str(tmp_path / "a.wav"), 22000, policy=POLICY)])[0]
+    second = run_stretch_jobs([StretchJob(str(src), str(tmp_path / "b.wav"), 22000, policy=POLICY)])[0]
+    assert len(calls) == 1 and lookups == [False, True]
+    assert second.ok and second.samples == first.samples == 22000
+    np.testing.assert_array_equal(sf.read(str(tmp_path / "a.wav"))[0], sf.read(str(tmp_path / "b.wav"))[0])
+
+    # Any change to content, target or engine is a different entry
+    run_stretch_jobs([StretchJob(str(src), str(tmp_path / "c.wav"), 22001, policy=POLICY)])
+    run_stretch_jobs([StretchJob(str(src), str(tmp_path / "d.wav"), 22000, policy=StretchPolicy(engine="passthrough"))])
+    write_tone(src, 1.0, SR, 330.0)
+    run_stretch_jobs([StretchJob(str(src), str(tmp_path / "e.wav"), 22000, policy=POLICY)])
+    assert len(calls) == 4
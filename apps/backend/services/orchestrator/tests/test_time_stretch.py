@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from media_processing import time_stretch
+from media_processing.time_stretch import PhaseVocoderStretcher, StretchPolicy, stretch_buffer
+from tests.audio_helpers import sine
+
+SR = 24000
+
+
+def test_policy_picks_engine_by_ratio():
+    policy = StretchPolicy(engine="rubberband", small_ratio=0.05, passthrough_tolerance=0.002)
+    assert policy.engine_for(1.001) == "passthrough"
+    assert policy.engine_for(0.97) == "vocoder"
+    assert policy.engine_for(1.2) == "rubberband"
+
+
+@pytest.mark.parametrize("rate", [0.96, 1.04])
+def test_vocoder_keeps_pitch_level_and_exact_length(rate):
+    y = sine(2.0, SR, 220.0)
+    target = int(len(y) / rate)
+    out = PhaseVocoderStretcher().stretch(y, SR, target)
+    assert out.shape == (target,) and out.dtype == np.float32
+    body = out[SR // 4: -SR // 4]
+    spectrum = np.abs(np.fft.rfft(body * np.hanning(len(body))))
+    assert np.argmax(spectrum) * SR / len(body) == pytest.approx(220.0, abs=2.0)
+    assert np.sqrt(np.mean(body ** 2)) == pytest.approx(0.3 / np.sqrt(2), rel=0.05)
+
+
+def test_vocoder_handles_stereo():
+    y = np.stack([sine(2.0, SR, 220.0), sine(2.0, SR, 330.0)], axis=1)
+    assert PhaseVocoderStretcher().stretch(y, SR, 50000).shape == (50000, 2)
+
+
+def test_passthrough_within_tolerance_only_pads():
+    y = sine(1.0, SR, 220.0)
+    out = stretch_buffer(y, SR, len(y) + 10, StretchPolicy(passthrough_tolerance=0.01))
+    np.testing.assert_array_equal(out[: len(y)], y)
+    assert not out[len(y):].any()
+
+
+def test_tiers_from_config():
+    try:
+        time_stretch.configure_tiers(
+            {"draft": {"engine": "vocoder", "small_ratio": "0.1"}, "final": {"preserve_formants": False}},
+            default_tier="draft",
+        )
+        assert time_stretch.policy_for() == StretchPolicy(engine="vocoder", small_ratio=0.1)
+        assert time_stretch.policy_for("final") == StretchPolicy(preserve_formants=False)
+        assert time_stretch.policy_for("unknown") == time_stretch.policy_for("draft")
+    finally:
+        time_stretch.configure_tiers(None)
@@ -0,0 +1,55 @@
+import numpy as np
+import soundfile as sf
+
+from media_processing.timeline_renderer import Placement, concatenate_files, render_timeline
+from tests.audio_helpers import write_tone
+
+SR = 24000
+
+
+def test_segments_land_on_exact_sample_offsets(tmp_path):
+    first = write_tone(tmp_path / "a.wav", 0.5, SR)
+    second = write_tone(tmp_path / "b.wav", 0.25, SR)
+    out = tmp_path / "timeline.wav"
+
+    render_timeline([Placement(str(first), 1.0), Placement(str(second), 2.5)], out, total_duration=4.0, fade_ms=0)
+
+    data, sr = sf.read(str(out), always_2d=True)
+    assert sr == SR and data.shape == (4 * SR, 1)
+    active = np.flatnonzero(np.abs(data[:, 0]) > 1e-4)
+    assert active[0] >= SR and active[-1] < int(2.75 * SR)
+    assert not np.any(np.abs(data[int(1.5 * SR) + 1:int(2.5 * SR)]) > 1e-4)
+    assert np.any(np.abs(data[int(2.5 * SR):int(2.5 * SR) + 100]) > 1e-4)
+
+
+def test_formats_are_conformed_and_audio_is_never_dropped(tmp_path):
+    mono = write_tone(tmp_path / "mono.wav", 0.5, SR)
+    stereo_44k = write_tone(tmp_path / "stereo.wav", 1.0, 44100, channels=2)
+    out = tmp_path / "timeline.wav"
+
+    render_timeline([Placement(str(mono), 0.0), Placement(str(stereo_44k), 1.5)], out, total_duration=2.0)
+
+    info = sf.info(str(out))
+    assert (info.samplerate, info.channels) == (SR, 1)
+    assert abs(info.duration - 2.5) < 1e-3
+
+
+def test_concatenate_files_joins_back_to_back(tmp_path):
+    parts = [write_tone(tmp_path / f"{i}.wav", 0.2 * (i + 1), SR) for i in range(3)]
+    out = tmp_path / "joined.wav"
+    concatenate_files(parts, out)
+    assert abs(sf.info(str(out)).duration - 1.2) < 1e-3
+
+
+def test_single_overrunning_segment_keeps_its_trailing_silence(tmp_path):
+    from media_processing.audio_processing import concatenate_audio
+
+    segment = write_tone(tmp_path / "seg.wav", 1.5, SR)
+    output = str(tmp_path / "out.wav")
+
+    concatenate_audio(
+        [{"audio_url": str(segment), "start": 1.0, "end": 2.0}], output, target_duration=4.0, strict_timing=False
+    )
+
+    # 1.0 s before the segment, the segment itself, and the 2.0 s after its slot
+    assert sf.info(output).duration == 4.5
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from media_processing import vad_backend
+from media_processing.vad_backend import SileroOnnxVad, VadStream, timestamps_from_probs
+
+SR = 16000
+WINDOW = 512
+
+
+class FakeSession:
+    """Scores a window by its peak level and counts calls in the recurrent state."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def run(self, _, feeds):
+        self.inputs.append(feeds["input"].copy())
+        prob = np.abs(feeds["input"][:, 64:]).max(axis=1, keepdims=True)
+        return prob, feeds["state"] + 1
+
+
+def _probs_to_audio(probs):
+    return np.repeat(np.asarray(probs, dtype=np.float32), WINDOW)
+
+
+def test_timestamps_apply_hysteresis_min_durations_and_padding():
+    # 10 windows speech, 2 windows dip (< min silence), 10 speech, 20 silence, 3 windows blip (< min speech)
+    probs = [0.9] * 10 + [0.1] * 2 + [0.9] * 10 + [0.0] * 20 + [0.9] * 3 + [0.0] * 10
+    speeches = timestamps_from_probs(np.array(probs), len(probs) * WINDOW, SR)
+    pad = int(0.03 * SR)
+    assert speeches == [{"start": 0, "end": 22 * WINDOW + pad}]
+
+
+def test_close_regions_share_the_gap_instead_of_overlapping():
+    probs = [0.9] * 10 + [0.0] * 4 + [0.9] * 10 + [0.0] * 4
+    speeches = timestamps_from_probs(np.array(probs), len(probs) * WINDOW, SR, min_silence_duration_ms=50)
+    assert len(speeches) == 2
+    assert speeches[0]["end"] <= speeches[1]["start"]
+    assert speeches[1]["end"] == 24 * WINDOW + int(0.03 * SR)
+
+
+@pytest.mark.parametrize("chunk", [100, WINDOW, 5000])
+def test_stream_is_independent_of_chunking(chunk):
+    audio = _probs_to_audio([0.0, 0.8, 0.8, 0.2]) + np.float32(0.01)
+    audio = audio[:-100]  # trailing partial window is zero-padded on flush
+    session = FakeSession()
+    stream = VadStream(session, SR)
+    probs = np.concatenate([stream.feed(audio[i:i + chunk]) for i in range(0, len(audio), chunk)] + [stream.flush()])
+    np.testing.assert_allclose(probs, [0.01, 0.81, 0.81, 0.21], rtol=1e-6)
+    assert stream._state.max() == 4
+    # each window is prefixed with the last 64 samples of the previous one
+    np.testing.assert_array_equal(session.inputs[2][0, :64], audio[WINDOW * 2 - 64:WINDOW * 2])
+
+
+def test_other_sample_rates_are_mapped_back(monkeypatch):
+    vad = SileroOnnxVad(model_path="unused.onnx")
+    monkeypatch.setattr(vad, "load", FakeSession)
+    audio = np.zeros(3 * 24000, dtype=np.float32)
+    audio[24000:48000] = 0.9
+    (speech,) = vad.speech_timestamps(audio, 24000)
+    assert speech["start"] == pytest.approx(24000 - 0.03 * 24000, abs=WINDOW * 1.5)
+    assert speech["end"] == pytest.approx(48000 + 0.03 * 24000, abs=WINDOW * 1.5)
+
+
+def test_configure_rejects_unknown_backend(monkeypatch):
+    monkeypatch.setattr(vad_backend, "_backend", None)
+    with pytest.raises(ValueError):
+        vad_backend.configure({"backend": "webrtc"})
+    assert isinstance(vad_backend.configure({"threads": 2}), SileroOnnxVad)
+    assert vad_backend.get_vad_backend().threads == 2
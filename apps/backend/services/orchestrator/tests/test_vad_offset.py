@@ -0,0 +1,62 @@
+import librosa
+import numpy as np
+import pytest
+import soundfile as sf
+
+from media_processing import vad_offset
+from media_processing.vad_offset import detect_speech_start_time
+
+
+def _reference_start(path, percentile=10, multiplier=3.0, sustained=0.3):
+    """The original full-decode, per-frame loop."""
+    audio, sr = librosa.load(str(path), sr=16000)
+    energy = librosa.feature.rms(y=audio, frame_length=2048, hop_length=512)[0]
+    noise_floor = np.percentile(energy, percentile)
+    window_frames = int((sustained * sr) / 512)
+    for i in range(len(energy) - window_frames):
+        window = energy[i:i + window_frames]
+        if np.mean(window) > noise_floor * multiplier and np.min(window) > noise_floor * 1.5:
+            return (i * 512) / sr
+    return 0.0
+
+
+def _speech_file(path, sr, onset, total, channels=1, speech=1.5):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sr * total)) / sr
+    audio = 0.002 * rng.standard_normal(len(t))
+    audio[int(0.3 * sr):int(0.35 * sr)] += 0.3  # a click before speech
+    voiced = (t >= onset) & (t < onset + speech)
+    audio[voiced] += 0.2 * np.sin(2 * np.pi * 180 * t[voiced])
+    sf.write(str(path), np.repeat(audio[:, None], channels, axis=1).astype(np.float32), sr)
+    return path
+
+
+def test_matches_full_decode_when_speech_starts_early(tmp_path):
+    path = _speech_file(tmp_path / "vocals.wav", 16000, onset=0.8, total=6.0)
+    assert detect_speech_start_time(path) == pytest.approx(_reference_start(path))
+    assert detect_speech_start_time(path) == pytest.approx(0.8, abs=0.05)
+
+
+def test_window_grows_until_onset(tmp_path, monkeypatch):
+    monkeypatch.setattr(vad_offset, "LEADING_WINDOW_SECONDS", 2.0)
+    path = _speech_file(tmp_path / "vocals.wav", 44100, onset=5.0, total=12.0, channels=2)
+    decoded = []
+    original = vad_offset._decode_leading
+
+    def spy(*args):
+        for audio, done in original(*args):
+            decoded.append(len(audio) / 16000)
+            yield audio, done
+
+    monkeypatch.setattr(vad_offset, "_decode_leading", spy)
+    assert detect_speech_start_time(path) == pytest.approx(5.0, abs=0.05)
+    assert len(decoded) == 3 and decoded[-1] < 12.0
+
+
+def test_silence_and_short_files_return_zero(tmp_path):
+    silent = tmp_path / "silent.wav"
+    sf.write(str(silent), np.zeros(16000 * 3, dtype=np.float32), 16000)
+    short = tmp_path / "short.wav"
+    sf.write(str(short), np.zeros(1000, dtype=np.float32), 16000)
+    assert detect_speech_start_time(silent) == 0.0
+    assert detect_speech_start_time(short) == 0.0
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from media_processing import audio_processing
+from media_processing.audio_processing import _split_batch_timestamps, trim_audio_batch
+from media_processing.media_info import MEDIA_INFO
+
+SR = 24000
+
+
+def _energy_timestamps(wav, sampling_rate=16000, **_):
+    """Stand-in for Silero: contiguous runs of 10 ms frames above a fixed level."""
+    hop = sampling_rate // 100
+    frames = len(wav) // hop
+    active = np.abs(wav[: frames * hop].reshape(frames, hop)).max(axis=1) > 0.05
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], active.astype(int), [0]])))
+    return [{"start": int(s * hop), "end": int(e * hop)} for s, e in zip(edges[::2], edges[1::2])]
+
+
+def test_split_batch_timestamps():
+    offsets, lengths = [0, 100, 250], [60, 100, 50]
+    per_segment = _split_batch_timestamps([{"start": 10, "end": 40}, {"start": 120, "end": 180}], offsets, lengths)
+    assert per_segment == [[(10, 40)], [(20, 80)], []]
+
+
+def test_batch_trims_trailing_silence_in_one_vad_pass(tmp_path, monkeypatch):
+    calls = []
+
+    class FakeBackend:
+        def speech_timestamps(self, wav, sampling_rate=16000, **kwargs):
+            calls.append(len(wav))
+            return _energy_timestamps(wav, sampling_rate, **kwargs)
+
+    monkeypatch.setattr(audio_processing, "get_vad_backend", FakeBackend)
+    items = []
+    for i, speech_seconds in enumerate([0.5, 1.0, 0.0]):
+        audio = np.zeros(int(SR * (speech_seconds + 1.0)), dtype=np.float32)
+        audio[: int(SR * speech_seconds)] = 0.3 * np.sin(np.arange(int(SR * speech_seconds)) * 0.1)
+        sf.write(str(tmp_path / f"seg{i}.wav"), audio, SR)
+        items.append((tmp_path / f"seg{i}.wav", tmp_path / f"trimmed{i}.wav"))
+
+    probes = MEDIA_INFO.probes
+    results = trim_audio_batch(items)
+    assert len(calls) == 1
+    assert [r.trimmed for r in results] == [True, True, False]
+    assert results[0].duration == pytest.approx(0.6, abs=0.02)
+    assert results[1].duration == pytest.approx(1.1, abs=0.02)
+    assert results[2].duration == pytest.approx(1.0)
+    for result in results:
+        assert sf.info(result.output_path).duration == pytest.approx(result.duration)
+        assert MEDIA_INFO.probe(result.output_path).duration == result.duration
+    assert MEDIA_INFO.probes == probes
+
+
+def test_batch_keeps_going_when_one_item_cannot_be_read_or_written(tmp_path, monkeypatch):
+    class FakeBackend:
+        def speech_timestamps(self, wav, sampling_rate=16000, **kwargs):
+            return _energy_timestamps(wav, sampling_rate, **kwargs)
+
+    monkeypatch.setattr(audio_processing, "get_vad_backend", FakeBackend)
+    audio = np.zeros(SR * 2, dtype=np.float32)
+    audio[:SR] = 0.3 * np.sin(np.arange(SR) * 0.1)
+    good, unwritable = tmp_path / "good.wav", tmp_path / "unwritable.wav"
+    sf.write(str(good), audio, SR)
+    sf.write(str(unwritable), audio, SR)
+    (tmp_path / "broken.wav").write_bytes(b"not audio")
+    items = [
+        (good, tmp_path / "trimmed_good.wav"),
+        (tmp_path / "broken.wav", tmp_path / "trimmed_broken.wav"),
+        (unwritable, tmp_path / "missing_dir" / "trimmed.wav"),
+    ]
+
+    results = trim_audio_batch(items)
+
+    assert results[1] is None and results[2] is None
+    assert results[0].trimmed and results[0].duration == pytest.approx(1.1, abs=0.02)
@@ -1,7 +1,7 @@
 import logging
 import os
 import subprocess
-from typing import Literal
+from typing import Literal, Optional
 
 # Import Stages
 from apps.backend.services.separation.roformer_runner import RoformerRunner
@@ -76,16 +76,22 @@ class PipelineManager:
             logger.warning("FFmpeg not found, assuming input is audio")
             return video_path
 
-    def run_draft(self, video_path: str):
+    def run_draft(self, video_path: str, analysis_audio: Optional[str] = None):
         """
         Mode A: Speed Run (Check Timing)
         Stack: Audio Extract -> Silero -> GLM -> DeepSeek -> Kokoro
+
+        ``analysis_audio`` is an already extracted 16kHz mono track (the orchestrator's
+        raw-audio cache rendition); when given, no extraction pass is run.
         """
         logger.info("🏎️ STARTING DRAFT MODE PIPELINE")
         
         # 1. Extract Audio
-        raw_audio = os.path.join(self.work_dir, "raw_audio.wav")
-        raw_audio = self.extract_audio(video_path, raw_audio)
+        if analysis_audio and os.path.exists(analysis_audio):
+            raw_audio = analysis_audio
+        else:
+            raw_audio = os.path.join(self.work_dir, "raw_audio.wav")
+            raw_audio = self.extract_audio(video_path, raw_audio)
         
         # 2. VAD
         if self.is_stage_enabled('2'):
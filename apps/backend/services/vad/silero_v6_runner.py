@@ -1,16 +1,18 @@
 """
 Stage 2: The Ears (VAD)
-Model: Silero VAD v6.2
+Model: Silero VAD v6.2 (ONNX Runtime)
 Purpose: Voice Activity Detection with baby cry filtering
 Link: https://github.com/snakers4/silero-vad
 """
 
 import logging
-import torch
-import torchaudio
-import numpy as np
 from pathlib import Path
 
+try:  # inside the orchestrator process: share its configured backend
+    from media_processing.vad_backend import get_vad_backend, read_audio
+except ImportError:
+    from apps.backend.services.orchestrator.media_processing.vad_backend import get_vad_backend, read_audio
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,34 +26,16 @@ class SileroV6Runner:
         self.model_version = model_version
         self.threshold = threshold
         self.model = None
-        self.utils = None
         
     def load(self):
-        """Load Silero VAD model from torch hub."""
+        """Get the shared VAD backend (ONNX Runtime by default, see vad_backend)."""
         if self.model:
             return
             
         logger.info(f"👂 Loading Silero VAD {self.model_version}...")
         try:
-            # Load model from torch hub
-            self.model, self.utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad',
-                model='silero_vad',
-                force_reload=False,
-                onnx=False
-            )
-            
-            # Extract utility functions
-            (get_speech_timestamps,
-             save_audio,
-             read_audio,
-             VADIterator,
-             collect_chunks) = self.utils
-            
-            self.get_speech_timestamps = get_speech_timestamps
-            self.read_audio = read_audio
-            self.collect_chunks = collect_chunks
-            
+            self.model = get_vad_backend()
+            self.model.load()
             logger.info(f"✅ Silero VAD {self.model_version} loaded")
             
         except Exception as e:
@@ -76,14 +60,13 @@ class SileroV6Runner:
         
         try:
             # Read audio file
-            wav = self.read_audio(audio_path, sampling_rate=sampling_rate)
+            wav = read_audio(audio_path, sampling_rate=sampling_rate)
             
             # Get speech timestamps
-            speech_timestamps = self.get_speech_timestamps(
+            speech_timestamps = self.model.speech_timestamps(
                 wav,
-                self.model,
+                sampling_rate,
                 threshold=self.threshold,
-                sampling_rate=sampling_rate,
                 min_speech_duration_ms=250,
                 min_silence_duration_ms=100
             )
@@ -110,10 +93,8 @@ class SileroV6Runner:
         """Unload model from memory."""
         if self.model:
             logger.info("🧹 Unloading Silero VAD...")
-            del self.model
+            self.model.unload()
             self.model = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
             logger.info("✅ Silero VAD unloaded")
 
 
@@ -11,6 +11,11 @@ import numpy as np
 import soundfile as sf
 from pathlib import Path
 
+try:  # inside the orchestrator process: share its configured resampler
+    from media_processing.resampling import RESAMPLER
+except ImportError:
+    from apps.backend.services.orchestrator.media_processing.resampling import RESAMPLER
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,9 +108,7 @@ class BigVGANRunner:
             
             # Resample if needed
             if target_sr != self.sample_rate:
-                from scipy.signal import resample
-                new_length = int(len(rendered_audio) * target_sr / self.sample_rate)
-                rendered_audio = resample(rendered_audio, new_length)
+                rendered_audio = RESAMPLER.resample(rendered_audio.astype(np.float32), self.sample_rate, target_sr)
                 save_sr = target_sr
             else:
                 save_sr = self.sample_rate
@@ -31,7 +31,8 @@ const getApiBase = () => {
       reviewTranscription: `${base}/jobs/transcription_review`,
       reviewAlignment: `${base}/jobs/alignment_review`,
       reviewTTS: `${base}/jobs/tts_review`,
-      regenerateTTS: `${base}/jobs/tts_review/regenerate`
+      regenerateTTS: `${base}/jobs/tts_review/regenerate`,
+      render: `${base}/jobs/render`
     }
   };
 };
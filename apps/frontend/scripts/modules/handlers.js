@@ -9,6 +9,29 @@ import { token } from './token.js';
 import { results } from './results.js';
 import { transcriptionReview, alignmentReview, ttsReview } from './reviews.js';
 import { godTierControls } from './godTierControls.js';
+import { utils } from './utils.js';
+
+const STREAM_POLL_MS = 3000;
+
+async function watchStreamProgress(playlistUrl, label) {
+  const [, videoId] = playlistUrl.match(/\/api\/stream\/([^/]+)\//) || [];
+  if (!videoId) return;
+  ui.updateResultPreview(null, label);
+
+  while (state.runId) {
+    await new Promise(resolve => setTimeout(resolve, STREAM_POLL_MS));
+    try {
+      const response = await fetch(`${API.base}/outputs/${encodeURIComponent(videoId)}`);
+      if (!response.ok) return;
+      const { streams = [] } = await response.json();
+      const stream = streams.find(s => s.playlist_url === playlistUrl);
+      if (!stream || stream.complete) return;
+      ui.updateResultPreview(null, `${label} ${stream.segments} segment(s) ready`);
+    } catch {
+      return;
+    }
+  }
+}
 
 // Event Handlers
 const handlers = {
@@ -258,7 +281,7 @@ const handlers = {
                 timestampISO: new Date().toISOString(),
                 source: state.sourceDescriptor || 'Unknown',
                 languages: langs.join(', '),
-                videoUrl: `/api/download/${workspaceId}/dubbed_video_${firstLang}.mp4`,
+                videoUrl: langData?.download_url || `/api/download/${workspaceId}/dubbed_video_${firstLang}.mp4`,
                 audioUrl: `/api/download/${workspaceId}/final_dubbed_audio_${firstLang}.wav`,
                 rawAudioUrl: `/api/download/${workspaceId}/dubbed_speech_track_${firstLang}.wav`,
                 duration: langData?.duration || 'Unknown',
@@ -386,6 +409,17 @@ const handlers = {
         }
       },
 
+      stream: async () => {
+        // HLS playlist of a final render still in progress; it can be played as segments arrive
+        if (!event.playlist_url) return;
+        const label = `Rendering ${event.language || ""} (live)…`;
+        ui.log(`📡 Streaming render started: ${utils.resolveUrl(event.playlist_url)}`);
+        if (!(await ui.playResultStream(event.playlist_url, label))) {
+          // No HLS playback here; report progress until the result event brings the finished file
+          watchStreamProgress(event.playlist_url, label);
+        }
+      },
+
       error: () => {
         ui.log(`❌ Error: ${event.message || "unknown failure"}`);
         ui.setStatus("Error", "error");
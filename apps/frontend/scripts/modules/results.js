@@ -37,8 +37,13 @@ const results = {
     
     const renderLangSection = (langCode, data) => {
       const label = lang.toLabel(langCode) || langCode;
+      // Involve-mode runs deliver a proxy first; the full render runs on the first download
+      const finalEntry = data.render_pending && data.download_url
+        ? `<li>Final video: <a href="${utils.resolveUrl(data.download_url)}" target="_blank" rel="noopener">render full quality</a></li>`
+        : renderLink(data.final_video, "Final video");
       const entries = [
-        renderLink(data.final_video, "Final video"),
+        ...(data.preview ? [renderLink(data.preview, "Preview (proxy)")] : []),
+        finalEntry,
         renderLink(data.final_audio, "Dubbed audio"),
         renderLink(data.speech_track, "Speech track"),
         renderLink(data.subtitles?.aligned?.srt, "Aligned SRT"),
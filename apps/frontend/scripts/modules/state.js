@@ -17,5 +17,6 @@ export const state = {
   objectUrls: {
     source: null,
     result: null
-  }
+  },
+  resultStream: null
 };
@@ -3,6 +3,33 @@ import { state } from "./state.js";
 import { utils } from "./utils.js";
 import { lang } from "./language.js";
 
+const HLS_SCRIPT_URL = "https://cdn.jsdelivr.net/npm/hls.js@1/dist/hls.min.js";
+let hlsLoader = null;
+
+function loadHls() {
+  if (window.Hls) return Promise.resolve(window.Hls);
+  if (!hlsLoader) {
+    hlsLoader = new Promise(resolve => {
+      const script = document.createElement("script");
+      script.src = HLS_SCRIPT_URL;
+      script.async = true;
+      script.onload = () => resolve(window.Hls || null);
+      script.onerror = () => {
+        hlsLoader = null;
+        resolve(null);
+      };
+      document.head.appendChild(script);
+    });
+  }
+  return hlsLoader;
+}
+
+function stopResultStream() {
+  if (!state.resultStream) return;
+  state.resultStream.destroy();
+  state.resultStream = null;
+}
+
 export const ui = {
   log(message) {
     const now = new Date().toLocaleTimeString();
@@ -58,6 +85,8 @@ export const ui = {
   updateResultPreview(src, label, { objectUrl = null } = {}) {
     if (!el.resultPreview?.video) return;
 
+    stopResultStream();
+
     if (state.objectUrls.result) {
       URL.revokeObjectURL(state.objectUrls.result);
       state.objectUrls.result = null;
@@ -79,6 +108,33 @@ export const ui = {
     if (objectUrl) state.objectUrls.result = objectUrl;
   },
 
+  async playResultStream(src, label) {
+    const video = el.resultPreview?.video;
+    if (!video) return false;
+
+    // Safari plays HLS natively; other browsers need hls.js on top of Media Source Extensions
+    if (video.canPlayType("application/vnd.apple.mpegurl")) {
+      this.updateResultPreview(src, label);
+      return true;
+    }
+
+    const Hls = await loadHls();
+    if (!Hls?.isSupported()) return false;
+
+    this.updateResultPreview(null, label);
+    const hls = new Hls({
+      manifestLoadingMaxRetry: 6,
+      manifestLoadingRetryDelay: 1000,
+      levelLoadingMaxRetry: 6,
+      fragLoadingMaxRetry: 6
+    });
+    hls.loadSource(utils.resolveUrl(src));
+    hls.attachMedia(video);
+    state.resultStream = hls;
+    el.resultPreview.card?.classList.remove("empty");
+    return true;
+  },
+
   updateDownloadProgress({ active, progress = null, label = "" }) {
     if (!el.download?.progress) return;
 